@@ -0,0 +1,232 @@
+#!/usr/bin/python
+# Benchmark suite (requires pytest-benchmark, included in the dev dependency group).
+# Run it and save the results as baseline:
+#     python -m pytest benchmarks/test_benchmarks.py --benchmark-only --benchmark-autosave
+# Then check for regressions against the last saved results:
+#     python -m pytest benchmarks/test_benchmarks.py --benchmark-only --benchmark-compare --benchmark-compare-fail=median:25%
+# X11 round trips are only measured on Linux with an X server, e.g.:
+#     xvfb-run --server-args="-screen 0 1280x1024x24" python -m pytest benchmarks/test_benchmarks.py --benchmark-only
+from __future__ import annotations
+
+import gc
+import os
+import random
+import sys
+import tracemalloc
+from collections.abc import Iterator
+from operator import attrgetter
+from typing import Any
+
+import pytest
+
+import pywinbox
+from pywinbox import Box, _backends
+
+_PROPERTIES: dict[str, tuple[Any, Any]] = {
+    "left": (10, 20),
+    "right": (310, 320),
+    "width": (300, 400),
+    "size": ((300, 200), (400, 300)),
+    "topleft": ((10, 20), (30, 40)),
+    "center": ((160, 120), (200, 200)),
+    "centerx": (160, 200),
+    "midbottom": ((160, 220), (200, 300)),
+    "box": (Box(10, 20, 300, 200), Box(30, 40, 400, 300)),
+    "rect": ((10, 20, 310, 220), (30, 40, 430, 340)),
+}
+_SIZES = (100, 10000)
+
+
+class _Area:
+
+    def __init__(self) -> None:
+        self.box = Box(10, 20, 300, 200)
+
+    def onQuery(self) -> Box:
+        return self.box
+
+    def onSet(self, newBox: Box) -> None:
+        self.box = newBox
+
+
+def _randomBoxes(n: int) -> list[Box]:
+    rnd = random.Random(n)
+    return [Box(rnd.randint(0, 3840), rnd.randint(0, 2160), rnd.randint(10, 400), rnd.randint(10, 300))
+            for _ in range(n)]
+
+
+@pytest.mark.parametrize("name", _PROPERTIES)
+def test_getter(benchmark: Any, name: str) -> None:
+    area = _Area()
+    myBox = pywinbox.ScreenBox(area.box, area.onQuery, area.onSet)
+    benchmark(attrgetter(name), myBox)
+
+
+@pytest.mark.parametrize("name", _PROPERTIES)
+def test_setter(benchmark: Any, name: str) -> None:
+    area = _Area()
+    myBox = pywinbox.ScreenBox(area.box, area.onQuery, area.onSet)
+    value1, value2 = _PROPERTIES[name]
+
+    def setBoth() -> None:
+        # Alternate values, since setting the current value does nothing
+        setattr(myBox, name, value1)
+        setattr(myBox, name, value2)
+
+    benchmark(setBoth)
+
+
+@pytest.mark.parametrize("name", _PROPERTIES)
+def test_getterSnapshot(benchmark: Any, name: str) -> None:
+    area = _Area()
+    myBox = pywinbox.ScreenBox(area.box, area.onQuery, area.onSet)
+    with myBox.snapshot():
+        benchmark(attrgetter(name), myBox)
+
+
+@pytest.mark.parametrize("n", _SIZES)
+@pytest.mark.parametrize("func", [pywinbox.collidebox, pywinbox.clip, pywinbox.union], ids=attrgetter("__name__"))
+def test_function(benchmark: Any, func: Any, n: int) -> None:
+    boxes = _randomBoxes(n)
+    other = Box(1000, 500, 800, 600)
+    benchmark(lambda: [func(box, other) for box in boxes])
+
+
+@pytest.mark.parametrize("n", _SIZES)
+@pytest.mark.parametrize("func", [pywinbox.collideboxMany, pywinbox.clipMany, pywinbox.unionMany],
+                         ids=attrgetter("__name__"))
+def test_functionMany(benchmark: Any, func: Any, n: int) -> None:
+    boxes = _randomBoxes(n)
+    benchmark(func, boxes, Box(1000, 500, 800, 600))
+
+
+@pytest.mark.parametrize("n", _SIZES)
+def test_clampAll(benchmark: Any, n: int) -> None:
+    boxes = _randomBoxes(n)
+    monitors = [Box(0, 0, 1920, 1080), Box(1920, 0, 2560, 1440), Box(-1280, 0, 1280, 1024)]
+    benchmark(pywinbox.clampAll, boxes, monitors)
+
+
+@pytest.mark.parametrize("n", _SIZES)
+@pytest.mark.parametrize("method", ("scan", "index"))
+def test_boxIndexQuery(benchmark: Any, method: str, n: int) -> None:
+    # BoxIndex against checking all boxes one by one
+    boxes = _randomBoxes(n)
+    rnd = random.Random(0)
+    areas = [Box(rnd.randint(0, 3840), rnd.randint(0, 2160), 100, 100) for _ in range(20)]
+    if method == "index":
+        index = pywinbox.BoxIndex()
+        for key, box in enumerate(boxes):
+            index.insert(key, box)
+        benchmark(lambda: [index.queryBox(area) for area in areas])
+    else:
+        benchmark(lambda: [[key for key, box in enumerate(boxes) if pywinbox.collidebox(box, area)]
+                           for area in areas])
+
+
+@pytest.mark.parametrize("mode", ("grid", "masterStack", "columns", "bsp"))
+def test_layout(benchmark: Any, mode: str) -> None:
+    # Incremental re-layout: one window removed and added again, out of 100
+    layout = pywinbox.Layout((0, 0, 3840, 2160), mode=mode, gap=8)
+    for key in range(100):
+        layout.add(key)
+
+    def removeAdd() -> None:
+        layout.remove(50)
+        layout.add(50)
+
+    benchmark(removeAdd)
+
+
+def test_memoryPerInstance(benchmark: Any) -> None:
+    n = 10000
+    areas = [_Area() for _ in range(n)]
+    # Callbacks (bound methods) are created beforehand, so only the instances themselves are measured
+    callbacks = [(area.box, area.onQuery, area.onSet) for area in areas]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        myBoxes = [pywinbox.ScreenBox(*args) for args in callbacks]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename")) / len(myBoxes)
+    benchmark.extra_info["bytesPerInstance"] = size
+    # Instances with __dict__ would take twice as much
+    assert size < 256
+    area = areas[0]
+    benchmark(pywinbox.ScreenBox, area.box, area.onQuery, area.onSet)
+
+
+@pytest.fixture
+def memoryBackend() -> Iterator[pywinbox.MemoryBackend]:
+    # Previous backend is selected again as it was (loading the platform backend would require a display)
+    selected, current = _backends._selected, _backends.current
+    backend = pywinbox.MemoryBackend()
+    pywinbox.setBackend(backend)
+    try:
+        yield backend
+    finally:
+        _backends._selected, _backends.current = selected, current
+
+
+def test_windowBoxQueryMemory(benchmark: Any, memoryBackend: pywinbox.MemoryBackend) -> None:
+    # Overhead of WindowBox itself (no display server)
+    myBox = pywinbox.WindowBox(memoryBackend.createWindow((10, 20, 300, 200)))
+    benchmark(attrgetter("box"), myBox)
+
+
+@pytest.mark.parametrize("n", (1, 50))
+def test_getWindowBoxesMemory(benchmark: Any, memoryBackend: pywinbox.MemoryBackend, n: int) -> None:
+    handles = [memoryBackend.createWindow(box) for box in _randomBoxes(n)]
+    benchmark(pywinbox.getWindowBoxes, handles)
+
+
+@pytest.fixture
+def xWindows() -> Iterator[list[int]]:
+    if sys.platform != "linux" or not os.environ.get("DISPLAY"):
+        pytest.skip("X server required")
+    import Xlib.display
+    from Xlib import X
+
+    display = Xlib.display.Display()
+    root = display.screen().root
+    windows = [root.create_window(i, i, 300, 200, 0, X.CopyFromParent) for i in range(50)]
+    for window in windows:
+        window.map()
+    display.sync()
+    try:
+        yield [window.id for window in windows]
+    finally:
+        for window in windows:
+            window.destroy()
+        display.close()
+
+
+def test_windowBoxQueryX11(benchmark: Any, xWindows: list[int]) -> None:
+    myBox = pywinbox.WindowBox(xWindows[0])
+    benchmark(attrgetter("box"), myBox)
+
+
+def test_windowBoxSetX11(benchmark: Any, xWindows: list[int]) -> None:
+    myBox = pywinbox.WindowBox(xWindows[0])
+
+    def moveBoth() -> None:
+        myBox.topleft = (10, 20)
+        myBox.topleft = (30, 40)
+
+    benchmark(moveBoth)
+
+
+@pytest.mark.parametrize("n", (1, 50))
+def test_getWindowBoxesX11(benchmark: Any, xWindows: list[int], n: int) -> None:
+    myBoxes = [pywinbox.WindowBox(handle) for handle in xWindows[:n]]
+    benchmark(pywinbox.getWindowBoxes, myBoxes)
+
+
+@pytest.mark.parametrize("n", (1, 50))
+def test_oneByOneX11(benchmark: Any, xWindows: list[int], n: int) -> None:
+    # Same windows as test_getWindowBoxesX11, queried one by one (one round trip each)
+    myBoxes = [pywinbox.WindowBox(handle) for handle in xWindows[:n]]
+    benchmark(lambda: [myBox.box for myBox in myBoxes])
@@ -1,20 +1,50 @@
 #!/usr/bin/python
-from importlib.metadata import version as _importlib_version
-
+# Import time is kept low (see tests/test_import.py): modules which take long to import, like asyncio,
+# concurrent.futures, inspect, importlib.metadata, NumPy or the platform backends, are only imported when first needed
 from ._main import (Box, Rect, Point, Size,
-                    PyWinBox, WindowBox, ScreenBox,
-                    pointInBox, collidepoint, collidebox, contains, clip, union)
+                    PyWinBox, WindowBox, ScreenBox, getWindowBoxes, applyLayout, agetWindowBoxes, aapplyLayout,
+                    pointInBox, collidepoint, collidebox, contains, clip, union, unionAll)
+from ._vectorized import (pointInBoxMany, collideboxMany, containsMany, clipMany, unionMany,
+                          pairwiseCollide, pairwisePointInBox, clampAll)
+from ._boxindex import BoxIndex
+from ._boxarray import BoxArray
+from ._region import Region
+from ._boxwatcher import BoxWatcher
+from ._animation import Animation
+from ._backends import Backend, BoxListener, registerBackend, setBackend, getBackend
+from ._memorybackend import MemoryBackend
+from ._monitors import Monitor, getMonitors, monitorFor, monitorsOverlapping, workArea, invalidateMonitors
+from ._layout import Layout
+from ._instrumentation import (Stats, Histogram, InstrumentationEvent,
+                               enableInstrumentation, disableInstrumentation, getStats, getFrameExtentsCacheInfo)
 
 __all__ = [
     "version",
     "Box", "Rect", "Point", "Size",
-    "PyWinBox", "WindowBox", "ScreenBox",
-    "pointInBox", "collidepoint", "collidebox", "contains", "clip", "union"
+    "PyWinBox", "WindowBox", "ScreenBox", "getWindowBoxes", "applyLayout", "agetWindowBoxes", "aapplyLayout",
+    "pointInBox", "collidepoint", "collidebox", "contains", "clip", "union", "unionAll",
+    "pointInBoxMany", "collideboxMany", "containsMany", "clipMany", "unionMany",
+    "pairwiseCollide", "pairwisePointInBox", "clampAll",
+    "BoxIndex", "BoxArray", "Region", "BoxWatcher", "Animation",
+    "Backend", "BoxListener", "registerBackend", "setBackend", "getBackend", "MemoryBackend",
+    "Stats", "Histogram", "InstrumentationEvent", "enableInstrumentation", "disableInstrumentation", "getStats",
+    "getFrameExtentsCacheInfo",
+    "Monitor", "getMonitors", "monitorFor", "monitorsOverlapping", "workArea", "invalidateMonitors",
+    "Layout",
 ]
 
-__version__ = _importlib_version("pywinctl")
+
+def __getattr__(name: str) -> str:
+    # __version__ is retrieved on first access, from package metadata
+    if name == "__version__":
+        return version()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
 
 def version(numberOnly: bool = True) -> str:
     """Returns the current version of PyWinBox module, in the form ''x.x.xx'' as string"""
-    return ("" if numberOnly else "PyWinBox-")+__version__
+    currentVersion = globals().get("__version__")
+    if currentVersion is None:
+        from importlib.metadata import version as _importlib_version
+        currentVersion = globals()["__version__"] = _importlib_version("PyWinBox")
+    return ("" if numberOnly else "PyWinBox-")+currentVersion
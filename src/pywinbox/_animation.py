@@ -0,0 +1,115 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from typing import Union
+
+
+def _easeIn(t: float) -> float:
+    return t * t
+
+
+def _easeOut(t: float) -> float:
+    return t * (2 - t)
+
+
+def _easeInOut(t: float) -> float:
+    return t * t * (3 - 2 * t)
+
+
+_EASINGS: dict[str, Callable[[float], float]] = {
+    "linear": lambda t: t,
+    "easeIn": _easeIn,
+    "easeOut": _easeOut,
+    "easeInOut": _easeInOut,
+}
+
+_EasingType = Union[str, Callable[[float], float], None]
+
+
+def _getEasing(easing: _EasingType) -> Callable[[float], float]:
+    if easing is None:
+        return _EASINGS["linear"]
+    if isinstance(easing, str) and easing in _EASINGS:
+        return _EASINGS[easing]
+    if callable(easing):
+        return easing
+    raise ValueError
+
+
+class Animation:
+
+    def __init__(self, setBox: Callable[[tuple[int, int, int, int]], None],
+                 start: tuple[int, int, int, int], target: tuple[int, int, int, int],
+                 duration: float, easing: _EasingType = None, fps: float = 60.0) -> None:
+        """
+        Animated transition of a window/area box, as returned by animateTo() (you should not need to instantiate it).
+
+        Frames are scheduled by wall-clock time, at fps frames per second at most. If setting a box takes longer than
+        a frame, the frames missed are dropped instead of delayed, so the animation lasts the given duration anyway.
+        The target box is always set at the end, unless the animation is cancelled.
+        """
+        if duration < 0 or fps <= 0:
+            raise ValueError
+        self._setBox = setBox
+        self._start = start
+        self._target = target
+        self._duration = duration
+        self._easing = _getEasing(easing)
+        self._period = 1 / fps
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self.frames = 0
+
+    def _frame(self, progress: float) -> tuple[int, int, int, int]:
+        k = self._easing(progress)
+        s0, s1, s2, s3 = self._start
+        t0, t1, t2, t3 = self._target
+        return (round(s0 + (t0 - s0) * k), round(s1 + (t1 - s1) * k),
+                round(s2 + (t2 - s2) * k), round(s3 + (t3 - s3) * k))
+
+    def run(self) -> None:
+        # Run the animation in current thread (invoked from animateTo())
+        try:
+            startTime = time.perf_counter()
+            while True:
+                elapsed = time.perf_counter() - startTime
+                if elapsed >= self._duration:
+                    break
+                self._setBox(self._frame(elapsed / self._duration))
+                self.frames += 1
+                # Wait for the next frame which is not already due (frames missed while setting box are dropped)
+                elapsed = time.perf_counter() - startTime
+                nextFrame = min((int(elapsed / self._period) + 1) * self._period, self._duration)
+                if self._cancelled.wait(max(nextFrame - elapsed, 0)):
+                    return
+            if not self._cancelled.is_set():
+                self._setBox(self._target)
+                self.frames += 1
+        finally:
+            self._done.set()
+
+    def cancel(self) -> None:
+        """
+        Stop the animation, leaving the box as it is (target box will not be set).
+        """
+        self._cancelled.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Wait for the animation to finish (or be cancelled).
+
+        :param timeout: maximum time to wait, in seconds. Defaults to None (wait until it finishes)
+        :return: ``True`` if animation finished
+        """
+        return self._done.wait(timeout)
+
+    def isRunning(self) -> bool:
+        """
+        Check if animation is still running.
+
+        :return: ``True`` if animation has not finished nor been cancelled
+        """
+        return not self._done.is_set()
@@ -0,0 +1,182 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+import importlib
+import sys
+from collections.abc import Callable, Hashable
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Protocol, cast
+
+if TYPE_CHECKING:
+    from ._main import Box
+    from ._monitors import Monitor
+
+
+class BoxListener(Protocol):
+    """Keeps the box of one window updated from window events (see Backend.startBoxListener())"""
+
+    box: Box
+
+    def is_alive(self) -> bool: ...
+
+    def stop(self) -> None: ...
+
+
+class Backend(Protocol):
+    """
+    Set of functions used by WindowBox objects and bulk functions to query and move/resize windows.
+
+    Handles are backend-specific: getHandle() converts any handle passed by the user into the format expected by
+    all other functions, or returns None if it is not valid. Bulk functions return one result per handle, in the same
+    order (None or ``False`` for handles which are not valid). getDisplay() returns the connection each handle belongs
+    to, so all calls to the same connection run in the same I/O thread in thread-safe mode.
+
+    Asynchronous functions must not block the event loop. Backends which can not wait for the replies natively (all
+    but Linux, which awaits them using the X connection itself) run the blocking functions in the default executor.
+    Backends whose windows can only be changed from the main thread (like AppKit on macOS) must dispatch the changes
+    requested from any other thread to it.
+
+    watchMonitors() registers a function to be invoked whenever monitors change, returning ``False`` if the backend
+    can not notify these changes (monitor topology is then queried again periodically, see getMonitors()).
+    """
+
+    def getHandle(self, handle: Any) -> Any: ...
+
+    def getDisplay(self, handle: Any) -> Hashable: ...
+
+    def getWindowBox(self, handle: Any) -> Box: ...
+
+    def getWindowBoxes(self, handles: list[Any]) -> list[Box | None]: ...
+
+    def moveResizeWindow(self, handle: Any, newBox: Box) -> None: ...
+
+    def moveResizeWindows(self, handles: list[Any], newBoxes: list[Box]) -> list[bool]: ...
+
+    async def agetWindowBox(self, handle: Any) -> Box: ...
+
+    async def agetWindowBoxes(self, handles: list[Any]) -> list[Box | None]: ...
+
+    async def amoveResizeWindow(self, handle: Any, newBox: Box) -> None: ...
+
+    async def amoveResizeWindows(self, handles: list[Any], newBoxes: list[Box]) -> list[bool]: ...
+
+    def startBoxListener(self, handle: Any, callback: Callable[[Box], None] | None = None) -> BoxListener: ...
+
+    def getMonitors(self) -> list[Monitor]: ...
+
+    def watchMonitors(self, callback: Callable[[], None]) -> bool: ...
+
+
+class _PlatformBackend:
+    """
+    Backend made of the functions of one of the platform modules (_pywinbox_linux, _pywinbox_win, _pywinbox_macos)
+    """
+
+    def __init__(self, module: ModuleType) -> None:
+        self.getHandle = module._getHandle
+        self.getDisplay = module._getDisplay
+        self.getWindowBox = module._getWindowBox
+        self.getWindowBoxes = module._getWindowBoxes
+        self.moveResizeWindow = module._moveResizeWindow
+        self.moveResizeWindows = module._moveResizeWindows
+        self.agetWindowBox = module._agetWindowBox
+        self.agetWindowBoxes = module._agetWindowBoxes
+        self.amoveResizeWindow = module._amoveResizeWindow
+        self.amoveResizeWindows = module._amoveResizeWindows
+        self.startBoxListener = module._startBoxListener
+        self.getMonitors = module._getMonitors
+        self.watchMonitors = module._watchMonitors
+
+
+def _platformFactory(moduleName: str) -> Callable[[], Backend]:
+    def factory() -> Backend:
+        return _PlatformBackend(importlib.import_module(moduleName, __package__))
+    return factory
+
+
+_factories: dict[str, Callable[[], Backend]] = {
+    "darwin": _platformFactory("._pywinbox_macos"),
+    "win32": _platformFactory("._pywinbox_win"),
+    "linux": _platformFactory("._pywinbox_linux"),
+}
+_instances: dict[str, Backend] = {}
+
+
+class _LazyBackend:
+    """
+    Placeholder loading the platform backend on first use, so importing the module does not import it (nor its
+    dependencies, like python-xlib, which also requires a display)
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(_load(), name)
+
+
+def _load() -> Backend:
+    if isinstance(_selected, _LazyBackend):
+        if sys.platform not in _factories:
+            raise NotImplementedError('PyWinBox currently does not support this platform. If you think you can help, please contribute! https://github.com/Kalmat/PyWinBox')
+        setBackend(sys.platform)
+    return current
+
+
+# Backend in use, as selected (see getBackend()) and as invoked (wrapped by _hook, if any, e.g. instrumentation)
+_selected: Backend = cast("Backend", _LazyBackend())
+current: Backend = _selected
+_hook: Callable[[Backend], Backend] | None = None
+
+
+def _setHook(hook: Callable[[Backend], Backend] | None) -> None:
+    global _hook, current
+    _hook = hook
+    if not isinstance(_selected, _LazyBackend):
+        current = _selected if hook is None else hook(_selected)
+
+
+def registerBackend(name: str, factory: Callable[[], Backend]) -> None:
+    """
+    Register a backend, so it can be selected by name using setBackend().
+
+    Backends for "linux", "win32" and "darwin" are already registered. Registering an existing name replaces it.
+
+    :param name: name of the backend
+    :param factory: function (or class) returning the backend object. It is invoked only once, when selected first
+    """
+    _factories[name] = factory
+    _instances.pop(name, None)
+
+
+def setBackend(backend: str | Backend) -> Backend:
+    """
+    Select the backend used from now on to query and move/resize windows, given its registered name (e.g.
+    ``sys.platform``) or the backend object itself (e.g. a MemoryBackend object).
+
+    Set it before creating any WindowBox object, since window handles are backend-specific.
+
+    It can raise ValueError if no backend has been registered with given name.
+
+    :param backend: registered name of the backend, or backend object
+    :return: backend object selected
+    """
+    global _selected, current
+    if isinstance(backend, str):
+        instance = _instances.get(backend)
+        if instance is None:
+            factory = _factories.get(backend)
+            if factory is None:
+                raise ValueError("No backend registered as '%s'" % backend)
+            instance = _instances[backend] = factory()
+        backend = instance
+    _selected = backend
+    current = backend if _hook is None else _hook(backend)
+    return backend
+
+
+def getBackend() -> Backend:
+    """
+    Get the backend currently used to query and move/resize windows (platform backend is loaded, if not yet).
+
+    :return: backend object
+    """
+    _load()
+    return _selected
@@ -0,0 +1,192 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Any, Union, overload
+
+from ._main import Box, Rect
+
+# NumPy module once imported (see _numpy()), or None if it is not installed
+_np: Any = False
+
+
+def _numpy() -> Any:
+    # NumPy is optional, and only imported when first needed
+    global _np
+    if _np is False:
+        try:
+            import numpy as np
+        except ImportError:
+            _np = None
+        else:
+            _np = np
+    return _np
+
+
+_ColumnType = Union["array[int]", memoryview]
+
+
+class BoxArray:
+
+    __slots__ = ("_height", "_left", "_top", "_width")
+
+    def __init__(self, boxes: Iterable[Box | tuple[int, int, int, int]] | Any = ()) -> None:
+        """
+        Compact container to store large amounts of Box structs (left, top, width, height).
+
+        Values are stored column by column (all lefts, all tops, all widths and all heights) in arrays of C integers,
+        instead of as individual Box objects. Iterating or indexing it returns Box structs, whilst slicing it returns
+        a view (no data is copied) which shares the values with the original BoxArray.
+
+            boxes = pywinbox.BoxArray([(0, 0, 100, 100), (50, 50, 200, 100)])
+            boxes.append(myWindowBox.box)
+            firstTwo = boxes[:2]
+
+        BoxArray objects can be directly passed to all batch geometry functions (e.g. collideboxMany()).
+
+        :param boxes: iterable of Box structs (left, top, width, height) or (N, 4) NumPy array
+        """
+        self._left: _ColumnType = array('i')
+        self._top: _ColumnType = array('i')
+        self._width: _ColumnType = array('i')
+        self._height: _ColumnType = array('i')
+        # No need to import NumPy to check it: if it was not imported yet, boxes can not be a NumPy array
+        np = sys.modules.get("numpy")
+        if np is not None and isinstance(boxes, np.ndarray):
+            values = boxes.reshape(-1, 4).astype(np.intc)
+            for column, columnValues in zip(self._arrays(), values.T):
+                column.frombytes(columnValues.tobytes())
+        else:
+            self.extend(boxes)
+
+    @classmethod
+    def fromRects(cls, rects: Iterable[Rect | tuple[int, int, int, int]]) -> BoxArray:
+        """
+        Create a BoxArray from Rect structs (left, top, right, bottom).
+
+        :param rects: iterable of Rect structs (left, top, right, bottom)
+        :return: new BoxArray
+        """
+        return cls(Box(left, top, right - left, bottom - top) for left, top, right, bottom in rects)
+
+    @classmethod
+    def _fromColumns(cls, left: _ColumnType, top: _ColumnType, width: _ColumnType, height: _ColumnType) -> BoxArray:
+        newArray = cls.__new__(cls)
+        newArray._left, newArray._top, newArray._width, newArray._height = left, top, width, height
+        return newArray
+
+    def _arrays(self) -> tuple[array[int], array[int], array[int], array[int]]:
+        if not isinstance(self._left, array):
+            raise TypeError("BoxArray views can not be resized")
+        return self._left, self._top, self._width, self._height  # type: ignore[return-value]
+
+    def append(self, box: Box | tuple[int, int, int, int]) -> None:
+        """
+        Add a Box struct (left, top, width, height) at the end.
+
+        It raises BufferError if there are views of this BoxArray still in use, or TypeError if it is a view itself.
+        """
+        left, top, width, height = box
+        lefts, tops, widths, heights = self._arrays()
+        lefts.append(left)
+        tops.append(top)
+        widths.append(width)
+        heights.append(height)
+
+    def extend(self, boxes: Iterable[Box | tuple[int, int, int, int]]) -> None:
+        """
+        Add several Box structs (left, top, width, height) at the end.
+
+        It raises BufferError if there are views of this BoxArray still in use, or TypeError if it is a view itself.
+        """
+        lefts, tops, widths, heights = self._arrays()
+        for left, top, width, height in boxes:
+            lefts.append(left)
+            tops.append(top)
+            widths.append(width)
+            heights.append(height)
+
+    def __len__(self) -> int:
+        return len(self._left)
+
+    def __iter__(self) -> Iterator[Box]:
+        return map(Box, self._left, self._top, self._width, self._height)
+
+    @overload
+    def __getitem__(self, index: int) -> Box: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> BoxArray: ...
+
+    def __getitem__(self, index: int | slice) -> Box | BoxArray:
+        if isinstance(index, slice):
+            return self._fromColumns(memoryview(self._left)[index], memoryview(self._top)[index],
+                                     memoryview(self._width)[index], memoryview(self._height)[index])
+        return Box(self._left[index], self._top[index], self._width[index], self._height[index])
+
+    def __setitem__(self, index: int, box: Box | tuple[int, int, int, int]) -> None:
+        self._left[index], self._top[index], self._width[index], self._height[index] = box
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BoxArray):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return "%s(%s)" % (self.__class__.__name__, list(self))
+
+    @property
+    def left(self) -> memoryview:
+        """Column of left values (as a view, so changing its values changes the BoxArray)"""
+        return memoryview(self._left)
+
+    @property
+    def top(self) -> memoryview:
+        """Column of top values (as a view, so changing its values changes the BoxArray)"""
+        return memoryview(self._top)
+
+    @property
+    def width(self) -> memoryview:
+        """Column of width values (as a view, so changing its values changes the BoxArray)"""
+        return memoryview(self._width)
+
+    @property
+    def height(self) -> memoryview:
+        """Column of height values (as a view, so changing its values changes the BoxArray)"""
+        return memoryview(self._height)
+
+    def columns(self) -> tuple[Any, Any, Any, Any]:
+        """
+        Get left, top, width and height columns as NumPy arrays, without copying values.
+
+        It requires NumPy to be installed (raises ImportError otherwise).
+
+        :return: tuple of NumPy arrays (lefts, tops, widths, heights)
+        """
+        np = _numpy()
+        if np is None:
+            raise ImportError("NumPy is required to get BoxArray columns as NumPy arrays")
+        return (np.asarray(memoryview(self._left)), np.asarray(memoryview(self._top)),
+                np.asarray(memoryview(self._width)), np.asarray(memoryview(self._height)))
+
+    def toArray(self) -> Any:
+        """
+        Get a (N, 4) NumPy array with all boxes (values are copied).
+
+        It requires NumPy to be installed (raises ImportError otherwise).
+
+        :return: (N, 4) NumPy array
+        """
+        columns = self.columns()
+        return _numpy().stack(columns, axis=1)
+
+    def toRects(self) -> list[Rect]:
+        """
+        Get all boxes as Rect structs (left, top, right, bottom).
+
+        :return: list of Rect structs
+        """
+        return [Rect(left, top, left + width, top + height)
+                for left, top, width, height in zip(self._left, self._top, self._width, self._height)]
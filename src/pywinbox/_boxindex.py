@@ -0,0 +1,219 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+import math
+from collections.abc import Hashable, Iterator
+
+from ._main import Box, BaseClass
+
+
+class BoxIndex:
+
+    def __init__(self, cellSize: int = 256) -> None:
+        """
+        Spatial index to quickly find which of the registered boxes contain a point, collide with another box or are
+        nearest to a point, without checking them all one by one.
+
+        Boxes are stored in a uniform grid of square cells, so queries only check the boxes in the cells involved.
+        Each box is registered using a key (any hashable object, like a window handle or a ScreenBox/WindowBox object):
+
+            index = pywinbox.BoxIndex()
+            index.insert("myArea", (0, 0, 800, 600))
+            index.insert(myWindowBox)  # box is taken from the object itself
+            keys = index.queryPoint(100, 100)
+
+        Registered boxes are not updated automatically. Use update() when they are moved or resized.
+
+        :param cellSize: size (in pixels) of the grid cells. Best performance is achieved when it is similar to
+                         the size of the registered boxes
+        """
+        if cellSize <= 0:
+            raise ValueError
+        self._cellSize: int = cellSize
+        self._boxes: dict[Hashable, Box] = {}
+        self._cells: dict[tuple[int, int], set[Hashable]] = {}
+        # Range of cells occupied by any box (None if not known, e.g. after removing a box on its edge)
+        self._extent: tuple[int, int, int, int] | None = None
+
+    def _cellRange(self, box: Box) -> tuple[int, int, int, int]:
+        size = self._cellSize
+        return box.left // size, box.top // size, (box.left + box.width) // size, (box.top + box.height) // size
+
+    @staticmethod
+    def _toBox(key: Hashable, box: Box | tuple[int, int, int, int] | None) -> Box:
+        if box is None:
+            if not isinstance(key, BaseClass):
+                raise ValueError
+            return key.box
+        return box if isinstance(box, Box) else Box(*box)
+
+    def insert(self, key: Hashable, box: Box | tuple[int, int, int, int] | None = None) -> None:
+        """
+        Register a box in the index (or update it if key is already registered).
+
+        :param key: any hashable object used to identify the box. If it is a ScreenBox or WindowBox object,
+                    box can be omitted, and it will be taken from the object itself
+        :param box: Box struct (left, top, width, height)
+        """
+        newBox = self._toBox(key, box)
+        if key in self._boxes:
+            self.remove(key)
+        self._boxes[key] = newBox
+        x1, y1, x2, y2 = self._cellRange(newBox)
+        for i in range(x1, x2 + 1):
+            for j in range(y1, y2 + 1):
+                self._cells.setdefault((i, j), set()).add(key)
+        if self._extent is not None:
+            ex1, ey1, ex2, ey2 = self._extent
+            self._extent = (min(ex1, x1), min(ey1, y1), max(ex2, x2), max(ey2, y2))
+        elif len(self._boxes) == 1:
+            self._extent = (x1, y1, x2, y2)
+
+    def update(self, key: Hashable, box: Box | tuple[int, int, int, int] | None = None) -> None:
+        """
+        Update the box of an already registered key (e.g. after a window has been moved or resized).
+
+        It can raise KeyError if key is not registered.
+
+        :param key: key used to register the box. If it is a ScreenBox or WindowBox object, box can be omitted,
+                    and it will be taken from the object itself
+        :param box: new Box struct (left, top, width, height)
+        """
+        if key not in self._boxes:
+            raise KeyError(key)
+        newBox = self._toBox(key, box)
+        if newBox != self._boxes[key]:
+            self.insert(key, newBox)
+
+    def remove(self, key: Hashable) -> None:
+        """
+        Remove a box from the index.
+
+        It can raise KeyError if key is not registered.
+
+        :param key: key used to register the box
+        """
+        box = self._boxes.pop(key)
+        x1, y1, x2, y2 = self._cellRange(box)
+        for i in range(x1, x2 + 1):
+            for j in range(y1, y2 + 1):
+                cell = self._cells[(i, j)]
+                cell.discard(key)
+                if not cell:
+                    del self._cells[(i, j)]
+        if self._extent is not None:
+            ex1, ey1, ex2, ey2 = self._extent
+            if x1 == ex1 or y1 == ey1 or x2 == ex2 or y2 == ey2:
+                # Extent may shrink. It is calculated again when needed (see nearest())
+                self._extent = None
+
+    def _calcExtent(self) -> tuple[int, int, int, int]:
+        cells = self._cells
+        return (min(i for i, _ in cells), min(j for _, j in cells),
+                max(i for i, _ in cells), max(j for _, j in cells))
+
+    def get(self, key: Hashable) -> Box | None:
+        """
+        Get the box registered for a given key.
+
+        :param key: key used to register the box
+        :return: Box struct (left, top, width, height) or None if key is not registered
+        """
+        return self._boxes.get(key)
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._boxes
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._boxes)
+
+    def queryPoint(self, x: int, y: int) -> list[Hashable]:
+        """
+        Find all registered boxes which contain a given point (as in pointInBox()).
+
+        :param x: x coordinate of point
+        :param y: y coordinate of point
+        :return: list of keys of the boxes which contain the point
+        """
+        cell = self._cells.get((x // self._cellSize, y // self._cellSize))
+        if not cell:
+            return []
+        boxes = self._boxes
+        result = []
+        for key in cell:
+            left, top, width, height = boxes[key]
+            if left <= x <= left + width and top <= y <= top + height:
+                result.append(key)
+        return result
+
+    def queryBox(self, box: Box | tuple[int, int, int, int]) -> list[Hashable]:
+        """
+        Find all registered boxes which collide with a given box (as in collidebox()).
+
+        :param box: Box struct (left, top, width, height)
+        :return: list of keys of the boxes colliding with the given box
+        """
+        if not isinstance(box, Box):
+            box = Box(*box)
+        x, y, w, h = box
+        x1, y1, x2, y2 = self._cellRange(box)
+        cells = self._cells
+        boxes = self._boxes
+        seen: set[Hashable] = set()
+        result = []
+        for i in range(x1, x2 + 1):
+            for j in range(y1, y2 + 1):
+                for key in cells.get((i, j), ()):
+                    if key not in seen:
+                        seen.add(key)
+                        left, top, width, height = boxes[key]
+                        if left < x + w and left + width > x and top < y + h and top + height > y:
+                            result.append(key)
+        return result
+
+    def nearest(self, x: int, y: int) -> Hashable | None:
+        """
+        Find the registered box which is nearest to a given point (distance is 0 if point is within the box).
+
+        :param x: x coordinate of point
+        :param y: y coordinate of point
+        :return: key of the nearest box, or None if index is empty
+        """
+        if not self._boxes:
+            return None
+        if self._extent is None:
+            self._extent = self._calcExtent()
+        size = self._cellSize
+        cx, cy = x // size, y // size
+        ex1, ey1, ex2, ey2 = self._extent
+        # Only rings of cells overlapping the occupied area need to be checked
+        minRing = max(ex1 - cx, cx - ex2, ey1 - cy, cy - ey2, 0)
+        maxRing = max(cx - ex1, ex2 - cx, cy - ey1, ey2 - cy, 0)
+        cells = self._cells
+        boxes = self._boxes
+        seen: set[Hashable] = set()
+        bestKey: Hashable | None = None
+        bestDist = math.inf
+        for ring in range(minRing, maxRing + 1):
+            # Boxes not visited yet are entirely in this or outer rings, so they can not be nearer than this
+            if ring and bestDist <= ((ring - 1) * size) ** 2:
+                break
+            for i in range(max(cx - ring, ex1), min(cx + ring, ex2) + 1):
+                if i in (cx - ring, cx + ring):
+                    rows = range(max(cy - ring, ey1), min(cy + ring, ey2) + 1)
+                else:
+                    rows = range(cy - ring, cy + ring + 1, 2 * ring)
+                for j in rows:
+                    for key in cells.get((i, j), ()):
+                        if key not in seen:
+                            seen.add(key)
+                            left, top, width, height = boxes[key]
+                            dx = max(left - x, 0, x - left - width)
+                            dy = max(top - y, 0, y - top - height)
+                            dist = dx * dx + dy * dy
+                            if dist < bestDist:
+                                bestKey, bestDist = key, dist
+        return bestKey
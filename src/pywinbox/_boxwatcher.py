@@ -0,0 +1,164 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+
+from ._main import Box, BaseClass, WindowBox, getWindowBoxes
+
+
+class _WatchState:
+
+    __slots__ = ("changedAt", "firedAt", "last", "pending")
+
+    def __init__(self) -> None:
+        self.last: Box | None = None
+        self.pending: Box | None = None
+        self.changedAt: float = 0.0
+        self.firedAt: float = -float("inf")
+
+
+class BoxWatcher:
+
+    def __init__(self, boxes: Iterable[BaseClass] = (),
+                 onMove: Callable[[BaseClass, Box, Box], None] | None = None,
+                 onResize: Callable[[BaseClass, Box, Box], None] | None = None,
+                 interval: float = 0.1, minInterval: float = 0.1, debounce: float = 0.0) -> None:
+        """
+        Watch many WindowBox / ScreenBox objects for changes from one single thread, invoking onMove and/or onResize
+        only when their box actually changes.
+
+        All windows are queried at once on every check (see getWindowBoxes()), so it scales to hundreds of windows.
+        WindowBox objects receiving window events (see WindowBox.startEvents()) are read from memory instead.
+
+        Changes are coalesced: callbacks are invoked at most once every minInterval seconds for each object, with
+        the latest box, so dragging a window produces a bounded callback rate. If debounce is set, callbacks are
+        only invoked once the box has not changed during that time (e.g. when the drag ends).
+
+            watcher = pywinbox.BoxWatcher([myBox1, myBox2], onMove=lambda obj, old, new: print(obj, "moved to", new))
+            watcher.start()
+
+        Callbacks are invoked from the watcher thread, receiving the object, the previous box and the new box.
+
+        :param boxes: WindowBox / ScreenBox objects to watch
+        :param onMove: function to be invoked when the position of a box changes
+        :param onResize: function to be invoked when the size of a box changes
+        :param interval: time (in seconds) between checks
+        :param minInterval: minimum time (in seconds) between callbacks for the same object
+        :param debounce: time (in seconds) a box must remain unchanged before invoking callbacks
+        """
+        if interval <= 0 or minInterval < 0 or debounce < 0:
+            raise ValueError
+        self._onMove = onMove
+        self._onResize = onResize
+        self._interval = interval
+        self._minInterval = minInterval
+        self._debounce = debounce
+        self._states: dict[BaseClass, _WatchState] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stopRequested = threading.Event()
+        for box in boxes:
+            self.add(box)
+
+    def add(self, box: BaseClass) -> None:
+        """
+        Start watching a WindowBox / ScreenBox object. Its current box is taken as reference on next check.
+
+        :param box: WindowBox / ScreenBox object
+        """
+        with self._lock:
+            self._states.setdefault(box, _WatchState())
+
+    def remove(self, box: BaseClass) -> None:
+        """
+        Stop watching a WindowBox / ScreenBox object. Pending changes are discarded.
+
+        :param box: WindowBox / ScreenBox object
+        """
+        with self._lock:
+            self._states.pop(box, None)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, box: object) -> bool:
+        return box in self._states
+
+    def poll(self, now: float | None = None) -> None:
+        """
+        Check all boxes once, invoking callbacks for the changes detected, if due.
+
+        It is invoked periodically by the watcher thread (see start()), but it can also be invoked from your own
+        loop, without starting the thread.
+
+        :param now: current time (as in time.perf_counter()). Defaults to current time
+        """
+        with self._lock:
+            states = list(self._states.items())
+        windows: list[WindowBox] = []
+        boxes: dict[BaseClass, Box | None] = {}
+        for obj, _ in states:
+            if isinstance(obj, WindowBox) and not obj.isListening():
+                windows.append(obj)
+            else:
+                boxes[obj] = obj.refresh()
+        if windows:
+            boxes.update(zip(windows, getWindowBoxes(windows)))
+        if now is None:
+            now = time.perf_counter()
+
+        for obj, state in states:
+            box = boxes[obj]
+            if box is None:
+                # Not valid window (e.g. closed)
+                continue
+            if state.last is None:
+                state.last = box
+                continue
+            if box != (state.pending or state.last):
+                state.pending = box if box != state.last else None
+                state.changedAt = now
+            if (state.pending is not None and now - state.changedAt >= self._debounce
+                    and now - state.firedAt >= self._minInterval):
+                old, state.last, state.pending = state.last, state.pending, None
+                state.firedAt = now
+                self._fire(obj, old, state.last)
+
+    def _fire(self, obj: BaseClass, old: Box, new: Box) -> None:
+        if self._onMove is not None and (old.left, old.top) != (new.left, new.top):
+            self._onMove(obj, old, new)
+        if self._onResize is not None and (old.width, old.height) != (new.width, new.height):
+            self._onResize(obj, old, new)
+
+    def start(self) -> None:
+        """
+        Start checking all boxes periodically (every interval seconds) in a separate thread.
+        """
+        if self.isRunning():
+            return
+        self._stopRequested.clear()
+        self._thread = threading.Thread(target=self._run, name="PyWinBoxWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the watcher thread.
+        """
+        self._stopRequested.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def isRunning(self) -> bool:
+        """
+        Check if the watcher thread is running.
+
+        :return: ``True`` if boxes are being watched from the watcher thread
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        while not self._stopRequested.wait(self._interval):
+            self.poll()
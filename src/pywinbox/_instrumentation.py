@@ -0,0 +1,251 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from typing import Any, NamedTuple, cast
+
+from . import _backends
+
+# Upper bounds (in seconds) of the latency histogram buckets. Last bucket has no upper bound
+_BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+
+_BACKEND_FUNCTIONS = ("getHandle", "getDisplay", "getWindowBox", "getWindowBoxes", "moveResizeWindow",
+                      "moveResizeWindows", "agetWindowBox", "agetWindowBoxes", "amoveResizeWindow",
+                      "amoveResizeWindows", "startBoxListener", "getMonitors", "watchMonitors")
+
+
+class InstrumentationEvent(NamedTuple):
+    """
+    Container class to handle instrumentation events, as passed to the sink (see enableInstrumentation()):
+
+    kind: "get" / "set" (property of a WindowBox or ScreenBox object), or "backend" (backend function call)
+    name: name of the property or backend function
+    seconds: time spent
+    cached: ``True`` if a "get" did not need to query the box (snapshot or maxAge)
+    obj: WindowBox / ScreenBox object, or None for backend calls
+    """
+    kind: str
+    name: str
+    seconds: float
+    cached: bool
+    obj: Any
+
+
+class Histogram:
+
+    __slots__ = ("buckets", "count", "max", "total")
+
+    bounds = _BUCKETS
+
+    def __init__(self) -> None:
+        """
+        Latency histogram. buckets holds how many times fell into each bucket (see bounds), the last one having no
+        upper bound.
+        """
+        self.buckets: list[int] = [0] * (len(_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.buckets[bisect_left(_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def asDict(self) -> dict[str, Any]:
+        return {"count": self.count, "total": self.total, "mean": self.mean, "max": self.max,
+                "buckets": dict(zip([*_BUCKETS, float("inf")], self.buckets))}
+
+
+class Stats:
+
+    def __init__(self) -> None:
+        """
+        Counters and timers collected by instrumentation, for one WindowBox / ScreenBox object (see instrument())
+        or globally (see getStats()):
+
+        gets / sets: times each property has been read / written
+        cacheHits / cacheMisses: reads not needing / needing to query the box (see snapshot() and maxAge)
+        calls: times each backend function has been invoked
+        latency: Histogram of "query" (onQuery), "set" (onSet) and each backend function
+        """
+        self.gets: dict[str, int] = {}
+        self.sets: dict[str, int] = {}
+        self.cacheHits = 0
+        self.cacheMisses = 0
+        self.calls: dict[str, int] = {}
+        self.latency: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, kind: str, name: str, seconds: float, cached: bool) -> None:
+        with self._lock:
+            if kind == "get":
+                self.gets[name] = self.gets.get(name, 0) + 1
+                if cached:
+                    self.cacheHits += 1
+                    return
+                self.cacheMisses += 1
+                key = "query"
+            elif kind == "set":
+                self.sets[name] = self.sets.get(name, 0) + 1
+                key = "set"
+            else:
+                self.calls[name] = self.calls.get(name, 0) + 1
+                key = name
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = Histogram()
+            histogram.add(seconds)
+
+    def reset(self) -> None:
+        """
+        Set all counters and timers back to zero.
+        """
+        with self._lock:
+            self.gets.clear()
+            self.sets.clear()
+            self.cacheHits = self.cacheMisses = 0
+            self.calls.clear()
+            self.latency.clear()
+
+    def asDict(self) -> dict[str, Any]:
+        """
+        Get all counters and timers as a dict of built-in types (e.g. to export them to a metrics system).
+
+        :return: dict of counters and timers
+        """
+        with self._lock:
+            return {"gets": dict(self.gets), "sets": dict(self.sets),
+                    "cacheHits": self.cacheHits, "cacheMisses": self.cacheMisses, "calls": dict(self.calls),
+                    "latency": {key: histogram.asDict() for key, histogram in self.latency.items()}}
+
+
+class _GlobalStats(Stats):
+
+    def asDict(self) -> dict[str, Any]:
+        stats = super().asDict()
+        if sys.platform == "linux":
+            stats["extentsCache"] = getFrameExtentsCacheInfo()
+        return stats
+
+
+_stats = _GlobalStats()
+_sink: Callable[[InstrumentationEvent], None] | None = None
+_instrumentBoxes = False
+
+
+def _record(stats: Stats | None, kind: str, name: str, seconds: float, cached: bool, obj: Any) -> None:
+    if stats is not None:
+        stats._add(kind, name, seconds, cached)
+    _stats._add(kind, name, seconds, cached)
+    sink = _sink
+    if sink is not None:
+        sink(InstrumentationEvent(kind, name, seconds, cached, obj))
+
+
+def _timed(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    # Only needed when instrumentation is enabled
+    import inspect
+
+    if inspect.iscoroutinefunction(func):
+        async def atimed(*args: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await func(*args)
+            finally:
+                _record(None, "backend", name, time.perf_counter() - start, False, None)
+        return atimed
+
+    def timed(*args: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            _record(None, "backend", name, time.perf_counter() - start, False, None)
+    return timed
+
+
+class _InstrumentedBackend:
+    """
+    Wraps a backend, timing all its functions
+    """
+
+    def __init__(self, backend: _backends.Backend) -> None:
+        self.backend = backend
+        for name in _BACKEND_FUNCTIONS:
+            setattr(self, name, _timed(name, getattr(backend, name)))
+
+
+def _instrumentBackend(backend: _backends.Backend) -> _backends.Backend:
+    return cast("_backends.Backend", _InstrumentedBackend(backend))
+
+
+def enableInstrumentation(sink: Callable[[InstrumentationEvent], None] | None = None, boxes: bool = True) -> Stats:
+    """
+    Start collecting global counters and timers of backend calls (getStats()). If boxes is ``True``, all WindowBox /
+    ScreenBox objects created from now on are also instrumented (see instrument()).
+
+    Instrumentation is disabled by default, having no cost other than checking it when creating objects.
+
+    If a sink is passed, it is invoked with an InstrumentationEvent for every property access and backend call, e.g. to export them
+    to a metrics system. It is invoked from the thread accessing the property or calling the backend, so it must be
+    fast and thread-safe.
+
+    :param sink: function to be invoked with every InstrumentationEvent
+    :param boxes: instrument all WindowBox / ScreenBox objects created from now on
+    :return: global Stats object
+    """
+    global _sink, _instrumentBoxes
+    _sink = sink
+    _instrumentBoxes = boxes
+    _backends._setHook(_instrumentBackend)
+    return _stats
+
+
+def disableInstrumentation() -> None:
+    """
+    Stop collecting global counters and timers of backend calls, and stop instrumenting new WindowBox / ScreenBox
+    objects. Objects already instrumented keep on collecting their stats until instrument(False) is invoked.
+    """
+    global _sink, _instrumentBoxes
+    _sink = None
+    _instrumentBoxes = False
+    _backends._setHook(None)
+
+
+def getStats() -> Stats:
+    """
+    Get global counters and timers (backend calls and all instrumented WindowBox / ScreenBox objects).
+
+    On Linux, frame extents cache counters (see getFrameExtentsCacheInfo()) are also included in asDict(), as
+    "extentsCache".
+
+    :return: global Stats object
+    """
+    return _stats
+
+
+def getFrameExtentsCacheInfo() -> dict[str, int]:
+    """
+    LINUX ONLY: Get hit and miss counters, and current size, of the _GTK_FRAME_EXTENTS cache (used on GNOME only).
+
+    Counters are all zero until the Linux backend is first used. It raises NotImplementedError on other platforms.
+
+    :return: dict with "hits", "misses" and "currsize" keys
+    """
+    if sys.platform != "linux":
+        raise NotImplementedError('Frame extents are cached on Linux only')
+    linux = sys.modules.get(__package__ + "._pywinbox_linux")
+    if linux is None:
+        return {"hits": 0, "misses": 0, "currsize": 0}
+    return cast("dict[str, int]", linux._extentsCache.info()._asdict())
+
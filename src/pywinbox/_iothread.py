@@ -0,0 +1,212 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Callable, Hashable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+class _IOThread(threading.Thread):
+    """
+    Runs all backend calls for one display in a single thread, so they are serialized (e.g. python-xlib displays
+    are not thread-safe). Concurrent calls with the same key share the same in-flight call and result.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name=name, daemon=True)
+        self._queue: queue.SimpleQueue[tuple[Future[Any], Callable[..., Any], tuple[Any, ...], Hashable] | None] = \
+            queue.SimpleQueue()
+        self._inFlight: dict[Hashable, Future[Any]] = {}
+        self._lock = threading.Lock()
+        # Boxes using this thread (see _getIOThread() and _releaseIOThread())
+        self._users = 0
+
+    def run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                # Stopped: calls submitted before have already been run
+                return
+            self._run(*item)
+            # Last call (and the box it belongs to) must not be kept alive while waiting for the next one
+            del item
+
+    def _run(self, future: Future[Any], func: Callable[..., Any], args: tuple[Any, ...], key: Hashable) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = func(*args)
+        except Exception as exc:
+            self._done(key, future)
+            future.set_exception(exc)
+        else:
+            self._done(key, future)
+            future.set_result(result)
+
+    def _done(self, key: Hashable, future: Future[Any]) -> None:
+        # Calls submitted from now on will not share this (already finished) call
+        if key is not None:
+            with self._lock:
+                if self._inFlight.get(key) is future:
+                    del self._inFlight[key]
+
+    def submit(self, func: Callable[..., Any], *args: Any, key: Hashable = None) -> Future[Any]:
+        # Only needed in thread-safe mode
+        from concurrent.futures import Future
+
+        with self._lock:
+            future = self._inFlight.get(key) if key is not None else None
+            if future is None:
+                future = Future()
+                if key is not None:
+                    self._inFlight[key] = future
+                self._queue.put((future, func, args, key))
+        return future
+
+    def stop(self) -> None:
+        self._queue.put(None)
+
+    def call(self, func: Callable[..., Any], *args: Any, key: Hashable = None) -> Any:
+        if threading.current_thread() is self:
+            # Invoked from a call already running in this thread (e.g. custom callbacks). Waiting would deadlock
+            return func(*args)
+        return self.submit(func, *args, key=key).result()
+
+
+class _Serialized:
+    """
+    Callable running given function in an I/O thread, as a replacement of onQuery / onSet in thread-safe mode
+    """
+
+    __slots__ = ("func", "key", "thread")
+
+    def __init__(self, thread: _IOThread, func: Callable[..., Any], key: Hashable = None) -> None:
+        self.thread = thread
+        self.func = func
+        self.key = key
+
+    def __call__(self, *args: Any) -> Any:
+        return self.thread.call(self.func, *args, key=self.key)
+
+    def submit(self, *args: Any) -> Future[Any]:
+        return self.thread.submit(self.func, *args, key=self.key)
+
+
+class _LatestWins:
+    """
+    Callable applying boxes (onSet) from an I/O thread without waiting. While one is being applied, only the most
+    recent box is kept, so outdated boxes are dropped instead of queued
+    """
+
+    __slots__ = ("_busy", "_error", "_idle", "_lock", "_pending", "func", "thread")
+
+    def __init__(self, thread: _IOThread, func: Callable[[Any], None]) -> None:
+        self.thread = thread
+        self.func = func
+        self._lock = threading.Lock()
+        self._pending: tuple[Any] | None = None
+        self._busy = False
+        self._idle = threading.Event()
+        self._idle.set()
+        self._error: Exception | None = None
+
+    def __call__(self, box: Any) -> None:
+        if threading.current_thread() is self.thread:
+            self.func(box)
+            return
+        with self._lock:
+            self._pending = (box,)
+            if self._busy:
+                return
+            self._busy = True
+            self._idle.clear()
+        self.thread.submit(self._apply)
+
+    def _apply(self) -> None:
+        while True:
+            with self._lock:
+                if self._pending is None:
+                    self._busy = False
+                    self._idle.set()
+                    return
+                (box,), self._pending = self._pending, None
+            try:
+                self.func(box)
+            except Exception as exc:
+                self._error = exc
+
+    def flush(self, timeout: float | None = None) -> bool:
+        if threading.current_thread() is self.thread:
+            return True
+        done = self._idle.wait(timeout)
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+        return done
+
+
+# Key of the I/O thread shared by boxes with no window handle (e.g. ScreenBox), which do not belong to any display
+_NO_DISPLAY = object()
+_ioThreads: dict[Hashable, _IOThread] = {}
+_ioThreadsLock = threading.Lock()
+
+
+def _getIOThread(display: Hashable) -> _IOThread:
+    # One I/O thread per display, started on demand. Every box using it must release it when gone
+    with _ioThreadsLock:
+        thread = _ioThreads.get(display)
+        if thread is None or not thread.is_alive():
+            thread = _IOThread(name="PyWinBoxIO-%s" % len(_ioThreads))
+            thread.start()
+            _ioThreads[display] = thread
+        thread._users += 1
+    return thread
+
+
+def _releaseIOThread(display: Hashable, thread: _IOThread) -> None:
+    # Thread is stopped when its last box is gone, so displays no longer used are not in thread-safe mode anymore
+    with _ioThreadsLock:
+        thread._users -= 1
+        if thread._users or _ioThreads.get(display) is not thread:
+            return
+        del _ioThreads[display]
+    thread.stop()
+
+
+def _hasDisplayThreads() -> bool:
+    # Check if any display is in thread-safe mode (boxes with no window handle do not belong to any display)
+    with _ioThreadsLock:
+        return any(display is not _NO_DISPLAY for display in _ioThreads)
+
+
+def _serializedMany(func: Callable[..., list[Any]], getDisplay: Callable[[Any], Hashable],
+                    handles: list[Any], *columns: list[Any]) -> list[Any]:
+    # Run a bulk backend function in the I/O threads of the displays in thread-safe mode, grouping its arguments
+    # (handles and other columns, one item per window) by display. Other windows are processed from calling thread
+    columns = (handles, *columns)
+    if not _hasDisplayThreads():
+        return func(*columns)
+    groups: dict[_IOThread | None, list[int]] = {}
+    for index, handle in enumerate(handles):
+        thread = _ioThreads.get(getDisplay(handle))
+        if thread is threading.current_thread():
+            thread = None
+        groups.setdefault(thread, []).append(index)
+    results: list[Any] = [None] * len(handles)
+
+    def collect(indices: list[int], groupResults: list[Any]) -> None:
+        for index, result in zip(indices, groupResults):
+            results[index] = result
+
+    local = groups.pop(None, None)
+    futures = [(indices, thread.submit(func, *[[column[index] for index in indices] for column in columns]))
+               for thread, indices in groups.items() if thread is not None]
+    if local is not None:
+        collect(local, func(*[[column[index] for index in local] for column in columns]))
+    for indices, future in futures:
+        collect(indices, future.result())
+    return results
@@ -0,0 +1,326 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+import math
+from collections.abc import Hashable, Iterator
+from typing import Any
+
+from ._main import Box, aapplyLayout, applyLayout
+from ._monitors import workArea
+
+_MODES = ("grid", "masterStack", "columns", "bsp")
+
+
+def _split(start: int, length: int, count: int, index: int, gap: int) -> tuple[int, int]:
+    # Position and size of part index when splitting length into count parts separated by gap. Remaining pixels are
+    # spread among parts, so they fill the whole length exactly. If gaps do not fit, parts are clamped to length
+    end = start + length
+    pos = min(start + index * (length + gap) // count, end)
+    return pos, max(min(start + (index + 1) * (length + gap) // count - gap, end) - pos, 0)
+
+
+def _gridSize(n: int) -> tuple[int, int]:
+    cols = math.ceil(math.sqrt(n))
+    return cols, math.ceil(n / cols) if cols else 0
+
+
+class _Node:
+    """
+    Node of the BSP tree: either a leaf (one window) or a split of its box in two children
+    """
+
+    __slots__ = ("box", "children", "key", "parent")
+
+    def __init__(self, key: Hashable | None, parent: _Node | None = None) -> None:
+        self.key = key
+        self.parent = parent
+        self.children: tuple[_Node, _Node] | None = None
+        self.box = Box(0, 0, 0, 0)
+
+
+class Layout:
+
+    def __init__(self, boundary: Box | tuple[int, int, int, int] | None = None, mode: str = "grid", gap: int = 0,
+                 masterRatio: float = 0.5, masterCount: int = 1) -> None:
+        """
+        Tiling layout engine: calculates the boxes of any number of windows inside a boundary, and applies them all at
+        once (see applyLayout()).
+
+        Available modes:
+
+            "grid": rows and columns of equal cells, as many columns as rows (or one more)
+            "masterStack": master windows (masterCount) stacked on the left, taking masterRatio of the width, and the
+                           rest stacked on the right
+            "columns": one column per window
+            "bsp": binary space partitioning, every new window splits the area of another one in two halves (along
+                   its longest side)
+
+        Windows are identified by any hashable key, like WindowBox objects or window handles (as in applyLayout()).
+        Adding or removing a window only calculates the boxes it affects (e.g. just two boxes in "bsp" mode, or just
+        the stack in "masterStack" mode), and returns the boxes which actually changed. All changes are accumulated
+        until apply() is invoked, so they can be applied with one single bulk call:
+
+            layout = pywinbox.Layout(mode="masterStack", gap=8)
+            for myBox in myBoxes:
+                layout.add(myBox)
+            layout.apply()
+            layout.remove(myBoxes[0])
+            layout.apply()  # only moves/resizes the windows affected
+
+        It can raise ValueError if mode is not valid, gap is negative, masterRatio is not between 0 and 1, or
+        masterCount is lower than 1.
+
+        :param boundary: Box struct (left, top, width, height) to place the windows into. If omitted, the work area of
+                         the primary monitor is used (see workArea())
+        :param mode: "grid" (default), "masterStack", "columns" or "bsp"
+        :param gap: space (in pixels) between windows, and between windows and boundary edges
+        :param masterRatio: part of the width taken by master windows ("masterStack" mode)
+        :param masterCount: number of master windows ("masterStack" mode)
+        """
+        if mode not in _MODES or gap < 0 or not 0 < masterRatio < 1 or masterCount < 1:
+            raise ValueError
+        self._mode = mode
+        self._gap = gap
+        self._masterRatio = masterRatio
+        self._masterCount = masterCount
+        self._area = self._inner(boundary)
+        self._keys: list[Hashable] = []
+        self._boxes: dict[Hashable, Box] = {}
+        self._pending: dict[Hashable, Box] = {}
+        self._nodes: dict[Hashable, _Node] = {}
+        self._root: _Node | None = None
+
+    def _inner(self, boundary: Box | tuple[int, int, int, int] | None) -> Box:
+        # Boundary minus outer gaps
+        left, top, width, height = workArea() if boundary is None else boundary
+        gap = self._gap
+        return Box(left + gap, top + gap, max(width - 2 * gap, 0), max(height - 2 * gap, 0))
+
+    def _cell(self, index: int, n: int) -> Box:
+        # Box of window at index, out of n windows ("grid", "masterStack" and "columns" modes)
+        left, top, width, height = self._area
+        gap = self._gap
+        if self._mode == "grid":
+            cols, rows = _gridSize(n)
+            x, w = _split(left, width, cols, index % cols, gap)
+            y, h = _split(top, height, rows, index // cols, gap)
+        elif self._mode == "columns":
+            x, w = _split(left, width, n, index, gap)
+            y, h = top, height
+        elif n <= self._masterCount:
+            x, w = left, width
+            y, h = _split(top, height, n, index, gap)
+        else:
+            masterWidth = max(int((width - gap) * self._masterRatio), 0)
+            if index < self._masterCount:
+                x, w = left, masterWidth
+                y, h = _split(top, height, self._masterCount, index, gap)
+            else:
+                x = min(left + masterWidth + gap, left + width)
+                w = left + width - x
+                y, h = _split(top, height, n - self._masterCount, index - self._masterCount, gap)
+        return Box(x, y, w, h)
+
+    def _store(self, key: Hashable, box: Box, changed: dict[Hashable, Box]) -> None:
+        if self._boxes.get(key) != box:
+            self._boxes[key] = box
+            self._pending[key] = box
+            changed[key] = box
+
+    def _relayoutFrom(self, start: int, changed: dict[Hashable, Box]) -> None:
+        # Windows before start are known not to be affected
+        n = len(self._keys)
+        for i in range(start, n):
+            self._store(self._keys[i], self._cell(i, n), changed)
+
+    def _layoutNode(self, node: _Node, box: Box, changed: dict[Hashable, Box]) -> None:
+        # Place a BSP subtree into box, splitting it along its longest side
+        node.box = box
+        if node.children is None:
+            self._store(node.key, box, changed)
+            return
+        first, second = node.children
+        left, top, width, height = box
+        if width >= height:
+            x1, w1 = _split(left, width, 2, 0, self._gap)
+            x2, w2 = _split(left, width, 2, 1, self._gap)
+            self._layoutNode(first, Box(x1, top, w1, height), changed)
+            self._layoutNode(second, Box(x2, top, w2, height), changed)
+        else:
+            y1, h1 = _split(top, height, 2, 0, self._gap)
+            y2, h2 = _split(top, height, 2, 1, self._gap)
+            self._layoutNode(first, Box(left, y1, width, h1), changed)
+            self._layoutNode(second, Box(left, y2, width, h2), changed)
+
+    def add(self, key: Hashable, at: Hashable | None = None) -> dict[Hashable, Box]:
+        """
+        Add a window to the layout (as last window), calculating only the boxes affected.
+
+        It can raise ValueError if key is already in the layout, or KeyError if at is not in the layout.
+
+        :param key: any hashable object identifying the window, like a WindowBox object or a window handle
+        :param at: "bsp" mode only: window whose area is split to make room for the new one. Defaults to the last
+                   window added
+        :return: dict of windows (keys) whose box changed, and their new Box structs
+        """
+        if key in self._boxes:
+            raise ValueError("Window already in layout: %s" % (key,))
+        if at is not None and at not in self._boxes:
+            raise KeyError(at)
+        changed: dict[Hashable, Box] = {}
+        n = len(self._keys)
+        self._keys.append(key)
+        if self._mode == "bsp":
+            if self._root is None:
+                self._root = self._nodes[key] = _Node(key)
+                self._layoutNode(self._root, self._area, changed)
+            else:
+                # Target leaf becomes a split of its own window and the new one
+                target = self._nodes[at if at is not None else self._keys[-2]]
+                kept = self._nodes[target.key] = _Node(target.key, target)
+                leaf = self._nodes[key] = _Node(key, target)
+                target.key = None
+                target.children = (kept, leaf)
+                self._layoutNode(target, target.box, changed)
+        elif self._mode == "grid" and n and _gridSize(n) == _gridSize(n + 1):
+            self._relayoutFrom(n, changed)
+        elif self._mode == "masterStack" and n > self._masterCount:
+            # Master windows keep their boxes
+            self._relayoutFrom(self._masterCount, changed)
+        else:
+            self._relayoutFrom(0, changed)
+        return changed
+
+    def remove(self, key: Hashable) -> dict[Hashable, Box]:
+        """
+        Remove a window from the layout, calculating only the boxes affected.
+
+        It can raise KeyError if key is not in the layout.
+
+        :param key: key used to add the window
+        :return: dict of windows (keys) whose box changed, and their new Box structs
+        """
+        if key not in self._boxes:
+            raise KeyError(key)
+        changed: dict[Hashable, Box] = {}
+        del self._boxes[key]
+        self._pending.pop(key, None)
+        n = len(self._keys)
+        index = self._keys.index(key)
+        if self._mode == "bsp":
+            self._keys.pop(index)
+            leaf = self._nodes.pop(key)
+            parent = leaf.parent
+            if parent is None or parent.children is None:
+                self._root = None
+            else:
+                # Sibling takes the area of the parent split
+                sibling = parent.children[1] if parent.children[0] is leaf else parent.children[0]
+                sibling.parent = parent.parent
+                if parent.parent is None or parent.parent.children is None:
+                    self._root = sibling
+                else:
+                    first, second = parent.parent.children
+                    parent.parent.children = (sibling, second) if first is parent else (first, sibling)
+                self._layoutNode(sibling, parent.box, changed)
+        elif self._mode == "grid" and _gridSize(n) == _gridSize(n - 1):
+            # Last window fills the hole, so no other window has to move
+            self._keys[index] = self._keys[-1]
+            self._keys.pop()
+            self._relayoutFrom(index, changed)
+        else:
+            self._keys.pop(index)
+            if self._mode == "masterStack" and index >= self._masterCount and n - 1 > self._masterCount:
+                self._relayoutFrom(self._masterCount, changed)
+            else:
+                self._relayoutFrom(0, changed)
+        return changed
+
+    def relayout(self, boundary: Box | tuple[int, int, int, int] | None = None) -> dict[Hashable, Box]:
+        """
+        Calculate all boxes again, e.g. to place the windows into a new boundary (like the work area of another
+        monitor, when the current one is unplugged).
+
+        :param boundary: new Box struct (left, top, width, height) to place the windows into. If omitted, current
+                         boundary is kept
+        :return: dict of windows (keys) whose box changed, and their new Box structs
+        """
+        if boundary is not None:
+            self._area = self._inner(boundary)
+        changed: dict[Hashable, Box] = {}
+        if self._mode == "bsp":
+            if self._root is not None:
+                self._layoutNode(self._root, self._area, changed)
+        else:
+            self._relayoutFrom(0, changed)
+        return changed
+
+    def get(self, key: Hashable) -> Box | None:
+        """
+        Get the box calculated for a window.
+
+        :param key: key used to add the window
+        :return: Box struct (left, top, width, height) or None if key is not in the layout
+        """
+        return self._boxes.get(key)
+
+    @property
+    def boxes(self) -> dict[Hashable, Box]:
+        """
+        Boxes calculated for all windows in the layout.
+
+        :return: dict of windows (keys) and their Box structs
+        """
+        return {key: self._boxes[key] for key in self._keys}
+
+    @property
+    def pending(self) -> dict[Hashable, Box]:
+        """
+        Boxes changed since apply() was last invoked.
+
+        :return: dict of windows (keys) and their new Box structs
+        """
+        return dict(self._pending)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._boxes
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._keys)
+
+    def apply(self) -> dict[Any, bool]:
+        """
+        Move and resize all windows whose box changed since last invoked, at once (see applyLayout()).
+
+        Windows which could not be moved/resized (``False`` result), or all of them if applying them raises any
+        exception, are kept as pending, so they can be applied again.
+
+        :return: dict of windows (keys) applied, and ``True`` if the request was successfully sent, or ``False`` otherwise
+        """
+        pending: dict[Any, Box] = dict(self._pending)
+        if not pending:
+            return {}
+        result = applyLayout(pending)
+        self._clearPending(pending, result)
+        return result
+
+    async def aapply(self) -> dict[Any, bool]:
+        """
+        Asynchronous version of apply(), so it does not block the event loop (see aapplyLayout()).
+
+        :return: dict of windows (keys) applied, and ``True`` if the request was successfully sent, or ``False`` otherwise
+        """
+        pending: dict[Any, Box] = dict(self._pending)
+        if not pending:
+            return {}
+        result = await aapplyLayout(pending)
+        self._clearPending(pending, result)
+        return result
+
+    def _clearPending(self, applied: dict[Any, Box], result: dict[Any, bool]) -> None:
+        # Boxes not applied, or changed again while being applied (e.g. by other coroutines), are still pending
+        self._pending = {key: box for key, box in self._pending.items()
+                         if not result.get(key) or applied.get(key) != box}
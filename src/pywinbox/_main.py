@@ -2,11 +2,18 @@
 from __future__ import annotations
 
 import sys
+import threading
+import time
 import warnings
-from collections.abc import Callable
-from typing import NamedTuple
+import weakref
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, NamedTuple
 
-import pywinbox
+from ._animation import Animation
+from . import _backends, _instrumentation
+from ._iothread import (_NO_DISPLAY, _getIOThread, _hasDisplayThreads, _LatestWins, _releaseIOThread, _Serialized,
+                        _serializedMany)
 
 
 class Box(NamedTuple):
@@ -46,7 +53,7 @@ def pointInBox(x: int, y: int, box: Box |tuple[int, int, int, int]) -> bool:
     :param box: Box struct (left, top, width, height) or tuple of integers
     :return: ``True`` if the ``(x, y)`` point is within the box described by ``(left, top, width, height)``
     """
-    x1, y1, w1, h1 = box if isinstance(box, tuple) else (box.left, box.top, box.width, box.height)
+    x1, y1, w1, h1 = box
     return x1 <= x <= x1 + w1 and y1 <= y <= y1 + h1
 collidepoint = pointInBox  # collidepoint is an alias for pointInBox
 
@@ -59,8 +66,8 @@ def collidebox(box1: Box | tuple[int, int, int, int], box2: Box | tuple[int, int
     :param box2: second Box struct (left, top, width, height)
     :return: ``True`` if the two Box objects are colliding
     """
-    x1, y1, w1, h1 = box1 if isinstance(box1, tuple) else (box1.left, box1.top, box1.width, box1.height)
-    x2, y2, w2, h2 = box2 if isinstance(box2, tuple) else (box2.left, box2.top, box2.width, box2.height)
+    x1, y1, w1, h1 = box1
+    x2, y2, w2, h2 = box2
     return x1 < x2 + w2 and x1 + w1 > x2 and y1 < y2 + h2 and y1 + h1 > y2
 
 
@@ -72,8 +79,8 @@ def contains(box1: Box | tuple[int, int, int, int], box2: Box | tuple[int, int,
     :param box2: second Box struct (left, top, width, height)
     :return: ``True`` if box1 is entirely inside box2
     """
-    x1, y1, w1, h1 = box1 if isinstance(box1, tuple) else (box1.left, box1.top, box1.width, box1.height)
-    x2, y2, w2, h2 = box2 if isinstance(box2, tuple) else (box2.left, box2.top, box2.width, box2.height)
+    x1, y1, w1, h1 = box1
+    x2, y2, w2, h2 = box2
     return x1 >= x2 and x1 + w1 <= x2 + w2 and y1 >= y2 and y1 + h1 <= y2 + h2
 
 
@@ -85,12 +92,15 @@ def clip(box1: Box | tuple[int, int, int, int], box2: Box | tuple[int, int, int,
     :param box2: second Box struct (left, top, width, height)
     :return: intersection Box struct (left, top, width, height) or None if there is no intersection
     """
-    if collidebox(box1, box2):
-        x1, y1, w1, h1 = box1 if isinstance(box1, tuple) else (box1.left, box1.top, box1.width, box1.height)
-        x2, y2, w2, h2 = box2 if isinstance(box2, tuple) else (box2.left, box2.top, box2.width, box2.height)
-        return Box(max(x1, x2), max(y1, y2), max(x1, x2) + min(w1, w2), max(y1, y2) + min(h1, h2))
-    else:
-        return None
+    x1, y1, w1, h1 = box1
+    x2, y2, w2, h2 = box2
+    if x1 < x2 + w2 and x1 + w1 > x2 and y1 < y2 + h2 and y1 + h1 > y2:
+        left = x1 if x1 > x2 else x2
+        top = y1 if y1 > y2 else y2
+        right = x1 + w1 if x1 + w1 < x2 + w2 else x2 + w2
+        bottom = y1 + h1 if y1 + h1 < y2 + h2 else y2 + h2
+        return Box(left, top, right - left, bottom - top)
+    return None
 
 
 def union(box1: Box | tuple[int, int, int, int], box2: Box | tuple[int, int, int, int]) -> Box | None:
@@ -101,49 +111,162 @@ def union(box1: Box | tuple[int, int, int, int], box2: Box | tuple[int, int, int
     :param box2: second Box struct (left, top, width, height)
     :return: union Box struct (left, top, width, height) or None if not valid union area exists
     """
-    if not isinstance(box1, Box):
-        box1 = Box(*box1)
-    if not isinstance(box2, Box):
-        box2 = Box(*box2)
-
-    def onQuery1() -> Box:
-        return box1
+    x1, y1, w1, h1 = box1
+    x2, y2, w2, h2 = box2
+    left = x1 if x1 < x2 else x2
+    top = y1 if y1 < y2 else y2
+    right = x1 + w1 if x1 + w1 > x2 + w2 else x2 + w2
+    bottom = y1 + h1 if y1 + h1 > y2 + h2 else y2 + h2
 
-    def onQuery2() -> Box:
-        return box2
-
-    def onSet(box :Box) -> None:
-        pass
+    # Return new Box; if dimensions are <= 0, rectangles do not overlap or touch validly
+    if right > left and bottom > top:
+        return Box(left, top, right - left, bottom - top)
+    # Return None if no valid union exists
+    return None
 
-    # creating a ScreenBox object to take advantage of multi-monitor features
-    myBox1 = pywinbox.ScreenBox(box1, onQuery1, onSet)
-    myBox2 = pywinbox.ScreenBox(box2, onQuery2, onSet)
 
-    new_x = min(box1.left, box2.left)
-    new_y = min(box1.top, box2.top)
-    new_w = max(myBox1.right, myBox2.right) - new_x
-    new_h = max(myBox1.bottom, myBox2.bottom) - new_y
+def unionAll(boxes: Iterable[Box | tuple[int, int, int, int]]) -> Box | None:
+    """
+    Return the bounding box (minimal area which contains them all) of any number of Box objects, in one single pass.
 
-    # Return new Box; if dimensions are <= 0, rectangles do not overlap or touch validly
-    if new_w > 0 and new_h > 0:
-        return Box(new_x, new_y, new_w, new_h)
-    else:
-        # Return None if no valid union exists
+    :param boxes: iterable of Box structs (left, top, width, height)
+    :return: union Box struct (left, top, width, height) or None if there are no boxes or not valid union area exists
+    """
+    iterator = iter(boxes)
+    try:
+        left, top, width, height = next(iterator)
+    except StopIteration:
         return None
+    right = left + width
+    bottom = top + height
+    for x, y, w, h in iterator:
+        if x < left:
+            left = x
+        if y < top:
+            top = y
+        if x + w > right:
+            right = x + w
+        if y + h > bottom:
+            bottom = y + h
+    if right > left and bottom > top:
+        return Box(left, top, right - left, bottom - top)
+    return None
+
+
+def _clampBox(box: Box | tuple[int, int, int, int], boundary: Box | tuple[int, int, int, int]) -> Box:
+    # See BaseClass._clamp_box()
+    rx, ry, rw, rh = box
+    bx, by, bw, bh = boundary
+
+    # Clamp size to boundary dimensions (can't be larger than boundary)
+    new_w = min(rw, bw)
+    new_h = min(rh, bh)
+
+    # Adjust position so the rect fits within the boundary
+    # First, ensure x/y are not before the boundary origin
+    new_x = max(rx, bx)
+    new_y = max(ry, by)
+
+    # Then, ensure the rect doesn't exceed the boundary's right/bottom edge
+    new_x = min(new_x, bx + bw - new_w)
+    new_y = min(new_y, by + bh - new_h)
+
+    return Box(new_x, new_y, new_w, new_h)
 
 
 class BaseClass:
 
+    __slots__ = ("__weakref__", "_animation", "_batch", "_box", "_clamp", "_handle", "_listener", "_lock", "_maxAge",
+                 "_onQuery", "_onSet", "_pending", "_queryTime", "_snapshot", "_stale", "_stats")
+
     def __init__(self,
                  handle :_HandleTypeOut = None,
                  box :Box | None = None,
-                 onQuery :Callable[[], Box] | None = None, onSet :Callable[[Box], None] | None = None) -> None:
+                 onQuery :Callable[[], Box] | None = None, onSet :Callable[[Box], None] | None = None,
+                 maxAge :float = 0.0, threadSafe: bool = False, latestWins: bool = False) -> None:
 
         self._handle :_HandleTypeOut = handle
         self._box :Box = box or Box(0, 0, 0, 0)
         self._onQuery: Callable[[], Box] = onQuery or self.onQuery
         self._onSet: Callable[[Box], None] = onSet or self.onSet
         self._clamp: Box | None = None
+        self._snapshot: int = 0
+        self._stale: bool = True
+        self._maxAge: float = maxAge
+        self._queryTime: float = 0.0
+        self._batch: int = 0
+        self._pending: bool = False
+        self._listener: _backends.BoxListener | None = None
+        self._animation: Animation | None = None
+        self._stats: _instrumentation.Stats | None = None
+        self._lock: threading.Lock | None = None
+        if threadSafe or latestWins:
+            # All calls are serialized through the I/O thread of the display. Concurrent default queries of the same
+            # window share the same call, even from different objects. Boxes without handle (e.g. ScreenBox) do not
+            # need the backend (nor load it) and share their own I/O thread
+            self._lock = threading.Lock()
+            display = _NO_DISPLAY if handle is None else _backends.current.getDisplay(handle)
+            thread = _getIOThread(display)
+            weakref.finalize(self, _releaseIOThread, display, thread)
+            # Linux handles (EwmhWindow) are different objects for the same window, so window id is used instead
+            key: Hashable = (display, getattr(handle, "id", handle)) if handle is not None and onQuery is None else self
+            self._onQuery = _Serialized(thread, self._onQuery, key=key)
+            self._onSet = _LatestWins(thread, self._onSet) if latestWins else _Serialized(thread, self._onSet)
+        if _instrumentation._instrumentBoxes:
+            self.instrument()
+
+    def _query(self) -> Box:
+        # Retrieve current box, unless a snapshot is active or cached box is not older than maxAge
+        if (self._stale or
+                (not self._snapshot and (not self._maxAge or time.perf_counter() - self._queryTime >= self._maxAge))):
+            self._store(self._onQuery())
+        return self._box
+
+    def _isCached(self) -> bool:
+        # Check if _query() would return cached box, without querying it again
+        return not self._stale and (self._snapshot > 0 or
+                                    (bool(self._maxAge) and time.perf_counter() - self._queryTime < self._maxAge))
+
+    def _set(self, newBox: Box, current: bool = True) -> None:
+        # Apply new box, keeping it as cached box, so reading after writing stays coherent.
+        # Nothing to apply if it is the box already known (e.g. myBox.left = myBox.left). Unless current is ``True``
+        # (cached box has just been queried or set), cached box must be still valid to be taken as known
+        if newBox == self._box and not self._stale and (current or self._isCached()):
+            return
+        self._write(newBox)
+        if self._batch:
+            # Inside a batch, changes are accumulated and applied only once, when it ends
+            self._pending = True
+            return
+        self._onSet(newBox)
+        self._store(self._box)
+
+    def _store(self, box: Box) -> None:
+        # Keep box as cached box, as if it had just been queried
+        if self._lock is not None:
+            # Thread-safe mode: it can be invoked from several threads at once
+            with self._lock:
+                self._box = box
+                if self._maxAge:
+                    self._queryTime = time.perf_counter()
+                self._stale = False
+            return
+        self._box = box
+        if self._maxAge:
+            self._queryTime = time.perf_counter()
+        self._stale = False
+
+    def _write(self, box: Box | None = None, stale: bool = False) -> None:
+        # Replace cached box (if given) or mark it as stale, taking the lock in thread-safe mode
+        if self._lock is not None:
+            with self._lock:
+                if box is not None:
+                    self._box = box
+                self._stale = self._stale or stale
+        else:
+            if box is not None:
+                self._box = box
+            self._stale = self._stale or stale
 
     def onQuery(self) -> Box:
         """
@@ -152,8 +275,10 @@ class BaseClass:
 
         :return: window Box struct (x, y, width, height)
         """
-        if self._handle is not None:
-            self._box = _getWindowBox(self._handle)
+        if self._listener is not None and self._listener.is_alive():
+            self._write(self._listener.box)
+        elif self._handle is not None:
+            self._write(_backends.current.getWindowBox(self._handle))
         return self._box
 
     def _clamp_box(self, box :Box, boundary :Box):
@@ -167,23 +292,7 @@ class BaseClass:
 
         Returns the adjusted Box (x, y, width, height).
         """
-        rx, ry, rw, rh = box.left, box.top, box.width, box.height
-        bx, by, bw, bh = boundary.left, boundary.top, boundary.width, boundary.height
-
-        # Clamp size to boundary dimensions (can't be larger than boundary)
-        new_w = min(rw, bw)
-        new_h = min(rh, bh)
-
-        # Adjust position so the rect fits within the boundary
-        # First, ensure x/y are not before the boundary origin
-        new_x = max(rx, bx)
-        new_y = max(ry, by)
-
-        # Then, ensure the rect doesn't exceed the boundary's right/bottom edge
-        new_x = min(new_x, bx + bw - new_w)
-        new_y = min(new_y, by + bh - new_h)
-
-        return Box(new_x, new_y, new_w, new_h)
+        return _clampBox(box, boundary)
 
     def onSet(self, newBox: Box):
         """
@@ -194,9 +303,160 @@ class BaseClass:
         """
         if self._clamp is not None:
             newBox = self._clamp_box(newBox, self._clamp)
-            self._box = newBox
+            self._write(newBox)
         if self._handle is not None:
-            _moveResizeWindow(self._handle, newBox)
+            _backends.current.moveResizeWindow(self._handle, newBox)
+
+    @contextmanager
+    def snapshot(self) -> Iterator[Box]:
+        """
+        Context manager which queries the window/area box only once, so all properties read (or set) inside its scope
+        are calculated from that cached Box struct, instead of invoking onQuery on every access.
+
+        Values set inside the scope are still applied (onSet is invoked) and kept in the cached box.
+        Snapshots can be nested, and the cached box can be discarded at any moment using invalidate() or refresh().
+
+            with myBox.snapshot():
+                x, y, w, h = myBox.left, myBox.top, myBox.width, myBox.height
+
+        :return: cached Box struct (left, top, width, height)
+        """
+        if not self._snapshot:
+            self._stale = True
+        self._snapshot += 1
+        try:
+            yield self._query()
+        finally:
+            self._snapshot -= 1
+
+    @contextmanager
+    def batch(self, rollback: bool = True) -> Iterator[Box]:
+        """
+        Context manager to accumulate all changes made inside its scope, applying them at once when it ends.
+
+        The box is queried only once, when entering the scope (as in a snapshot), and onSet is invoked only once,
+        when exiting it, and only if any property was set. Nested batches are merged into the outermost one.
+
+            with myBox.batch():
+                myBox.left = 10
+                myBox.top = 20
+                myBox.width = 300
+
+        :param rollback: if ``True`` (default) and an exception is raised inside the scope, all changes are
+                         discarded. If ``False``, changes made up to that point are applied anyway
+        :return: Box struct (left, top, width, height) as it was when entering the scope
+        """
+        if self._batch:
+            self._batch += 1
+            try:
+                yield self._box
+            finally:
+                self._batch -= 1
+            return
+
+        with self.snapshot() as original:
+            self._batch = 1
+            self._pending = False
+            try:
+                yield original
+            except BaseException:
+                if rollback:
+                    self._box = original
+                    self._pending = False
+                raise
+            finally:
+                self._batch = 0
+                if self._pending:
+                    self._pending = False
+                    if self._box != original:
+                        self._onSet(self._box)
+                        self._store(self._box)
+
+    def update(self, **kwargs: Any) -> Box:
+        """
+        Set several properties at once, applying all changes in just one onSet invocation.
+        Properties are set in the same order they are passed, for instance:
+
+            myBox.update(left=10, top=20, width=300)
+
+        It can raise ValueError if any of the keywords is not a settable property.
+
+        :return: resultant Box struct (left, top, width, height)
+        """
+        for name in kwargs:
+            prop = getattr(type(self), name, None)
+            if not isinstance(prop, property) or prop.fset is None:
+                raise ValueError("'%s' is not a settable property" % name)
+        with self.batch():
+            for name, value in kwargs.items():
+                setattr(self, name, value)
+        return self._box
+
+    def refresh(self) -> Box:
+        """
+        Force a query of the current window/area box, even if a snapshot is active, updating cached values.
+
+        :return: current Box struct (left, top, width, height)
+        """
+        self._write(stale=True)
+        return self._query()
+
+    def invalidate(self) -> None:
+        """
+        Discard the cached box, so it will be queried again the next time any property is accessed.
+        """
+        self._write(stale=True)
+
+    def instrument(self, enable: bool = True) -> _instrumentation.Stats | None:
+        """
+        Start (or stop) collecting counters and timers of this object: reads and writes of each property (or method),
+        cache hits and misses (see snapshot() and maxAge) and onQuery / onSet latency. They are also added to global
+        stats (see getStats()), and passed to the sink, if any (see enableInstrumentation()).
+
+        Objects not instrumented have no overhead at all.
+
+        :param enable: ``True`` to start, ``False`` to stop collecting stats
+        :return: Stats object of this object (also available as stats property), or None if disabled
+        """
+        if enable:
+            if self._stats is None:
+                self._stats = _instrumentation.Stats()
+                self.__class__ = _instrumentedClass(type(self))
+        elif self._stats is not None:
+            self.__class__ = self.__class__._original
+            self._stats = None
+        return self._stats
+
+    @property
+    def stats(self) -> _instrumentation.Stats | None:
+        """
+        Get counters and timers collected for this object (see instrument()), or None if not instrumented.
+        """
+        return self._stats
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait until all changes have been applied (latestWins mode only. Otherwise, they are applied when set).
+
+        If applying any of them failed, the exception is raised here.
+
+        :param timeout: maximum time to wait, in seconds. Defaults to None (wait until all changes are applied)
+        :return: ``True`` if all changes have been applied
+        """
+        if isinstance(self._onSet, _LatestWins):
+            return self._onSet.flush(timeout)
+        return True
+
+    @property
+    def maxAge(self) -> float:
+        """
+        Maximum time, in seconds, a queried box is reused before invoking onQuery again (0 means always query).
+        """
+        return self._maxAge
+
+    @maxAge.setter
+    def maxAge(self, value: float):
+        self._maxAge = max(0.0, value)
 
     def __repr__(self) -> str:
         """Return a string of the constructor function call to create this Box object."""
@@ -219,246 +479,219 @@ class BaseClass:
 
     @property
     def left(self) -> int:
-        self._box = self._onQuery()
-        return self._box.left
+        return self._query().left
 
     @left.setter
     def left(self, value: int):
-        self._box = self._onQuery()
-        self._box = Box(value, self._box.top, self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(value, box.top, box.width, box.height))
 
     @property
     def right(self) -> int:
-        self._box = self._onQuery()
-        return self._box.left + self._box.width
+        box = self._query()
+        return box.left + box.width
 
     @right.setter
     def right(self, value: int):
-        self._box = self._onQuery()
-        self._box = Box(value - self._box.width, self._box.top, self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(value - box.width, box.top, box.width, box.height))
 
     @property
     def top(self) -> int:
-        self._box = self._onQuery()
-        return self._box.top
+        return self._query().top
 
     @top.setter
     def top(self, value: int):
-        self._box = self._onQuery()
-        self._box = Box(self._box.left, value, self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(box.left, value, box.width, box.height))
 
     @property
     def bottom(self) -> int:
-        self._box = self._onQuery()
-        return self._box.top + self._box.height
+        box = self._query()
+        return box.top + box.height
 
     @bottom.setter
     def bottom(self, value: int):
-        self._box = self._onQuery()
-        self._box = Box(self._box.left, value - self._box.height, self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(box.left, value - box.height, box.width, box.height))
 
     @property
     def width(self) -> int:
-        self._box = self._onQuery()
-        return self._box.width
+        return self._query().width
 
     @width.setter
     def width(self, value: int):
-        self._box = self._onQuery()
-        self._box = Box(self._box.left, self._box.top, value, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(box.left, box.top, value, box.height))
 
     @property
     def height(self) -> int:
-        self._box = self._onQuery()
-        return self._box.height
+        return self._query().height
 
     @height.setter
     def height(self, value: int):
-        self._box = self._onQuery()
-        self._box = Box(self._box.left, self._box.top, self._box.width, value)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(box.left, box.top, box.width, value))
 
     @property
     def position(self) -> Point:
-        self._box = self._onQuery()
-        return Point(self._box.left, self._box.top)
+        box = self._query()
+        return Point(box.left, box.top)
 
     @position.setter
     def position(self, value: Point | tuple[int, int]):
         val: Point = Point(*value)
-        self._box = self._onQuery()
-        self._box = Box(val.x, val.y, self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(val.x, val.y, box.width, box.height))
 
     @property
     def size(self) -> Size:
-        self._box = self._onQuery()
-        return Size(self._box.width, self._box.height)
+        box = self._query()
+        return Size(box.width, box.height)
 
     @size.setter
     def size(self, value: Size | tuple[int, int]):
         val: Size = Size(*value)
-        self._box = self._onQuery()
-        self._box = Box(self._box.left, self._box.top, val.width, val.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(box.left, box.top, val.width, val.height))
 
     @property
     def box(self) -> Box:
-        self._box = self._onQuery()
-        return self._box
+        return self._query()
 
     @box.setter
     def box(self, value: Box | tuple[int, int, int, int]):
         val: Box = Box(*value)
-        self._box = val
-        self._onSet(self._box)
+        self._set(val, current=False)
 
     @property
     def rect(self) -> Rect:
-        self._box = self._onQuery()
-        return Rect(self._box.left, self._box.top, self._box.left + self._box.width,
-                    self._box.top + self._box.height)
+        box = self._query()
+        return Rect(box.left, box.top, box.left + box.width, box.top + box.height)
 
     @rect.setter
     def rect(self, value: Rect | tuple[int, int, int, int]):
         val: Rect = Rect(*value)
-        self._box = Box(val.left, val.top, abs(val.right - val.left), abs(val.bottom - val.top))
-        self._onSet(self._box)
+        self._set(Box(val.left, val.top, abs(val.right - val.left), abs(val.bottom - val.top)), current=False)
 
     @property
     def topleft(self) -> Point:
-        self._box = self._onQuery()
-        return Point(self._box.left, self._box.top)
+        box = self._query()
+        return Point(box.left, box.top)
 
     @topleft.setter
     def topleft(self, value: Point | tuple[int, int]):
         val: Point = Point(*value)
-        self._box = self._onQuery()
-        self._box = Box(val.x, val.y, self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(val.x, val.y, box.width, box.height))
 
     @property
     def bottomleft(self) -> Point:
-        self._box = self._onQuery()
-        return Point(self._box.left, self._box.top + self._box.height)
+        box = self._query()
+        return Point(box.left, box.top + box.height)
 
     @bottomleft.setter
     def bottomleft(self, value: Point | tuple[int, int]):
         val: Point = Point(*value)
-        self._box = self._onQuery()
-        self._box = Box(val.x, val.y - self._box.height, self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(val.x, val.y - box.height, box.width, box.height))
 
     @property
     def topright(self) -> Point:
-        self._box = self._onQuery()
-        return Point(self._box.left + self._box.width, self._box.top)
+        box = self._query()
+        return Point(box.left + box.width, box.top)
 
     @topright.setter
     def topright(self, value: Point | tuple[int, int]):
         val: Point = Point(*value)
-        self._box = self._onQuery()
-        self._box = Box(val.x - self._box.width, val.y, self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(val.x - box.width, val.y, box.width, box.height))
 
     @property
     def bottomright(self) -> Point:
-        self._box = self._onQuery()
-        return Point(self._box.left + self._box.width, self._box.top + self._box.height)
+        box = self._query()
+        return Point(box.left + box.width, box.top + box.height)
 
     @bottomright.setter
     def bottomright(self, value: Point | tuple[int, int]):
         val: Point = Point(*value)
-        self._box = self._onQuery()
-        self._box = Box(val.x - self._box.width, val.y - self._box.height, self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(val.x - box.width, val.y - box.height, box.width, box.height))
 
     @property
     def midtop(self) -> Point:
-        self._box = self._onQuery()
-        return Point(self._box.left + (self._box.width // 2), self._box.top)
+        box = self._query()
+        return Point(box.left + (box.width // 2), box.top)
 
     @midtop.setter
     def midtop(self, value: Point | tuple[int, int]):
         val: Point = Point(*value)
-        self._box = self._onQuery()
-        self._box = Box(val.x - (self._box.width // 2), val.y, self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(val.x - (box.width // 2), val.y, box.width, box.height))
 
     @property
     def midbottom(self) -> Point:
-        self._box = self._onQuery()
-        return Point(self._box.left + (self._box.width // 2), self._box.top + self._box.height)
+        box = self._query()
+        return Point(box.left + (box.width // 2), box.top + box.height)
 
     @midbottom.setter
     def midbottom(self, value: Point | tuple[int, int]):
         val: Point = Point(*value)
-        self._box = self._onQuery()
-        self._box = Box(val.x - (self._box.width // 2), val.y - self._box.height, self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(val.x - (box.width // 2), val.y - box.height, box.width, box.height))
 
     @property
     def midleft(self) -> Point:
-        self._box = self._onQuery()
-        return Point(self._box.left, self._box.top + (self._box.height // 2))
+        box = self._query()
+        return Point(box.left, box.top + (box.height // 2))
 
     @midleft.setter
     def midleft(self, value: Point | tuple[int, int]):
         val: Point = Point(*value)
-        self._box = self._onQuery()
-        self._box = Box(val.x, val.y - (self._box.height // 2), self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(val.x, val.y - (box.height // 2), box.width, box.height))
 
     @property
     def midright(self) -> Point:
-        self._box = self._onQuery()
-        return Point(self._box.left + self._box.width, self._box.top + (self._box.height // 2))
+        box = self._query()
+        return Point(box.left + box.width, box.top + (box.height // 2))
 
     @midright.setter
     def midright(self, value: Point | tuple[int, int]):
         val: Point = Point(*value)
-        self._box = self._onQuery()
-        self._box = Box(val.x - self._box.width, val.y - (self._box.height // 2), self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(val.x - box.width, val.y - (box.height // 2), box.width, box.height))
 
     @property
     def center(self) -> Point:
-        self._box = self._onQuery()
-        return Point(self._box.left + (self._box.width // 2), self._box.top + (self._box.height // 2))
+        box = self._query()
+        return Point(box.left + (box.width // 2), box.top + (box.height // 2))
 
     @center.setter
     def center(self, value: Point | tuple[int, int]):
         val: Point = Point(*value)
-        self._box = self._onQuery()
-        self._box = Box(val.x - (self._box.width // 2), val.y - (self._box.height // 2), self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(val.x - (box.width // 2), val.y - (box.height // 2), box.width, box.height))
 
     @property
     def centerx(self) -> int:
-        self._box = self._onQuery()
-        return self._box.left + (self._box.width // 2)
+        box = self._query()
+        return box.left + (box.width // 2)
 
     @centerx.setter
     def centerx(self, value: int):
-        self._box = self._onQuery()
-        self._box = Box(value - (self._box.width // 2), self._box.top, self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(value - (box.width // 2), box.top, box.width, box.height))
 
     @property
     def centery(self) -> int:
-        self._box = self._onQuery()
-        return self._box.top + (self._box.height // 2)
+        box = self._query()
+        return box.top + (box.height // 2)
 
     @centery.setter
     def centery(self, value: int):
-        self._box = self._onQuery()
-        self._box = Box(self._box.left, value - (self._box.height // 2), self._box.width, self._box.height)
-        self._onSet(self._box)
+        box = self._query()
+        self._set(Box(box.left, value - (box.height // 2), box.width, box.height))
 
     def collidepoint(self, x: int, y: int) -> bool:
         """
@@ -468,8 +701,7 @@ class BaseClass:
         :param y: y coordinate of point
         :return: ``True`` if the ``(x, y)`` point is within the box described by ``(left, top, width, height)``
         """
-        self._box = self._onQuery()
-        return collidepoint(x, y, self._box)
+        return collidepoint(x, y, self._query())
 
     def collidebox(self, box: Box | tuple[int, int, int, int]) -> bool:
         """
@@ -478,8 +710,7 @@ class BaseClass:
         :param box: Box struct (left, top, width, height)
         :return: ``True`` if the two Box objects are colliding
         """
-        self._box = self._onQuery()
-        return collidebox(self._box, box)
+        return collidebox(self._query(), box)
 
     def contains(self, box: Box | tuple[int, int, int, int]) -> bool:
         """
@@ -488,8 +719,7 @@ class BaseClass:
         :param box: Box struct (left, top, width, height)
         :return: ``True`` if box1 is entirely inside box2
         """
-        self._box = self._onQuery()
-        return contains(self._box, box)
+        return contains(self._query(), box)
 
     def clip(self, box: Box | tuple[int, int, int, int]) -> Box | None:
         """
@@ -498,8 +728,7 @@ class BaseClass:
         :param box: Box struct (left, top, width, height)
         :return: intersection Box struct (left, top, width, height) or None if there is no intersection
         """
-        self._box = self._onQuery()
-        return clip(self._box, box)
+        return clip(self._query(), box)
 
     def union(self, box: Box | tuple[int, int, int, int]) -> Box | None:
         """
@@ -508,8 +737,7 @@ class BaseClass:
         :param box: Box struct (left, top, width, height)
         :return: union Box struct (left, top, width, height) or None if not valid union area exists
         """
-        self._box = self._onQuery()
-        return union(self._box, box)
+        return union(self._query(), box)
 
     def move(self, dx: int, dy: int) -> Box:
         """
@@ -519,8 +747,8 @@ class BaseClass:
         :param dy: delta y value
         :return: resultant Box struct (left, top, width, height)
         """
-        self._box = self._onQuery()
-        self._box.position = (self._box.position[0] + dx, self._box.position[1] + dy)
+        box = self._query()
+        self._set(Box(box.left + dx, box.top + dy, box.width, box.height))
         return self._box
 
     def inflate(self, dw: float, dh: float) -> Box:
@@ -536,19 +764,22 @@ class BaseClass:
         :param dh: delta height value as float
         :return: resultant Box struct (left, top, width, height)
         """
-        self._box = self._onQuery()
-        self._box.size = (int(self._box.size[0] * dw), int(self._box.size[1] * dh))
+        box = self._query()
+        self._set(Box(box.left, box.top, int(box.width * dw), int(box.height * dh)))
         return self._box
 
-    def clamp(self, boundary: Box | tuple[int, int, int, int]) -> None:
+    def clamp(self, boundary: Box | tuple[int, int, int, int] | None = None) -> None:
         """
         Define boundaries as Box structure to keep window/area inside.
 
         window/screen area will be immediately fit to given boundary.
 
-        :param boundary: Boundaries structure (left, top, width, height)
+        :param boundary: Boundaries structure (left, top, width, height). If omitted, the work area of the monitor
+                         the window/area mostly lies on is used (see monitorFor())
         """
-        if not isinstance(boundary, Box):
+        if boundary is None:
+            boundary = self._monitorWorkArea()
+        elif not isinstance(boundary, Box):
             boundary = Box(*boundary)
         self._clamp = boundary
         self.fit(self._clamp)
@@ -567,19 +798,101 @@ class BaseClass:
         """
         self._clamp = None
 
-    def fit(self, box: Box | tuple[int, int, int, int]) -> None:
+    def fit(self, box: Box | tuple[int, int, int, int] | None = None) -> None:
         """
         Re-scale and move window/area so it fits into box structure.
+
+        :param box: Box struct (left, top, width, height). If omitted, the work area of the monitor the window/area
+                    mostly lies on is used (see monitorFor())
         """
-        if not isinstance(box, Box):
+        if box is None:
+            box = self._monitorWorkArea()
+        elif not isinstance(box, Box):
             box = Box(*box)
-        self._box = self._onQuery()
-        self._box = self._clamp_box(self._box, box)
-        self._onSet(self._box)
+        self._set(self._clamp_box(self._query(), box))
+
+    def _monitorWorkArea(self) -> Box:
+        # Imported here, since monitors module depends on this one
+        from ._monitors import monitorFor
+        monitor = monitorFor(self._query())
+        if monitor is None:
+            raise ValueError("No monitors found")
+        return monitor.workArea
+
+    def animateTo(self, target: Box | tuple[int, int, int, int], duration: float = 0.25,
+                  easing: str | Callable[[float], float] | None = None, fps: float = 60.0,
+                  wait: bool = True) -> Animation:
+        """
+        Move and/or resize window/area to target box progressively, during given time.
+
+        Intermediate boxes are set at fps frames per second at most. If the window/area can not be moved that fast,
+        intermediate frames are dropped, so the animation still lasts (roughly) the given duration. The target box
+        is always set at the end.
+
+        Any animation already running for this window/area is cancelled.
+
+        :param target: final Box struct (left, top, width, height)
+        :param duration: duration of the animation, in seconds
+        :param easing: "linear" (default), "easeIn", "easeOut", "easeInOut", or a custom function receiving the
+                       elapsed fraction of time (0.0 to 1.0) and returning the fraction of the way to go
+        :param fps: maximum number of frames (intermediate boxes) per second
+        :param wait: if ``True`` (default), wait until animation finishes. Otherwise, it runs in a separate thread
+        :return: Animation object, which can be used to cancel() it or wait() for it to finish
+        """
+        if self._animation is not None:
+            self._animation.cancel()
+        animation = Animation(lambda box: self._set(Box(*box)), self._query(), Box(*target), duration, easing, fps)
+        self._animation = animation
+        if wait:
+            animation.run()
+        else:
+            threading.Thread(target=animation.run, name="PyWinBoxAnimation", daemon=True).start()
+        return animation
+
+
+class _Instrumented(BaseClass):
+    """
+    Collects stats of every read and write (see BaseClass.instrument()). Instrumented objects are switched to a
+    subclass of both this class and their own class, so objects not instrumented have no overhead at all
+    """
+
+    __slots__ = ()
+
+    def _query(self) -> Box:
+        cached = self._isCached()
+        start = time.perf_counter()
+        box = super()._query()
+        # Caller is the property (or method) accessed. Setters (and methods like move()) also query the box to
+        # calculate the new one, but these are writes, recorded by _set(), so they are not recorded as reads
+        code = sys._getframe(1).f_code
+        if "_set" not in code.co_names:
+            _instrumentation._record(self._stats, "get", code.co_name, time.perf_counter() - start, cached, self)
+        return box
+
+    def _set(self, newBox: Box, current: bool = True) -> None:
+        start = time.perf_counter()
+        super()._set(newBox, current)
+        _instrumentation._record(self._stats, "set", sys._getframe(1).f_code.co_name, time.perf_counter() - start,
+                                 False, self)
+
+
+_instrumentedClasses: dict[type, type] = {}
+
+
+def _instrumentedClass(cls: type) -> type:
+    newClass = _instrumentedClasses.get(cls)
+    if newClass is None:
+        newClass = type(cls.__name__, (_Instrumented, cls),
+                        {"__slots__": (), "__module__": cls.__module__, "__qualname__": cls.__qualname__,
+                         "_original": cls})
+        _instrumentedClasses[cls] = newClass
+    return newClass
 
 
 class PyWinBox(BaseClass):
 
+    __slots__ = ()
+
     def __init__(self,
                  onQuery: Callable[[], Box] | None = None, onSet: Callable[[Box], None] | None = None,
                  handle :_HandleTypeIn = None) -> None:
@@ -627,7 +940,7 @@ class PyWinBox(BaseClass):
         warnings.warn('PyWinBox class is deprecated. Use WindowBox (window area) or ScreenBox (rectangular area) instead',
                       DeprecationWarning, stacklevel=2)
         try:
-            newHandle: _HandleTypeOut = _getHandle(handle) if handle is not None else None
+            newHandle: _HandleTypeOut = _backends.current.getHandle(handle) if handle is not None else None
         except Exception:
             newHandle = None
         if newHandle is None and (onSet is None or onQuery is None):
@@ -637,9 +950,12 @@ class PyWinBox(BaseClass):
 
 class WindowBox(BaseClass):
 
+    __slots__ = ()
+
     def __init__(self,
                  handle :_HandleTypeIn,
-                 onQuery: Callable[[], Box] | None = None, onSet: Callable[[Box], None] | None = None) -> None:
+                 onQuery: Callable[[], Box] | None = None, onSet: Callable[[Box], None] | None = None,
+                 maxAge: float = 0.0, threadSafe: bool = False, latestWins: bool = False) -> None:
         """
         Class to access all window box properties.
 
@@ -668,22 +984,128 @@ class WindowBox(BaseClass):
         In this case, if your custom functions do not properly retrieve or set the actual window position and size, the
         information contained in the WindowBox class, and returned by all properties, will likely become obsolete.
 
+        To reduce the number of queries, you can pass maxAge (in seconds). Properties queried within that time will
+        be calculated from the cached box, instead of retrieving it again (values set are also cached).
+
+            myBox = pywinbox.WindowBox(handle=windowHandle, maxAge=0.016)
+
+        To access the same windows from several threads, pass threadSafe=True. All queries and changes will then be
+        run in one I/O thread per display (e.g. python-xlib displays are not thread-safe), and concurrent queries of
+        the same window (default onQuery only) will share the same call and result, even from different objects.
+        Pass it to all objects used from several threads. The I/O thread is stopped once all its objects are gone.
+
+            myBox = pywinbox.WindowBox(handle=windowHandle, threadSafe=True)
+
+        For bursty changes (e.g. following the mouse), pass latestWins=True (it implies threadSafe). Changes are then
+        applied from the I/O thread without waiting: while one is being applied, only the most recent one is kept
+        and applied next, so outdated boxes are never applied. Use flush() to wait for all changes to be applied.
+
         It can raise ValueError if not valid window handle is passed
         """
         try:
-            newHandle: _HandleTypeOut = _getHandle(handle)
+            newHandle: _HandleTypeOut = _backends.current.getHandle(handle)
         except Exception:
             newHandle = None
         if newHandle is None:
             raise ValueError
-        super().__init__(handle=newHandle, onQuery=onQuery, onSet=onSet)
+        super().__init__(handle=newHandle, onQuery=onQuery, onSet=onSet, maxAge=maxAge, threadSafe=threadSafe,
+                         latestWins=latestWins)
+
+    def startEvents(self, onChange: Callable[[Box], None] | None = None) -> None:
+        """
+        LINUX ONLY: Keep the window box updated from X11 ConfigureNotify events, received in a separate thread,
+        instead of querying the X server every time a property is accessed (default onQuery only).
+
+        It raises NotImplementedError on other platforms.
+
+        :param onChange: optional function to be invoked, from the events thread, every time the window box
+                         changes. It will receive the new Box struct (left, top, width, height)
+        """
+        self.stopEvents()
+        self._listener = _backends.current.startBoxListener(self._handle, onChange)
+
+    def stopEvents(self) -> None:
+        """
+        Stop receiving window events (see startEvents()), returning to query the window box on every access.
+        """
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def isListening(self) -> bool:
+        """
+        Check if window box is being updated from window events (see startEvents()).
+
+        :return: ``True`` if window box is being updated from window events
+        """
+        return self._listener is not None and self._listener.is_alive()
+
+    async def aquery(self) -> Box:
+        """
+        Asynchronous version of retrieving the window box (``myBox.box``), so it does not block the event loop.
+
+        On Linux (default onQuery only), requests are sent to the X server and replies are awaited using the X
+        connection itself. On other platforms, or with custom onQuery functions, it runs in the default executor.
+
+        The box retrieved is cached, so it is also honoring snapshot() and maxAge.
+
+        :return: window Box struct (left, top, width, height)
+        """
+        # asyncio is only needed by coroutines, so each one imports it
+        import asyncio
+        if (self._stale or
+                (not self._snapshot and (not self._maxAge or time.perf_counter() - self._queryTime >= self._maxAge))):
+            if isinstance(self._onQuery, _Serialized):
+                box = await asyncio.wrap_future(self._onQuery.submit())
+            elif self._onQuery != self.onQuery:
+                box = await asyncio.get_running_loop().run_in_executor(None, self._onQuery)
+            elif self._listener is not None and self._listener.is_alive():
+                box = self._listener.box
+            elif self._handle is not None:
+                box = await _backends.current.agetWindowBox(self._handle)
+            else:
+                box = self._box
+            self._store(box)
+        return self._box
+
+    async def aset(self, newBox: Box | tuple[int, int, int, int]) -> None:
+        """
+        Asynchronous version of setting the window box (``myBox.box = newBox``), so it does not block the event loop.
+
+        On Linux (default onSet only), requests are sent to the X server without waiting for any reply, other than
+        frame extents, if needed. On other platforms, or with custom onSet functions, it runs in the default executor.
+
+        Notice the new box is applied immediately, even inside a batch() scope.
+
+        :param newBox: target position and size in Box struct format (left, top, width, height)
+        """
+        import asyncio
+        box = Box(*newBox)
+        if isinstance(self._onSet, _Serialized):
+            self._write(box)
+            await asyncio.wrap_future(self._onSet.submit(box))
+            box = self._box
+        elif isinstance(self._onSet, _LatestWins):
+            # It does not block: box is applied from the I/O thread (use flush() to wait for it)
+            self._onSet(box)
+        elif self._onSet != self.onSet:
+            await asyncio.get_running_loop().run_in_executor(None, self._onSet, box)
+        else:
+            if self._clamp is not None:
+                box = self._clamp_box(box, self._clamp)
+            if self._handle is not None:
+                await _backends.current.amoveResizeWindow(self._handle, box)
+        self._store(box)
 
 
 class ScreenBox(BaseClass):
 
+    __slots__ = ()
+
     def __init__(self,
                  box: Box | tuple[int, int, int, int],
-                 onQuery: Callable[[], Box], onSet: Callable[[Box], None]) -> None:
+                 onQuery: Callable[[], Box], onSet: Callable[[Box], None],
+                 threadSafe: bool = False, latestWins: bool = False) -> None:
         """
         Class to access all area box properties.
 
@@ -692,6 +1114,9 @@ class ScreenBox(BaseClass):
 
             myBox = pywinbox.ScreenBox((0, 0, 800, 600), customOnQuery, customOnSet)
 
+        If your callbacks are not thread-safe, pass threadSafe=True to run them in one I/O thread, or latestWins=True
+        to also drop outdated changes (see WindowBox).
+
         It can raise ValueError if wrong parameters are passed.
         """
         if ((not isinstance(box, Box) and (not isinstance(box, tuple) or (isinstance(box, tuple) and len(box) != 4)))
@@ -699,19 +1124,139 @@ class ScreenBox(BaseClass):
             raise ValueError
         if not isinstance(box, Box):
             box = Box(*box)
-        super().__init__(box=box, onQuery=onQuery, onSet=onSet)
+        super().__init__(box=box, onQuery=onQuery, onSet=onSet, threadSafe=threadSafe, latestWins=latestWins)
+
+
+def _getOwners(windows: Iterable[WindowBox | _HandleTypeIn]) -> tuple[list[WindowBox | None], list[_HandleTypeOut]]:
+    # WindowBox objects (to be updated afterward) and handles of all windows (None if not valid)
+    owners: list[WindowBox | None] = []
+    handles: list[_HandleTypeOut] = []
+    for window in windows:
+        if isinstance(window, WindowBox):
+            owners.append(window)
+            handles.append(window._handle)
+        else:
+            owners.append(None)
+            try:
+                handles.append(_backends.current.getHandle(window))
+            except Exception:
+                handles.append(None)
+    return owners, handles
+
+
+def _getLayout(layout: Mapping[WindowBox | _HandleTypeIn, Box]) \
+        -> tuple[list[WindowBox | None], list[_HandleTypeOut], list[Box]]:
+    # Same as _getOwners(), plus target boxes (clamped, for WindowBox objects with clamp boundaries)
+    owners, handles = _getOwners(layout)
+    newBoxes: list[Box] = []
+    for owner, newBox in zip(owners, layout.values()):
+        newBox = Box(*newBox)
+        if owner is not None and owner._clamp is not None:
+            newBox = owner._clamp_box(newBox, owner._clamp)
+        newBoxes.append(newBox)
+    return owners, handles, newBoxes
+
+
+def getWindowBoxes(windows: Iterable[WindowBox | _HandleTypeIn]) -> list[Box | None]:
+    """
+    Query the boxes of many windows at once.
+
+    On Linux, all requests are sent to the X server before waiting for any reply, so querying many windows costs
+    roughly the same as querying just one. On other platforms, windows are queried one by one.
+
+    WindowBox objects passed are also updated, as if they had just been queried (e.g. for maxAge or snapshot()).
+    Notice their onQuery functions are not invoked.
+
+    :param windows: iterable of WindowBox objects and/or window handles (see WindowBox for valid formats)
+    :return: list of Box structs (left, top, width, height), in the same order, or None for not valid windows
+    """
+    owners, handles = _getOwners(windows)
+    boxes = _serializedMany(_backends.current.getWindowBoxes, _backends.current.getDisplay, handles)
+    for owner, box in zip(owners, boxes):
+        if owner is not None and box is not None:
+            owner._store(box)
+    return boxes
 
 
-if sys.platform == "darwin":
-    from ._pywinbox_macos import (_getHandle, _getWindowBox, _moveResizeWindow, _HandleTypeIn, _HandleTypeOut)
+def applyLayout(layout: Mapping[WindowBox | _HandleTypeIn, Box]) -> dict[WindowBox | _HandleTypeIn, bool]:
+    """
+    Move and resize many windows at once.
+
+    On Linux, all requests are queued and sent to the X server together (flushing only once), so tiling many windows
+    costs roughly the same as placing just one. On Windows, all windows are placed at once, in a single screen refresh.
+    On macOS, windows are placed one by one.
 
-elif sys.platform == "win32":
-    from ._pywinbox_win import (_getHandle, _getWindowBox, _moveResizeWindow, _HandleTypeIn, _HandleTypeOut)
+    WindowBox objects passed are also updated (including their clamp boundaries, if set), as if their box had just
+    been set. Notice their onSet functions are not invoked.
 
-elif sys.platform == "linux":
-    from ._pywinbox_linux import (_getHandle, _getWindowBox, _moveResizeWindow, _HandleTypeIn, _HandleTypeOut)
+    :param layout: dict of WindowBox objects and/or window handles (see WindowBox for valid formats) and
+                   their target Box structs (left, top, width, height)
+    :return: dict with the same keys and ``True`` if the request was successfully sent, or ``False`` otherwise
+    """
+    owners, handles, newBoxes = _getLayout(layout)
+    done = _serializedMany(_backends.current.moveResizeWindows, _backends.current.getDisplay, handles,
+                           newBoxes)
+    for owner, newBox, ok in zip(owners, newBoxes, done):
+        if owner is not None and ok:
+            owner._store(newBox)
+    return dict(zip(layout, done))
 
-else:
-    raise NotImplementedError('PyWinBox currently does not support this platform. If you think you can help, please contribute! https://github.com/Kalmat/PyWinBox')
-_HandleTypeIn = _HandleTypeIn
-_HandleTypeOut = _HandleTypeOut
\ No newline at end of file
+
+async def agetWindowBoxes(windows: Iterable[WindowBox | _HandleTypeIn]) -> list[Box | None]:
+    """
+    Asynchronous version of getWindowBoxes(), so it does not block the event loop.
+
+    On Linux, replies are awaited using the X connection itself. On other platforms, it runs in the default executor.
+
+    :param windows: iterable of WindowBox objects and/or window handles (see WindowBox for valid formats)
+    :return: list of Box structs (left, top, width, height), in the same order, or None for not valid windows
+    """
+    import asyncio
+    owners, handles = _getOwners(windows)
+    if _hasDisplayThreads():
+        # Some displays are in thread-safe mode, so their calls must be run in their I/O threads
+        boxes = await asyncio.get_running_loop().run_in_executor(None, _serializedMany,
+                                                                 _backends.current.getWindowBoxes,
+                                                                 _backends.current.getDisplay, handles)
+    else:
+        boxes = await _backends.current.agetWindowBoxes(handles)
+    for owner, box in zip(owners, boxes):
+        if owner is not None and box is not None:
+            owner._store(box)
+    return boxes
+
+
+async def aapplyLayout(layout: Mapping[WindowBox | _HandleTypeIn, Box]) -> dict[WindowBox | _HandleTypeIn, bool]:
+    """
+    Asynchronous version of applyLayout(), so it does not block the event loop.
+
+    On Linux, frame extents replies (if needed) are awaited using the X connection itself. On other platforms,
+    it runs in the default executor.
+
+    :param layout: dict of WindowBox objects and/or window handles (see WindowBox for valid formats) and
+                   their target Box structs (left, top, width, height)
+    :return: dict with the same keys and ``True`` if the request was successfully sent, or ``False`` otherwise
+    """
+    import asyncio
+    owners, handles, newBoxes = _getLayout(layout)
+    if _hasDisplayThreads():
+        # Some displays are in thread-safe mode, so their calls must be run in their I/O threads
+        done = await asyncio.get_running_loop().run_in_executor(None, _serializedMany,
+                                                                _backends.current.moveResizeWindows,
+                                                                _backends.current.getDisplay, handles, newBoxes)
+    else:
+        done = await _backends.current.amoveResizeWindows(handles, newBoxes)
+    for owner, newBox, ok in zip(owners, newBoxes, done):
+        if owner is not None and ok:
+            owner._store(newBox)
+    return dict(zip(layout, done))
+
+
+if TYPE_CHECKING:
+    # Platform backend is loaded only when first used (see _backends)
+    if sys.platform == "darwin":
+        from ._pywinbox_macos import _HandleTypeIn, _HandleTypeOut
+    elif sys.platform == "win32":
+        from ._pywinbox_win import _HandleTypeIn, _HandleTypeOut
+    else:
+        from ._pywinbox_linux import _HandleTypeIn, _HandleTypeOut
@@ -0,0 +1,245 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+
+from ._main import Box
+from ._monitors import Monitor
+
+
+class _MemoryListener:
+
+    __slots__ = ("_alive", "_backend", "_callback", "_handle", "box")
+
+    def __init__(self, backend: MemoryBackend, handle: int, box: Box,
+                 callback: Callable[[Box], None] | None = None) -> None:
+        self._backend = backend
+        self._handle = handle
+        self._callback = callback
+        self._alive = True
+        self.box = box
+
+    def _update(self, box: Box) -> None:
+        if box != self.box:
+            self.box = box
+            if self._callback is not None:
+                self._callback(box)
+
+    def is_alive(self) -> bool:
+        return self._alive
+
+    def stop(self) -> None:
+        self._alive = False
+        self._backend._removeListener(self._handle, self)
+
+
+class MemoryBackend:
+
+    def __init__(self, latency: float = 0.0, moveLatency: float = 0.0) -> None:
+        """
+        Backend keeping windows in memory (no display server required), to test or benchmark PyWinBox features
+        deterministically, e.g. on headless CI.
+
+        Windows are just boxes, created with createWindow(). To emulate a real display server, every call waits
+        latency seconds per round trip (queries), and moveLatency seconds per move/resize (no reply is waited for, but
+        sending requests and repainting takes time). Bulk functions wait only once (as if all requests were pipelined).
+        Round trips, queries and moves are counted, so the calls saved by caching or batching can be checked:
+
+            backend = pywinbox.MemoryBackend(latency=0.001)
+            pywinbox.setBackend(backend)
+            myBox = pywinbox.WindowBox(backend.createWindow((0, 0, 800, 600)))
+
+        Listeners (see WindowBox.startEvents()) are notified from the thread changing the window box.
+
+        There is one single 1920x1080 monitor by default. Use setMonitors() to emulate other monitor topologies.
+
+        :param latency: time (in seconds) every round trip takes
+        :param moveLatency: time (in seconds) every move/resize takes
+        """
+        if latency < 0 or moveLatency < 0:
+            raise ValueError
+        self.latency = latency
+        self.moveLatency = moveLatency
+        self.roundTrips = 0
+        self.queries = 0
+        self.moves = 0
+        self._windows: dict[int, Box] = {}
+        self._listeners: dict[int, list[_MemoryListener]] = {}
+        self._nextHandle = 1
+        self._lock = threading.Lock()
+        self._monitors: list[Monitor] = [Monitor("MEMORY-0", Box(0, 0, 1920, 1080), Box(0, 0, 1920, 1080), True)]
+        self._monitorCallbacks: list[Callable[[], None]] = []
+
+    def createWindow(self, box: Box | tuple[int, int, int, int]) -> int:
+        """
+        Create a new window.
+
+        :param box: window box (left, top, width, height)
+        :return: window handle
+        """
+        with self._lock:
+            handle = self._nextHandle
+            self._nextHandle += 1
+            self._windows[handle] = Box(*box)
+        return handle
+
+    def closeWindow(self, handle: int) -> None:
+        """
+        Close (remove) a window. Its handle is not valid anymore.
+
+        :param handle: window handle
+        """
+        with self._lock:
+            self._windows.pop(handle, None)
+            listeners = self._listeners.pop(handle, [])
+        for listener in listeners:
+            listener._alive = False
+
+    def setWindowBox(self, handle: int, box: Box | tuple[int, int, int, int]) -> None:
+        """
+        Move/resize a window from "outside" (as if the user or the window manager did it), without counting it.
+
+        :param handle: window handle
+        :param box: new window box (left, top, width, height)
+        """
+        self._apply(handle, Box(*box))
+
+    def setMonitors(self, monitors: list[Monitor | Box | tuple[int, int, int, int]]) -> None:
+        """
+        Replace all monitors (as if they were plugged / unplugged or rearranged), notifying the change.
+
+        :param monitors: list of Monitor structs, or boxes (left, top, width, height), taken as monitors with no
+                         panels (work area is the whole monitor). The first box is taken as primary monitor
+        """
+        newMonitors = []
+        for i, monitor in enumerate(monitors):
+            if not isinstance(monitor, Monitor):
+                box = Box(*monitor)
+                monitor = Monitor("MEMORY-%s" % i, box, box, i == 0)
+            newMonitors.append(monitor)
+        with self._lock:
+            self._monitors = newMonitors
+            callbacks = list(self._monitorCallbacks)
+        for callback in callbacks:
+            callback()
+
+    def resetCounters(self) -> None:
+        """
+        Set round trips, queries and moves counters back to zero.
+        """
+        with self._lock:
+            self.roundTrips = self.queries = self.moves = 0
+
+    def _count(self, roundTrips: int = 0, queries: int = 0, moves: int = 0) -> None:
+        with self._lock:
+            self.roundTrips += roundTrips
+            self.queries += queries
+            self.moves += moves
+
+    def _apply(self, handle: int, box: Box) -> bool:
+        with self._lock:
+            if handle not in self._windows:
+                return False
+            self._windows[handle] = box
+            listeners = list(self._listeners.get(handle, ()))
+        for listener in listeners:
+            listener._update(box)
+        return True
+
+    def _removeListener(self, handle: int, listener: _MemoryListener) -> None:
+        with self._lock:
+            listeners = self._listeners.get(handle)
+            if listeners is not None and listener in listeners:
+                listeners.remove(listener)
+
+    def getHandle(self, handle: int | None) -> int | None:
+        return handle if handle in self._windows else None
+
+    def getDisplay(self, handle: int | None) -> MemoryBackend:
+        # All windows belong to the same "connection"
+        return self
+
+    def getWindowBox(self, handle: int) -> Box:
+        if self.latency:
+            time.sleep(self.latency)
+        self._count(roundTrips=1, queries=1)
+        box = self._windows.get(handle)
+        if box is None:
+            raise ValueError("Not valid window handle: %s" % handle)
+        return box
+
+    def getWindowBoxes(self, handles: list[int | None]) -> list[Box | None]:
+        if self.latency:
+            time.sleep(self.latency)
+        self._count(roundTrips=1, queries=len(handles))
+        return [self._windows.get(handle) if handle is not None else None for handle in handles]
+
+    def moveResizeWindow(self, handle: int, newBox: Box) -> None:
+        if self.moveLatency:
+            time.sleep(self.moveLatency)
+        self._count(moves=1)
+        self._apply(handle, newBox)
+
+    def moveResizeWindows(self, handles: list[int | None], newBoxes: list[Box]) -> list[bool]:
+        if self.moveLatency:
+            time.sleep(self.moveLatency)
+        done = [handle is not None and self._apply(handle, newBox) for handle, newBox in zip(handles, newBoxes)]
+        # Only windows actually moved/resized are counted
+        self._count(moves=sum(done))
+        return done
+
+    async def agetWindowBox(self, handle: int) -> Box:
+        import asyncio
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self._count(roundTrips=1, queries=1)
+        box = self._windows.get(handle)
+        if box is None:
+            raise ValueError("Not valid window handle: %s" % handle)
+        return box
+
+    async def agetWindowBoxes(self, handles: list[int | None]) -> list[Box | None]:
+        import asyncio
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self._count(roundTrips=1, queries=len(handles))
+        return [self._windows.get(handle) if handle is not None else None for handle in handles]
+
+    async def amoveResizeWindow(self, handle: int, newBox: Box) -> None:
+        import asyncio
+        if self.moveLatency:
+            await asyncio.sleep(self.moveLatency)
+        self._count(moves=1)
+        self._apply(handle, newBox)
+
+    async def amoveResizeWindows(self, handles: list[int | None], newBoxes: list[Box]) -> list[bool]:
+        import asyncio
+        if self.moveLatency:
+            await asyncio.sleep(self.moveLatency)
+        done = [handle is not None and self._apply(handle, newBox) for handle, newBox in zip(handles, newBoxes)]
+        # Only windows actually moved/resized are counted
+        self._count(moves=sum(done))
+        return done
+
+    def startBoxListener(self, handle: int | None, callback: Callable[[Box], None] | None = None) -> _MemoryListener:
+        with self._lock:
+            box = self._windows.get(handle) if handle is not None else None
+            if handle is None or box is None:
+                raise ValueError
+            listener = _MemoryListener(self, handle, box, callback)
+            self._listeners.setdefault(handle, []).append(listener)
+        return listener
+
+    def getMonitors(self) -> list[Monitor]:
+        if self.latency:
+            time.sleep(self.latency)
+        self._count(roundTrips=1, queries=1)
+        return list(self._monitors)
+
+    def watchMonitors(self, callback: Callable[[], None]) -> bool:
+        with self._lock:
+            if callback not in self._monitorCallbacks:
+                self._monitorCallbacks.append(callback)
+        return True
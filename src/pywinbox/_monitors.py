@@ -0,0 +1,173 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import NamedTuple
+
+from . import _backends
+from ._main import Box
+
+# Time (in seconds) the topology is kept when the backend can not notify monitor changes (see Backend.watchMonitors())
+_MAX_AGE = 1.0
+
+
+class Monitor(NamedTuple):
+    """
+    Container class to handle monitor info:
+
+    name: monitor (output) name, as given by the system (e.g. "HDMI-1" on Linux, "\\\\.\\DISPLAY1" on Windows)
+    box: Box struct (left, top, width, height) of the monitor, in the same coordinates as window boxes
+    workArea: Box struct of the monitor area not taken by panels, docks or taskbars
+    primary: ``True`` if it is the primary monitor
+    """
+    name: str
+    box: Box
+    workArea: Box
+    primary: bool
+
+
+def _overlapArea(box: Box, other: Box) -> int:
+    w = min(box.left + box.width, other.left + other.width) - max(box.left, other.left)
+    h = min(box.top + box.height, other.top + other.height) - max(box.top, other.top)
+    return w * h if w > 0 and h > 0 else 0
+
+
+def _distance(box: Box, other: Box) -> int:
+    # Squared distance between the nearest edges of both boxes (0 if they touch or collide)
+    dx = max(other.left - box.left - box.width, 0, box.left - other.left - other.width)
+    dy = max(other.top - box.top - box.height, 0, box.top - other.top - other.height)
+    return dx * dx + dy * dy
+
+
+class _Topology:
+    """
+    Monitors, indexed in vertical slabs (one per pair of consecutive monitor edges along x), so finding the monitors
+    overlapping a box only takes two binary searches per slab the box spans
+    """
+
+    def __init__(self, monitors: list[Monitor]) -> None:
+        self.monitors = monitors
+        self.byName = {monitor.name: monitor for monitor in monitors}
+        self.primary = next((monitor for monitor in monitors if monitor.primary), monitors[0] if monitors else None)
+        self.edges = sorted({x for monitor in monitors for x in (monitor.box.left, monitor.box.left + monitor.box.width)})
+        # Per slab: monitors covering it sorted by top, their tops, and running max of their bottoms
+        self.slabs: list[tuple[list[Monitor], list[int], list[int]]] = []
+        for x1, x2 in zip(self.edges, self.edges[1:]):
+            covering = sorted((monitor for monitor in monitors
+                               if monitor.box.left <= x1 and monitor.box.left + monitor.box.width >= x2),
+                              key=lambda monitor: monitor.box.top)
+            bottoms: list[int] = []
+            for monitor in covering:
+                bottoms.append(max(bottoms[-1] if bottoms else monitor.box.top, monitor.box.top + monitor.box.height))
+            self.slabs.append((covering, [monitor.box.top for monitor in covering], bottoms))
+
+    def overlapping(self, box: Box) -> list[Monitor]:
+        x, y, w, h = box
+        edges = self.edges
+        found: dict[str, Monitor] = {}
+        for i in range(max(bisect_right(edges, x) - 1, 0), min(bisect_left(edges, x + w), len(self.slabs))):
+            covering, tops, bottoms = self.slabs[i]
+            for j in range(bisect_right(bottoms, y), bisect_left(tops, y + h)):
+                monitor = covering[j]
+                if monitor.box.top + monitor.box.height > y and monitor.name not in found:
+                    found[monitor.name] = monitor
+        result = [monitor for monitor in found.values() if _overlapArea(box, monitor.box)]
+        result.sort(key=lambda monitor: _overlapArea(box, monitor.box), reverse=True)
+        return result
+
+    def nearest(self, box: Box) -> Monitor | None:
+        overlapping = self.overlapping(box)
+        if overlapping:
+            return overlapping[0]
+        # Box is off-screen (or empty): all monitors must be checked, but it is not the usual case
+        return min(self.monitors, key=lambda monitor: _distance(box, monitor.box), default=None)
+
+
+_lock = threading.Lock()
+_topology: _Topology | None = None
+_topologyBackend: _backends.Backend | None = None
+_topologyTime = 0.0
+_watched = False
+# Increased on every invalidation, so a topology queried while monitors were changing is not kept
+_generation = 0
+_topologyGeneration = -1
+
+
+def _getTopology() -> _Topology:
+    global _topology, _topologyBackend, _topologyTime, _watched, _topologyGeneration
+    backend = _backends.getBackend()
+    topology = _topology
+    if (topology is not None and _topologyBackend is backend and _topologyGeneration == _generation and
+            (_watched or time.perf_counter() - _topologyTime < _MAX_AGE)):
+        return topology
+    with _lock:
+        if _topologyBackend is not backend:
+            _watched = _backends.current.watchMonitors(invalidateMonitors)
+            _topologyBackend = backend
+        generation = _generation
+        topology = _Topology(_backends.current.getMonitors())
+        _topology, _topologyTime, _topologyGeneration = topology, time.perf_counter(), generation
+    return topology
+
+
+def invalidateMonitors() -> None:
+    """
+    Discard the cached monitor topology, so it is queried again on next access.
+
+    It is not usually necessary, since it is invalidated when monitors change (on Linux, from XRandR and
+    _NET_WORKAREA change events), or kept only for 1 second on platforms not notifying these changes.
+    """
+    global _generation
+    _generation += 1
+
+
+def getMonitors() -> list[Monitor]:
+    """
+    Get all monitors (as Monitor structs), taken from the cached monitor topology. The topology is only queried again
+    when monitors change (see invalidateMonitors()).
+
+    :return: list of Monitor structs (name, box, workArea, primary)
+    """
+    return list(_getTopology().monitors)
+
+
+def monitorsOverlapping(box: Box | tuple[int, int, int, int]) -> list[Monitor]:
+    """
+    Find all monitors a box lies on (e.g. a window spanning two monitors), without querying the system again.
+
+    :param box: Box struct (left, top, width, height)
+    :return: list of Monitor structs overlapping the box, sorted by overlapping area (largest first)
+    """
+    return _getTopology().overlapping(box if isinstance(box, Box) else Box(*box))
+
+
+def monitorFor(box: Box | tuple[int, int, int, int]) -> Monitor | None:
+    """
+    Find the monitor a box mostly lies on (largest overlapping area), or the nearest one if the box is off-screen,
+    without querying the system again.
+
+    :param box: Box struct (left, top, width, height)
+    :return: Monitor struct, or None if no monitors are found
+    """
+    return _getTopology().nearest(box if isinstance(box, Box) else Box(*box))
+
+
+def workArea(monitor: Monitor | str | None = None) -> Box:
+    """
+    Get the current work area (area not taken by panels, docks or taskbars) of a monitor.
+
+    It can raise ValueError if there is no monitor with given name, or no monitors at all.
+
+    :param monitor: Monitor struct or monitor name. If omitted, the primary monitor is used
+    :return: Box struct (left, top, width, height) of the work area
+    """
+    topology = _getTopology()
+    if monitor is None:
+        current = topology.primary
+    else:
+        current = topology.byName.get(monitor if isinstance(monitor, str) else monitor.name)
+    if current is None:
+        raise ValueError("Monitor not found: %s" % (monitor,))
+    return current.workArea
@@ -1,8 +1,13 @@
 #!/usr/bin/python
 from __future__ import annotations
 
+import asyncio
 import sys
 import os
+import select
+import threading
+import time
+from functools import cache
 
 try:
     from typing import TypeAlias
@@ -10,13 +15,22 @@ except Exception:
     from typing import TYPE_CHECKING
     if TYPE_CHECKING:
         from typing_extensions import TypeAlias
-from typing import Union
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, Any, NamedTuple, Union
 
+import Xlib.display
+from Xlib import X
+from Xlib.ext import randr
+from Xlib.protocol import event, request, rq
 from Xlib.xobject.drawable import Window as XWindow
 
-from ._main import Box
+from ._main import Box, clip
+from ._monitors import Monitor
 from ewmhlib import EwmhWindow
 
+if TYPE_CHECKING:
+    from Xlib.protocol.rq import Event
+
 assert sys.platform == "linux"
 
 
@@ -24,6 +38,52 @@ _HandleTypeIn: TypeAlias = Union[int, XWindow, None]
 _HandleTypeOut: TypeAlias = Union[EwmhWindow, None]
 
 
+class _CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    currsize: int
+
+
+class _FrameExtentsCache:
+    """
+    Keeps _GTK_FRAME_EXTENTS of each window, so they are not requested to the X server on every query or move.
+
+    Cached extents expire after ttl seconds, unless a _BoxListener is watching the window, which keeps them updated
+    from PropertyNotify events.
+    """
+
+    def __init__(self, ttl: float = 1.0) -> None:
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._extents: dict[int, tuple[list[int] | None, float]] = {}
+
+    def get(self, winId: int) -> tuple[bool, list[int] | None]:
+        entry = self._extents.get(winId)
+        if entry is not None and (entry[1] < 0 or time.perf_counter() - entry[1] < self.ttl):
+            self.hits += 1
+            return True, entry[0]
+        self.misses += 1
+        return False, None
+
+    def put(self, winId: int, extents: list[int] | None, watched: bool = False) -> None:
+        # Watched extents (negative timestamp) never expire
+        self._extents[winId] = (extents, -1.0 if watched else time.perf_counter())
+
+    def discard(self, winId: int) -> None:
+        self._extents.pop(winId, None)
+
+    def clear(self) -> None:
+        self._extents.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> _CacheInfo:
+        return _CacheInfo(self.hits, self.misses, len(self._extents))
+
+
+_extentsCache = _FrameExtentsCache()
+
+
 def _getHandle(handle: _HandleTypeIn) -> _HandleTypeOut:
     newHandle: _HandleTypeOut = None
     if isinstance(handle, int):
@@ -33,48 +93,413 @@ def _getHandle(handle: _HandleTypeIn) -> _HandleTypeOut:
     return newHandle
 
 
+def _getDisplay(handle: _HandleTypeOut) -> Xlib.display.Display | None:
+    # Each Xlib display (connection) must be used from one thread only (see thread-safe mode)
+    return handle.display if handle is not None else None
+
+
 def _getWindowBox(handle: EwmhWindow) -> Box:
     # https://stackoverflow.com/questions/12775136/get-window-position-and-size-in-python-with-xlib
     geom = handle.xWindow.get_geometry()
     pos = handle.root.translate_coords(handle.id, 0, 0)
-    x = pos.x
-    y = pos.y
-    w = geom.width
-    h = geom.height
     # Thanks to roym899 (https://github.com/roym899) for his HELP!!!!
-    if "gnome" in os.environ.get('XDG_CURRENT_DESKTOP', "").lower():
-        # Most apps in GNOME do not set _NET_EXTENTS, but _GTK_EXTENTS,
-        # which is the additional space AROUND the window.
-        _gtk_extents = handle._getGtkFrameExtents()
-        if _gtk_extents and len(_gtk_extents) >= 4:
-            # this means there is a GTK HeaderBar
-            x += int(_gtk_extents[0])
-            y += int(_gtk_extents[2])
-            w -= (int(_gtk_extents[0]) + int(_gtk_extents[1]))
-            h -= (int(_gtk_extents[2]) + int(_gtk_extents[3]))
+    return _clientBox(pos.x, pos.y, geom.width, geom.height, _getGtkFrameExtents(handle))
+
+
+_PendingBox: TypeAlias = "tuple[EwmhWindow, request.GetGeometry, request.TranslateCoords, request.GetProperty | list[int] | None]"
+_PendingMove: TypeAlias = "tuple[EwmhWindow, Box, request.GetProperty | list[int] | None]"
+
+
+def _requestWindowBox(handle: EwmhWindow) -> _PendingBox:
+    # Deferred requests are just queued, so many of them can be sent before waiting for any reply
+    display = handle.display.display
+    geom = request.GetGeometry(display=display, defer=True, drawable=handle.id)
+    pos = request.TranslateCoords(display=display, defer=True, src_wid=handle.id, dst_wid=handle.root.id,
+                                  src_x=0, src_y=0)
+    return handle, geom, pos, _requestGtkFrameExtents(handle) if _isGnome() else None
+
+
+def _replyWindowBox(pending: _PendingBox) -> Box:
+    handle, geom, pos, extents = pending
+    geom.reply()
+    pos.reply()
+    return _clientBox(pos.x, pos.y, geom.width, geom.height, _replyGtkFrameExtents(handle, extents))
+
+
+def _getWindowBoxes(handles: list[_HandleTypeOut]) -> list[Box | None]:
+    # Send all requests first, and then collect all replies, so it costs (roughly) one round-trip instead of one
+    # per request. Replies are matched to their requests by python-xlib (deferred requests)
+    return _replyWindowBoxes(_requestWindowBoxes(handles))
+
+
+def _requestWindowBoxes(handles: list[_HandleTypeOut]) -> list[_PendingBox | None]:
+    pending: list[_PendingBox | None] = []
+    for handle in handles:
+        try:
+            pending.append(_requestWindowBox(handle) if handle is not None else None)
+        except Exception:
+            pending.append(None)
+    return pending
+
+
+def _replyWindowBoxes(pending: list[_PendingBox | None]) -> list[Box | None]:
+    boxes: list[Box | None] = []
+    for requests in pending:
+        try:
+            boxes.append(_replyWindowBox(requests) if requests is not None else None)
+        except Exception:
+            # Window likely closed or not valid
+            boxes.append(None)
+    return boxes
+
+
+async def _agetWindowBox(handle: EwmhWindow) -> Box:
+    pending = _requestWindowBox(handle)
+    await _awaitReplies([pending])
+    return _replyWindowBox(pending)
+
+
+async def _agetWindowBoxes(handles: list[_HandleTypeOut]) -> list[Box | None]:
+    pending = _requestWindowBoxes(handles)
+    await _awaitReplies(pending)
+    return _replyWindowBoxes(pending)
+
+
+async def _awaitReplies(pending: Sequence[tuple[Any, ...] | None]) -> None:
+    # Wait for the replies to all deferred requests without blocking the event loop: the X connection is read
+    # (without blocking) only when there is data available, so reply() will not block later on
+    requests = [(entry[0].display, req) for entry in pending if entry is not None
+                for req in entry[1:] if isinstance(req, rq.ReplyRequest)]
+    for display in {id(display): display for display, _ in requests}.values():
+        display.flush()
+    for display, req in requests:
+        while req._data is None and req._error is None:
+            await _readable(display.fileno())
+            display.pending_events()
+
+
+# Concurrent tasks waiting on the same X connection share the same future, since add_reader() allows one callback only
+_readers: dict[tuple[asyncio.AbstractEventLoop, int], asyncio.Future[None]] = {}
+
+
+async def _readable(fd: int) -> None:
+    loop = asyncio.get_running_loop()
+    future = _readers.get((loop, fd))
+    if future is None:
+        future = loop.create_future()
+        _readers[(loop, fd)] = future
+        loop.add_reader(fd, _setReadable, loop, fd)
+    # Shielded, so a cancelled task does not cancel the other tasks waiting on the same connection
+    await asyncio.shield(future)
+
+
+def _setReadable(loop: asyncio.AbstractEventLoop, fd: int) -> None:
+    loop.remove_reader(fd)
+    future = _readers.pop((loop, fd), None)
+    if future is not None and not future.done():
+        future.set_result(None)
+
+
+@cache
+def _isGnome() -> bool:
+    # The desktop will not change while running, so this is resolved only once
+    return "gnome" in os.environ.get('XDG_CURRENT_DESKTOP', "").lower()
+
+
+def _getGtkFrameExtents(handle: EwmhWindow) -> list[int] | None:
+    # Most apps in GNOME do not set _NET_EXTENTS, but _GTK_EXTENTS,
+    # which is the additional space AROUND the window.
+    if not _isGnome():
+        return None
+    found, extents = _extentsCache.get(handle.id)
+    if not found:
+        extents = handle._getGtkFrameExtents()
+        _extentsCache.put(handle.id, extents)
+    return extents
+
+
+def _requestGtkFrameExtents(handle: EwmhWindow) -> request.GetProperty | list[int] | None:
+    # Cached extents, or a deferred request to retrieve them later, using _replyGtkFrameExtents()
+    found, extents = _extentsCache.get(handle.id)
+    if found:
+        return extents
+    return request.GetProperty(display=handle.display.display, defer=True, delete=False, window=handle.id,
+                               property=handle.display.get_atom("_GTK_FRAME_EXTENTS"),
+                               type=X.AnyPropertyType, long_offset=0, long_length=4)
+
+
+def _replyGtkFrameExtents(handle: EwmhWindow, extents: request.GetProperty | list[int] | None) -> list[int] | None:
+    if not isinstance(extents, request.GetProperty):
+        return extents
+    extents.reply()
+    value = list(extents.value[1]) if extents.property_type != X.NONE else None
+    _extentsCache.put(handle.id, value)
+    return value
+
+
+def _clientBox(x: int, y: int, w: int, h: int, _gtk_extents: list[int] | list[str] | None) -> Box:
+    # Most apps in GNOME do not set _NET_EXTENTS, but _GTK_EXTENTS,
+    # which is the additional space AROUND the window.
+    if _gtk_extents and len(_gtk_extents) >= 4:
+        # this means there is a GTK HeaderBar
+        x += int(_gtk_extents[0])
+        y += int(_gtk_extents[2])
+        w -= (int(_gtk_extents[0]) + int(_gtk_extents[1]))
+        h -= (int(_gtk_extents[2]) + int(_gtk_extents[3]))
     # If not in GNOME: best guess is to trust pos and geom from above
     # NOTE: if you have this case and are not getting the expected result,
     #       please open an issue: https://github.com/Kalmat/PyWinBox/issues/new
     return Box(x, y, w, h)
 
 
-def _moveResizeWindow(handle: EwmhWindow, newBox: Box):
+def _frameBox(newBox: Box, _gtk_extents: list[int] | list[str] | None) -> Box:
+    # Inverse of _clientBox(): the window manager expects the position and size including the GTK extents
     newLeft = max(0, newBox.left)  # Xlib won't accept negative positions
     newTop = max(0, newBox.top)
     newWidth = newBox.width
     newHeight = newBox.height
-    if "gnome" in os.environ.get('XDG_CURRENT_DESKTOP', "").lower():
-        # Most apps in GNOME do not set _NET_EXTENTS, but _GTK_EXTENTS,
-        # which is the additional space AROUND the window.
-        _gtk_extents = handle._getGtkFrameExtents()
-        if _gtk_extents and len(_gtk_extents) >= 4:
-            # this means there is a GTK HeaderBar
-            newLeft -= int(_gtk_extents[0])
-            newTop -= int(_gtk_extents[2])
-            newWidth += (int(_gtk_extents[0]) + int(_gtk_extents[1]))
-            newHeight += (int(_gtk_extents[2]) + int(_gtk_extents[3]))
+    if _gtk_extents and len(_gtk_extents) >= 4:
+        # this means there is a GTK HeaderBar
+        newLeft -= int(_gtk_extents[0])
+        newTop -= int(_gtk_extents[2])
+        newWidth += (int(_gtk_extents[0]) + int(_gtk_extents[1]))
+        newHeight += (int(_gtk_extents[2]) + int(_gtk_extents[3]))
     # If not in GNOME: best guess is to trust pos and geom from above
     # NOTE: if you have this case and are not getting the expected result,
     #       please open an issue: https://github.com/Kalmat/PyWinBox/issues/new
+    return Box(newLeft, newTop, newWidth, newHeight)
+
+
+def _moveResizeWindow(handle: EwmhWindow, newBox: Box):
+    newLeft, newTop, newWidth, newHeight = _frameBox(newBox, _getGtkFrameExtents(handle))
     handle.setMoveResize(x=newLeft, y=newTop, width=newWidth, height=newHeight, userAction=True)
     # handle.configure(x=newLeft, y=newTop, width=newWidth, height=newHeight)
+
+
+def _requestMoveResizeWindow(handle: EwmhWindow, newBox: Box) -> _PendingMove:
+    return handle, newBox, _requestGtkFrameExtents(handle) if _isGnome() else None
+
+
+def _replyMoveResizeWindow(pending: _PendingMove) -> None:
+    handle, newBox, extents = pending
+    newLeft, newTop, newWidth, newHeight = _frameBox(newBox, _replyGtkFrameExtents(handle, extents))
+    # Same message ewmhlib's setMoveResize() sends: x, y, width and height present (bits 8-11),
+    # as if it was requested by a user action (bit 12)
+    flags = (1 << 8) | (1 << 9) | (1 << 10) | (1 << 11) | (1 << 12)
+    ev = event.ClientMessage(window=handle.id, client_type=handle.display.get_atom("_NET_MOVERESIZE_WINDOW"),
+                             data=(32, [flags, newLeft, newTop, newWidth, newHeight]))
+    # Request is just queued here (not flushed), so many of them can be sent together
+    handle.root.send_event(event=ev, event_mask=X.SubstructureRedirectMask | X.SubstructureNotifyMask)
+
+
+def _moveResizeWindows(handles: list[_HandleTypeOut], newBoxes: list[Box]) -> list[bool]:
+    # Same as _moveResizeWindow() for many windows, but queueing all requests and flushing each display only once.
+    # Frame extents (GNOME only) are also requested all at once, so it costs just one round-trip
+    return _replyMoveResizeWindows(_requestMoveResizeWindows(handles, newBoxes))
+
+
+def _requestMoveResizeWindows(handles: list[_HandleTypeOut], newBoxes: list[Box]) -> list[_PendingMove | None]:
+    pending: list[_PendingMove | None] = []
+    for handle, newBox in zip(handles, newBoxes):
+        try:
+            pending.append(_requestMoveResizeWindow(handle, newBox) if handle is not None else None)
+        except Exception:
+            pending.append(None)
+    return pending
+
+
+def _replyMoveResizeWindows(pending: list[_PendingMove | None]) -> list[bool]:
+    done: list[bool] = []
+    displays: dict[int, tuple[Xlib.display.Display, list[int]]] = {}
+    for index, requests in enumerate(pending):
+        if requests is None:
+            done.append(False)
+            continue
+        try:
+            _replyMoveResizeWindow(requests)
+            display = requests[0].display
+            displays.setdefault(id(display), (display, []))[1].append(index)
+            done.append(True)
+        except Exception:
+            # Window likely closed or not valid
+            done.append(False)
+
+    for display, indices in displays.values():
+        try:
+            display.flush()
+        except Exception:
+            for index in indices:
+                done[index] = False
+    return done
+
+
+async def _amoveResizeWindow(handle: EwmhWindow, newBox: Box) -> None:
+    pending = _requestMoveResizeWindow(handle, newBox)
+    await _awaitReplies([pending])
+    _replyMoveResizeWindow(pending)
+    handle.display.flush()
+
+
+async def _amoveResizeWindows(handles: list[_HandleTypeOut], newBoxes: list[Box]) -> list[bool]:
+    pending = _requestMoveResizeWindows(handles, newBoxes)
+    await _awaitReplies(pending)
+    return _replyMoveResizeWindows(pending)
+
+
+class _BoxListener(threading.Thread):
+    """
+    Keeps the window box updated from X11 ConfigureNotify events (StructureNotify mask), so it is not necessary
+    to query the X server every time. It uses its own display connection, since Xlib displays are not thread-safe.
+    """
+
+    def __init__(self, handle: EwmhWindow, callback: Callable[[Box], None] | None = None, interval: float = 0.1) -> None:
+        super().__init__(name="PyWinBoxListener-%s" % handle.id, daemon=True)
+        self._display = Xlib.display.Display(handle.display.get_display_name())
+        self._window = self._display.create_resource_object('window', handle.id)
+        self._root = self._display.create_resource_object('window', handle.root.id)
+        self._gtkAtom = self._display.get_atom("_GTK_FRAME_EXTENTS")
+        self._callback = callback
+        self._interval = interval
+        self._stopRequested = threading.Event()
+        self._window.change_attributes(event_mask=X.StructureNotifyMask | X.PropertyChangeMask)
+        self._extents = self._getExtents()
+        self.box: Box = self._queryBox()
+
+    def _getExtents(self) -> list[int] | None:
+        if not _isGnome():
+            return None
+        prop = self._window.get_full_property(self._gtkAtom, X.AnyPropertyType)
+        extents = list(prop.value) if prop is not None else None
+        # While listening, cached extents are kept updated from PropertyNotify events, so they never expire
+        _extentsCache.put(self._window.id, extents, watched=True)
+        return extents
+
+    def _queryBox(self) -> Box:
+        geom = self._window.get_geometry()
+        pos = self._root.translate_coords(self._window.id, 0, 0)
+        return _clientBox(pos.x, pos.y, geom.width, geom.height, self._extents)
+
+    def _update(self, box: Box):
+        if box != self.box:
+            self.box = box
+            if self._callback is not None:
+                self._callback(box)
+
+    def _processEvent(self, event: Event) -> bool:
+        if event.type == X.ConfigureNotify:
+            if event.send_event:
+                # Synthetic events (sent by the window manager) have coordinates relative to root (see ICCCM 4.1.5)
+                self._update(_clientBox(event.x, event.y, event.width, event.height, self._extents))
+            else:
+                # Otherwise, coordinates are relative to parent (likely the window manager frame)
+                self._update(self._queryBox())
+        elif event.type == X.PropertyNotify and event.atom == self._gtkAtom:
+            self._extents = self._getExtents()
+            self._update(self._queryBox())
+        elif event.type == X.DestroyNotify:
+            return False
+        return True
+
+    def run(self):
+        fd = self._display.fileno()
+        try:
+            while not self._stopRequested.is_set():
+                if not self._display.pending_events():
+                    select.select([fd], [], [], self._interval)
+                elif not self._processEvent(self._display.next_event()):
+                    break
+        finally:
+            _extentsCache.discard(self._window.id)
+            self._display.close()
+
+    def stop(self):
+        self._stopRequested.set()
+
+
+def _startBoxListener(handle: _HandleTypeOut, callback: Callable[[Box], None] | None = None) -> _BoxListener:
+    if handle is None:
+        raise ValueError
+    listener = _BoxListener(handle, callback)
+    listener.start()
+    return listener
+
+
+def _getWorkArea(display: Xlib.display.Display, root: XWindow) -> Box | None:
+    # _NET_WORKAREA holds one box (spanning all monitors) per desktop
+    prop = root.get_full_property(display.get_atom("_NET_WORKAREA"), X.AnyPropertyType)
+    if prop is None or len(prop.value) < 4:
+        return None
+    desktop = root.get_full_property(display.get_atom("_NET_CURRENT_DESKTOP"), X.AnyPropertyType)
+    index = int(desktop.value[0]) if desktop is not None and len(desktop.value) else 0
+    if len(prop.value) < (index + 1) * 4:
+        index = 0
+    return Box(*[int(value) for value in prop.value[index * 4:(index + 1) * 4]])
+
+
+def _getMonitors() -> list[Monitor]:
+    # Own display connection, so it can be invoked from any thread. It is only invoked when monitors change
+    display = Xlib.display.Display()
+    try:
+        root = display.screen().root
+        boxes: list[tuple[str, Box, bool]] = []
+        if display.has_extension("RANDR"):
+            version = display.xrandr_query_version()
+            if (version.major_version, version.minor_version) >= (1, 5):
+                boxes.extend((display.get_atom_name(info.name),
+                              Box(info.x, info.y, info.width_in_pixels, info.height_in_pixels), bool(info.primary))
+                             for info in root.xrandr_get_monitors(is_active=True).monitors)
+        if not boxes:
+            # No XRandR 1.5 (monitors): whole screen is taken as one single monitor
+            geom = root.get_geometry()
+            boxes.append((display.get_display_name(), Box(0, 0, geom.width, geom.height), True))
+        desktopArea = _getWorkArea(display, root)
+    finally:
+        display.close()
+    monitors = []
+    for name, box, primary in boxes:
+        area = clip(box, desktopArea) if desktopArea is not None else None
+        monitors.append(Monitor(name, box, area or box, primary))
+    return monitors
+
+
+class _MonitorListener(threading.Thread):
+    """
+    Invokes all callbacks when XRandR configuration changes (RRScreenChangeNotify and RRNotify events) or when
+    _NET_WORKAREA / _NET_CURRENT_DESKTOP change (PropertyNotify events on root). It uses its own display connection,
+    since Xlib displays are not thread-safe. It runs during the whole process life, one single thread for all callbacks.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(name="PyWinBoxMonitorListener", daemon=True)
+        self._display = Xlib.display.Display()
+        root = self._display.screen().root
+        self._atoms = {self._display.get_atom("_NET_WORKAREA"), self._display.get_atom("_NET_CURRENT_DESKTOP")}
+        self.callbacks: list[Callable[[], None]] = []
+        if self._display.has_extension("RANDR"):
+            root.xrandr_select_input(randr.RRScreenChangeNotifyMask | randr.RRCrtcChangeNotifyMask |
+                                     randr.RROutputChangeNotifyMask)
+        root.change_attributes(event_mask=X.PropertyChangeMask)
+        self._display.flush()
+
+    def run(self):
+        while True:
+            event = self._display.next_event()
+            # Only XRandR events are selected, other than PropertyNotify
+            if event.type != X.PropertyNotify or event.atom in self._atoms:
+                for callback in list(self.callbacks):
+                    callback()
+
+
+_monitorListener: _MonitorListener | None = None
+_monitorLock = threading.Lock()
+
+
+def _watchMonitors(callback: Callable[[], None]) -> bool:
+    global _monitorListener
+    with _monitorLock:
+        if _monitorListener is None:
+            _monitorListener = _MonitorListener()
+            _monitorListener.start()
+        if callback not in _monitorListener.callbacks:
+            _monitorListener.callbacks.append(callback)
+    return True
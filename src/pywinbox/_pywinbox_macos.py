@@ -3,6 +3,7 @@
 # mypy: disable_error_code = no-any-return
 from __future__ import annotations
 
+import asyncio
 import subprocess
 import sys
 
@@ -12,10 +13,13 @@ except Exception:
     from typing import TYPE_CHECKING
     if TYPE_CHECKING:
         from typing_extensions import TypeAlias
+from collections.abc import Callable
 from typing import NamedTuple, cast, Union
 
 from ._main import Box
+from ._monitors import Monitor
 import AppKit
+from PyObjCTools import AppHelper
 
 assert sys.platform == "darwin"
 
@@ -79,6 +83,11 @@ def _checkPermissions(activate: bool = False) -> bool:
     return ret == "true"
 
 
+def _getDisplay(handle: _HandleTypeOut) -> None:
+    # All calls share the same I/O thread in thread-safe mode
+    return None
+
+
 def _getWindowBox(handle: _macOSNSHandle | _macOSCGHandle, flipValues: bool = False):
     if handle.isNSHandle:
         handle = cast("_macOSNSHandle", handle)
@@ -88,6 +97,16 @@ def _getWindowBox(handle: _macOSNSHandle | _macOSCGHandle, flipValues: bool = Fa
         return _CGgetWindowBox(handle.appName, handle.windowTitle)
 
 
+def _getWindowBoxes(handles: list[_HandleTypeOut]) -> list[Box | None]:
+    boxes: list[Box | None] = []
+    for handle in handles:
+        try:
+            boxes.append(_getWindowBox(handle) if handle is not None else None)
+        except Exception:
+            boxes.append(None)
+    return boxes
+
+
 def _moveResizeWindow(handle: _macOSNSHandle | _macOSCGHandle, newBox: Box, flipValues: bool = False):
     if handle.isNSHandle:
         handle = cast("_macOSNSHandle", handle)
@@ -97,6 +116,35 @@ def _moveResizeWindow(handle: _macOSNSHandle | _macOSCGHandle, newBox: Box, flip
         _CGmoveResizeTo(handle.appName, handle.windowTitle, newBox)
 
 
+def _moveResizeWindows(handles: list[_HandleTypeOut], newBoxes: list[Box]) -> list[bool]:
+    done: list[bool] = []
+    for handle, newBox in zip(handles, newBoxes):
+        try:
+            if handle is not None:
+                _moveResizeWindow(handle, newBox)
+            done.append(handle is not None)
+        except Exception:
+            done.append(False)
+    return done
+
+
+async def _agetWindowBox(handle: _HandleTypeOut) -> Box:
+    # AppKit / Quartz window calls are blocking (see Backend)
+    return await asyncio.get_running_loop().run_in_executor(None, _getWindowBox, handle)
+
+
+async def _agetWindowBoxes(handles: list[_HandleTypeOut]) -> list[Box | None]:
+    return await asyncio.get_running_loop().run_in_executor(None, _getWindowBoxes, handles)
+
+
+async def _amoveResizeWindow(handle: _HandleTypeOut, newBox: Box) -> None:
+    await asyncio.get_running_loop().run_in_executor(None, _moveResizeWindow, handle, newBox)
+
+
+async def _amoveResizeWindows(handles: list[_HandleTypeOut], newBoxes: list[Box]) -> list[bool]:
+    return await asyncio.get_running_loop().run_in_executor(None, _moveResizeWindows, handles, newBoxes)
+
+
 def _CGgetWindowBox(appName: str, title: str) -> Box:
     if not _checkPermissions(True) or not appName or not title:
         return Box(0, 0, 0, 0)
@@ -175,4 +223,38 @@ def _NSmoveResizeTo(window: AppKit.NSWindow, newBox: Box, flipValues: bool = Fal
     newTop = newBox.top
     if flipValues:
         newTop = _unflipTop(window, newBox)
-    window.setFrame_display_animate_(AppKit.NSMakeRect(newBox.left, newTop, newBox.width, newBox.height), True, True)
+    frame = AppKit.NSMakeRect(newBox.left, newTop, newBox.width, newBox.height)
+    if AppKit.NSThread.isMainThread():
+        window.setFrame_display_animate_(frame, True, True)
+    else:
+        # AppKit windows can only be changed from the main thread (e.g. not from the executor in async mode, nor from
+        # the I/O thread in thread-safe mode). Not waiting for it, so it can not deadlock if main thread is waiting too
+        AppHelper.callAfter(window.setFrame_display_animate_, frame, True, True)
+
+
+def _startBoxListener(handle: _HandleTypeOut, callback: Callable[[Box], None] | None = None):
+    raise NotImplementedError('Event-driven window boxes are currently supported on Linux only')
+
+
+def _screenBox(rect: AppKit.NSRect, primaryHeight: float) -> Box:
+    # Screen coordinates origin is at the bottom-left corner of the primary screen. Flip them, as window boxes
+    x = int(rect.origin.x)
+    w = int(rect.size.width)
+    h = int(rect.size.height)
+    return Box(x, int(primaryHeight - (rect.origin.y + rect.size.height)), w, h)
+
+
+def _getMonitors() -> list[Monitor]:
+    screens = AppKit.NSScreen.screens()
+    if not screens:
+        return []
+    # First screen is always the primary one (the one containing the menu bar)
+    primaryHeight = screens[0].frame().size.height
+    return [Monitor(str(screen.deviceDescription().get("NSScreenNumber", i)),
+                    _screenBox(screen.frame(), primaryHeight), _screenBox(screen.visibleFrame(), primaryHeight), i == 0)
+            for i, screen in enumerate(screens)]
+
+
+def _watchMonitors(callback: Callable[[], None]) -> bool:
+    # NSApplicationDidChangeScreenParametersNotification requires a running application loop. Periodically queried
+    return False
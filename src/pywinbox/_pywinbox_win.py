@@ -1,6 +1,7 @@
 #!/usr/bin/python
 from __future__ import annotations
 
+import asyncio
 import sys
 
 try:
@@ -9,12 +10,16 @@ except Exception:
     from typing import TYPE_CHECKING
     if TYPE_CHECKING:
         from typing_extensions import TypeAlias
+from collections.abc import Callable
 from typing import Union
 
 import ctypes
+import win32api
+import win32con
 import win32gui
 
 from ._main import Box
+from ._monitors import Monitor
 
 assert sys.platform == "win32"
 
@@ -46,10 +51,88 @@ def _getHandle(handle: _HandleTypeIn) -> _HandleTypeOut:
     return newHandle
 
 
+def _getDisplay(handle: _HandleTypeOut) -> None:
+    # All calls share the same I/O thread in thread-safe mode
+    return None
+
+
 def _getWindowBox(handle: int) -> Box:
     x, y, r, b = win32gui.GetWindowRect(handle)
     return Box(x, y, abs(r - x), abs(b - y))
 
 
+def _getWindowBoxes(handles: list[_HandleTypeOut]) -> list[Box | None]:
+    boxes: list[Box | None] = []
+    for handle in handles:
+        try:
+            boxes.append(_getWindowBox(handle) if handle is not None else None)
+        except Exception:
+            boxes.append(None)
+    return boxes
+
+
 def _moveResizeWindow(handle: int, newBox: Box):
     win32gui.MoveWindow(handle, newBox.left, newBox.top, newBox.width, newBox.height, True)
+
+
+def _moveResizeWindows(handles: list[_HandleTypeOut], newBoxes: list[Box]) -> list[bool]:
+    # DeferWindowPos moves / resizes all windows at once, in a single screen refresh
+    done = [handle is not None and bool(win32gui.IsWindow(handle)) for handle in handles]
+    valid = [(handle, newBox) for handle, newBox, ok in zip(handles, newBoxes, done) if ok]
+    if not valid:
+        return done
+    try:
+        hdwp = win32gui.BeginDeferWindowPos(len(valid))
+        for handle, newBox in valid:
+            hdwp = win32gui.DeferWindowPos(hdwp, handle, 0, newBox.left, newBox.top, newBox.width, newBox.height,
+                                           win32con.SWP_NOZORDER | win32con.SWP_NOACTIVATE)
+        win32gui.EndDeferWindowPos(hdwp)
+    except Exception:
+        # A single failing window invalidates the whole operation. Move them one by one instead
+        for i, (handle, newBox) in enumerate(zip(handles, newBoxes)):
+            if done[i]:
+                try:
+                    _moveResizeWindow(handle, newBox)
+                except Exception:
+                    done[i] = False
+    return done
+
+
+async def _agetWindowBox(handle: _HandleTypeOut) -> Box:
+    # win32gui calls are blocking (see Backend)
+    return await asyncio.get_running_loop().run_in_executor(None, _getWindowBox, handle)
+
+
+async def _agetWindowBoxes(handles: list[_HandleTypeOut]) -> list[Box | None]:
+    return await asyncio.get_running_loop().run_in_executor(None, _getWindowBoxes, handles)
+
+
+async def _amoveResizeWindow(handle: _HandleTypeOut, newBox: Box) -> None:
+    await asyncio.get_running_loop().run_in_executor(None, _moveResizeWindow, handle, newBox)
+
+
+async def _amoveResizeWindows(handles: list[_HandleTypeOut], newBoxes: list[Box]) -> list[bool]:
+    return await asyncio.get_running_loop().run_in_executor(None, _moveResizeWindows, handles, newBoxes)
+
+
+def _startBoxListener(handle: _HandleTypeOut, callback: Callable[[Box], None] | None = None):
+    raise NotImplementedError('Event-driven window boxes are currently supported on Linux only')
+
+
+def _rectToBox(rect: tuple[int, int, int, int]) -> Box:
+    x, y, r, b = rect
+    return Box(x, y, r - x, b - y)
+
+
+def _getMonitors() -> list[Monitor]:
+    monitors = []
+    for hMonitor, _, _ in win32api.EnumDisplayMonitors():
+        info = win32api.GetMonitorInfo(hMonitor)
+        monitors.append(Monitor(info.get("Device", ""), _rectToBox(info["Monitor"]), _rectToBox(info["Work"]),
+                                bool(info.get("Flags", 0) & win32con.MONITORINFOF_PRIMARY)))
+    return monitors
+
+
+def _watchMonitors(callback: Callable[[], None]) -> bool:
+    # WM_DISPLAYCHANGE / WM_SETTINGCHANGE require a window and a message loop. Topology is periodically queried instead
+    return False
@@ -0,0 +1,197 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from collections.abc import Callable, Iterable, Iterator
+from typing import Union
+
+from ._main import Box
+
+# Each band is a horizontal stripe (top, bottom, spans), where spans is a flat, sorted tuple of x coordinates
+# (x1, x2, x3, x4, ...) describing the disjoint [x1, x2), [x3, x4), ... intervals covered within that stripe
+_Band = tuple[int, int, tuple[int, ...]]
+_RegionOperand = Union["Region", Box, tuple[int, int, int, int]]
+
+
+def _combineSpans(spansA: tuple[int, ...], spansB: tuple[int, ...], op: Callable[[bool, bool], bool]) -> tuple[int, ...]:
+    result: list[int] = []
+    ia = ib = 0
+    inA = inB = inside = False
+    for x in sorted(set(spansA).union(spansB)):
+        while ia < len(spansA) and spansA[ia] == x:
+            inA = not inA
+            ia += 1
+        while ib < len(spansB) and spansB[ib] == x:
+            inB = not inB
+            ib += 1
+        if op(inA, inB) != inside:
+            inside = not inside
+            result.append(x)
+    return tuple(result)
+
+
+def _regionOp(bandsA: list[_Band], bandsB: list[_Band], op: Callable[[bool, bool], bool]) -> list[_Band]:
+    # Split both regions by all their band limits, combining the spans of each region within each resulting stripe
+    ys = sorted({y for top, bottom, _ in bandsA for y in (top, bottom)} |
+                {y for top, bottom, _ in bandsB for y in (top, bottom)})
+    result: list[_Band] = []
+    ia = ib = 0
+    for y1, y2 in zip(ys, ys[1:]):
+        while ia < len(bandsA) and bandsA[ia][1] <= y1:
+            ia += 1
+        while ib < len(bandsB) and bandsB[ib][1] <= y1:
+            ib += 1
+        spansA = bandsA[ia][2] if ia < len(bandsA) and bandsA[ia][0] <= y1 else ()
+        spansB = bandsB[ib][2] if ib < len(bandsB) and bandsB[ib][0] <= y1 else ()
+        spans = _combineSpans(spansA, spansB, op)
+        if spans:
+            if result and result[-1][1] == y1 and result[-1][2] == spans:
+                # Coalesce with previous band, so the number of rectangles does not grow unnecessarily
+                result[-1] = (result[-1][0], y2, spans)
+            else:
+                result.append((y1, y2, spans))
+    return result
+
+
+class Region:
+
+    __slots__ = ("_bands",)
+
+    def __init__(self, boxes: Iterable[Box | tuple[int, int, int, int]] = ()) -> None:
+        """
+        Exact area covered by any number of boxes, stored as a set of disjoint rectangles (in horizontal bands,
+        as X11 regions do), which allows to calculate unions, intersections and differences of many boxes.
+
+            damaged = pywinbox.Region([box1, box2, box3])
+            visible = pywinbox.Region([screenBox]) - pywinbox.Region(windowBoxes)
+            area = (damaged & visible).area
+
+        Operators accept Region objects, as well as Box structs (left, top, width, height):
+
+        - ``|``: union
+        - ``&``: intersection
+        - ``-``: difference
+        - ``^``: symmetric difference
+
+        Unlike pointInBox(), regions cover pixels, so right and bottom edges are excluded (as in X11 regions).
+
+        :param boxes: iterable of Box structs (left, top, width, height). Empty boxes are ignored
+        """
+        regions: list[list[_Band]] = [[(top, top + height, (left, left + width))]
+                   for left, top, width, height in boxes if width > 0 and height > 0]
+        # Merge pairs of regions, so each box is merged only log(n) times
+        while len(regions) > 1:
+            merged = [_regionOp(a, b, _union) for a, b in zip(regions[::2], regions[1::2])]
+            if len(regions) % 2:
+                merged.append(regions[-1])
+            regions = merged
+        self._bands: list[_Band] = regions[0] if regions else []
+
+    @classmethod
+    def _fromBands(cls, bands: list[_Band]) -> Region:
+        region = cls.__new__(cls)
+        region._bands = bands
+        return region
+
+    @staticmethod
+    def _toRegion(other: _RegionOperand) -> Region:
+        return other if isinstance(other, Region) else Region([other])
+
+    def __or__(self, other: _RegionOperand) -> Region:
+        return self._fromBands(_regionOp(self._bands, self._toRegion(other)._bands, _union))
+
+    def __and__(self, other: _RegionOperand) -> Region:
+        return self._fromBands(_regionOp(self._bands, self._toRegion(other)._bands, _intersection))
+
+    def __sub__(self, other: _RegionOperand) -> Region:
+        return self._fromBands(_regionOp(self._bands, self._toRegion(other)._bands, _difference))
+
+    def __xor__(self, other: _RegionOperand) -> Region:
+        return self._fromBands(_regionOp(self._bands, self._toRegion(other)._bands, _xor))
+
+    __ror__ = __or__
+    __rand__ = __and__
+    __rxor__ = __xor__
+
+    def __rsub__(self, other: _RegionOperand) -> Region:
+        return self._toRegion(other) - self
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Region):
+            return NotImplemented
+        return self._bands == other._bands
+
+    def __bool__(self) -> bool:
+        return bool(self._bands)
+
+    def __len__(self) -> int:
+        """Number of disjoint rectangles in region"""
+        return sum(len(spans) // 2 for _, _, spans in self._bands)
+
+    def __iter__(self) -> Iterator[Box]:
+        """Iterate over the disjoint rectangles in region, as Box structs (left, top, width, height)"""
+        for top, bottom, spans in self._bands:
+            for i in range(0, len(spans), 2):
+                yield Box(spans[i], top, spans[i + 1] - spans[i], bottom - top)
+
+    def __contains__(self, point: tuple[int, int]) -> bool:
+        return self.containsPoint(*point)
+
+    def __repr__(self) -> str:
+        return "%s(%s)" % (self.__class__.__name__, list(self))
+
+    def isEmpty(self) -> bool:
+        """
+        Check if region is empty (it covers no area at all).
+
+        :return: ``True`` if region is empty
+        """
+        return not self._bands
+
+    @property
+    def area(self) -> int:
+        """Total area covered by region"""
+        return sum((bottom - top) * sum(spans[i + 1] - spans[i] for i in range(0, len(spans), 2))
+                   for top, bottom, spans in self._bands)
+
+    @property
+    def bounds(self) -> Box | None:
+        """Bounding box of region, as Box struct (left, top, width, height), or None if it is empty"""
+        if not self._bands:
+            return None
+        left = min(spans[0] for _, _, spans in self._bands)
+        right = max(spans[-1] for _, _, spans in self._bands)
+        top = self._bands[0][0]
+        return Box(left, top, right - left, self._bands[-1][1] - top)
+
+    def containsPoint(self, x: int, y: int) -> bool:
+        """
+        Check if a point ``(x, y)`` is within the region (right and bottom edges excluded).
+
+        :param x: x coordinate of point
+        :param y: y coordinate of point
+        :return: ``True`` if point is within the region
+        """
+        # Last band starting at or above y (bands are sorted, and tuples are compared item by item)
+        index = bisect_right(self._bands, (y, math.inf)) - 1
+        if index < 0:
+            return False
+        _, bottom, spans = self._bands[index]
+        return y < bottom and bisect_right(spans, x) % 2 == 1
+
+
+def _union(inA: bool, inB: bool) -> bool:
+    return inA or inB
+
+
+def _intersection(inA: bool, inB: bool) -> bool:
+    return inA and inB
+
+
+def _difference(inA: bool, inB: bool) -> bool:
+    return inA and not inB
+
+
+def _xor(inA: bool, inB: bool) -> bool:
+    return inA != inB
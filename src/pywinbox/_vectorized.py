@@ -0,0 +1,225 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any, Union
+
+from ._main import Box, pointInBox, collidebox, contains, clip, union, _clampBox
+from ._boxarray import BoxArray, _numpy
+
+# Boxes can be passed as any iterable of Box structs / tuples (including BoxArray), or as a (N, 4) NumPy array
+_BoxesType = Union[Iterable[Union[Box, tuple[int, int, int, int]]], Any]
+_PointsType = Union[Iterable[tuple[int, int]], Any]
+
+
+def _boxColumns(np: Any, boxes: _BoxesType):
+    if isinstance(boxes, BoxArray):
+        # Columns are already stored separately, so they can be used with no copies at all
+        return boxes.columns()
+    arr = np.asarray(boxes if hasattr(boxes, "__len__") else list(boxes)).reshape(-1, 4)
+    return arr[:, 0], arr[:, 1], arr[:, 2], arr[:, 3]
+
+
+def _pointColumns(np: Any, points: _PointsType):
+    arr = np.asarray(points if hasattr(points, "__len__") else list(points)).reshape(-1, 2)
+    return arr[:, 0], arr[:, 1]
+
+
+def pointInBoxMany(points: _PointsType, box: Box | tuple[int, int, int, int]):
+    """
+    Batch version of pointInBox(). Check which of the given points ``(x, y)`` are within the box.
+
+    :param points: iterable of points ``(x, y)`` or (N, 2) NumPy array
+    :param box: Box struct (left, top, width, height)
+    :return: mask of booleans (NumPy array if NumPy is installed, list otherwise), ``True`` for points within box
+    """
+    np = _numpy()
+    if np is None:
+        return [pointInBox(x, y, box) for x, y in points]
+    x1, y1, w1, h1 = box
+    x, y = _pointColumns(np, points)
+    return (x1 <= x) & (x <= x1 + w1) & (y1 <= y) & (y <= y1 + h1)
+
+
+def collideboxMany(boxes: _BoxesType, box: Box | tuple[int, int, int, int]):
+    """
+    Batch version of collidebox(). Check which of the given boxes are colliding with another box.
+
+    :param boxes: iterable of Box structs (left, top, width, height), BoxArray or (N, 4) NumPy array
+    :param box: Box struct (left, top, width, height)
+    :return: mask of booleans (NumPy array if NumPy is installed, list otherwise), ``True`` for colliding boxes
+    """
+    np = _numpy()
+    if np is None:
+        return [collidebox(b, box) for b in boxes]
+    x2, y2, w2, h2 = box
+    x1, y1, w1, h1 = _boxColumns(np, boxes)
+    return (x1 < x2 + w2) & (x1 + w1 > x2) & (y1 < y2 + h2) & (y1 + h1 > y2)
+
+
+def containsMany(boxes: _BoxesType, box: Box | tuple[int, int, int, int]):
+    """
+    Batch version of contains(). Check which of the given boxes are entirely inside another box.
+
+    :param boxes: iterable of Box structs (left, top, width, height), BoxArray or (N, 4) NumPy array
+    :param box: Box struct (left, top, width, height)
+    :return: mask of booleans (NumPy array if NumPy is installed, list otherwise), ``True`` for contained boxes
+    """
+    np = _numpy()
+    if np is None:
+        return [contains(b, box) for b in boxes]
+    x2, y2, w2, h2 = box
+    x1, y1, w1, h1 = _boxColumns(np, boxes)
+    return (x1 >= x2) & (x1 + w1 <= x2 + w2) & (y1 >= y2) & (y1 + h1 <= y2 + h2)
+
+
+def clipMany(boxes: _BoxesType, box: Box | tuple[int, int, int, int]):
+    """
+    Batch version of clip(). Return the intersection between each of the given boxes and another box.
+
+    Since there can not be None values in an array, boxes not intersecting are returned as ``(0, 0, 0, 0)``
+    (use collideboxMany() to get a mask of intersecting boxes).
+
+    :param boxes: iterable of Box structs (left, top, width, height), BoxArray or (N, 4) NumPy array
+    :param box: Box struct (left, top, width, height)
+    :return: intersection boxes ((N, 4) NumPy array if NumPy is installed, list of Box structs otherwise)
+    """
+    np = _numpy()
+    if np is None:
+        return [clip(b, box) or Box(0, 0, 0, 0) for b in boxes]
+    x2, y2, w2, h2 = box
+    x1, y1, w1, h1 = _boxColumns(np, boxes)
+    left = np.maximum(x1, x2)
+    top = np.maximum(y1, y2)
+    result = np.stack((left, top, np.minimum(x1 + w1, x2 + w2) - left, np.minimum(y1 + h1, y2 + h2) - top), axis=1)
+    result[~((x1 < x2 + w2) & (x1 + w1 > x2) & (y1 < y2 + h2) & (y1 + h1 > y2))] = 0
+    return result
+
+
+def unionMany(boxes: _BoxesType, box: Box | tuple[int, int, int, int]):
+    """
+    Batch version of union(). Return the bounding box of each of the given boxes and another box.
+
+    Since there can not be None values in an array, not valid union areas are returned as ``(0, 0, 0, 0)``
+
+    :param boxes: iterable of Box structs (left, top, width, height), BoxArray or (N, 4) NumPy array
+    :param box: Box struct (left, top, width, height)
+    :return: union boxes ((N, 4) NumPy array if NumPy is installed, list of Box structs otherwise)
+    """
+    np = _numpy()
+    if np is None:
+        return [union(b, box) or Box(0, 0, 0, 0) for b in boxes]
+    x2, y2, w2, h2 = box
+    x1, y1, w1, h1 = _boxColumns(np, boxes)
+    left = np.minimum(x1, x2)
+    top = np.minimum(y1, y2)
+    result = np.stack((left, top, np.maximum(x1 + w1, x2 + w2) - left, np.maximum(y1 + h1, y2 + h2) - top), axis=1)
+    result[(result[:, 2] <= 0) | (result[:, 3] <= 0)] = 0
+    return result
+
+
+def pairwiseCollide(boxesA: _BoxesType, boxesB: _BoxesType):
+    """
+    Check collisions between all boxes in boxesA and all boxes in boxesB.
+
+    :param boxesA: iterable of N Box structs (left, top, width, height), BoxArray or (N, 4) NumPy array
+    :param boxesB: iterable of M Box structs (left, top, width, height), BoxArray or (M, 4) NumPy array
+    :return: (N, M) matrix of booleans (NumPy array if NumPy is installed, list of lists otherwise),
+             ``True`` at [i][j] if boxesA[i] is colliding with boxesB[j]
+    """
+    np = _numpy()
+    if np is None:
+        boxesB = list(boxesB)
+        return [[collidebox(a, b) for b in boxesB] for a in boxesA]
+    x1, y1, w1, h1 = (c[:, None] for c in _boxColumns(np, boxesA))
+    x2, y2, w2, h2 = _boxColumns(np, boxesB)
+    return (x1 < x2 + w2) & (x1 + w1 > x2) & (y1 < y2 + h2) & (y1 + h1 > y2)
+
+
+def pairwisePointInBox(points: _PointsType, boxes: _BoxesType):
+    """
+    Check which points are within which boxes, for all given points and boxes.
+
+    :param points: iterable of N points ``(x, y)`` or (N, 2) NumPy array
+    :param boxes: iterable of M Box structs (left, top, width, height), BoxArray or (M, 4) NumPy array
+    :return: (N, M) matrix of booleans (NumPy array if NumPy is installed, list of lists otherwise),
+             ``True`` at [i][j] if points[i] is within boxes[j]
+    """
+    np = _numpy()
+    if np is None:
+        boxes = list(boxes)
+        return [[pointInBox(x, y, b) for b in boxes] for x, y in points]
+    x, y = (c[:, None] for c in _pointColumns(np, points))
+    x1, y1, w1, h1 = _boxColumns(np, boxes)
+    return (x1 <= x) & (x <= x1 + w1) & (y1 <= y) & (y <= y1 + h1)
+
+
+def _bestBoundary(box: Box | tuple[int, int, int, int], boundaries: list[Box | tuple[int, int, int, int]]) \
+        -> Box | tuple[int, int, int, int]:
+    # Boundary with largest overlapping area or, if not overlapping any, nearest one (squared distance between edges)
+    x, y, w, h = box
+    best = boundaries[0]
+    bestArea = 0
+    bestDist = -1
+    for boundary in boundaries:
+        bx, by, bw, bh = boundary
+        ow = min(x + w, bx + bw) - max(x, bx)
+        oh = min(y + h, by + bh) - max(y, by)
+        if ow > 0 and oh > 0:
+            if ow * oh > bestArea:
+                best, bestArea = boundary, ow * oh
+        elif not bestArea:
+            dx = max(bx - x - w, 0, x - bx - bw)
+            dy = max(by - y - h, 0, y - by - bh)
+            if bestDist < 0 or dx * dx + dy * dy < bestDist:
+                best, bestDist = boundary, dx * dx + dy * dy
+    return best
+
+
+def clampAll(boxes: _BoxesType, boundaries: _BoxesType):
+    """
+    Batch version of clamp() / fit(). Clamp each of the given boxes entirely inside the boundary it overlaps most
+    (or the nearest one, if not overlapping any), as BaseClass.fit() does: size is preserved if it fits, and
+    position is adjusted.
+
+    It does not move or resize any window, so results can be applied at once, e.g. to re-home all windows when a
+    monitor is unplugged:
+
+        areas = [monitor.workArea for monitor in pywinbox.getMonitors()]
+        newBoxes = pywinbox.clampAll([myBox.box for myBox in myBoxes], areas)
+        pywinbox.applyLayout({myBox: Box(*map(int, newBox)) for myBox, newBox in zip(myBoxes, newBoxes)})
+
+    It can raise ValueError if no boundaries are passed.
+
+    :param boxes: iterable of N Box structs (left, top, width, height), BoxArray or (N, 4) NumPy array
+    :param boundaries: iterable of M Box structs (left, top, width, height), BoxArray or (M, 4) NumPy array
+    :return: clamped boxes ((N, 4) NumPy array if NumPy is installed, list of Box structs otherwise)
+    """
+    np = _numpy()
+    if np is None:
+        boundaries = list(boundaries)
+        if not boundaries:
+            raise ValueError("No boundaries to clamp boxes to")
+        return [_clampBox(box, _bestBoundary(box, boundaries)) for box in boxes]
+    x2, y2, w2, h2 = _boxColumns(np, boundaries)
+    if not len(x2):
+        raise ValueError("No boundaries to clamp boxes to")
+    x1, y1, w1, h1 = _boxColumns(np, boxes)
+    # Distances are squared, so narrower integers (like int32 BoxArray columns) are widened to avoid overflows
+    x2, y2, w2, h2, x1, y1, w1, h1 = (column.astype(np.promote_types(column.dtype, np.int64), copy=False)
+                                      for column in (x2, y2, w2, h2, x1, y1, w1, h1))
+    x, y, w, h = x1[:, None], y1[:, None], w1[:, None], h1[:, None]
+    # (N, M) overlapping widths / heights (negative: gap between them), to pick the best boundary for each box
+    ow = np.minimum(x + w, x2 + w2) - np.maximum(x, x2)
+    oh = np.minimum(y + h, y2 + h2) - np.maximum(y, y2)
+    area = np.where((ow > 0) & (oh > 0), ow * oh, 0)
+    dx = np.maximum(np.maximum(x2 - x - w, x - x2 - w2), 0)
+    dy = np.maximum(np.maximum(y2 - y - h, y - y2 - h2), 0)
+    largest = area.argmax(axis=1)
+    best = np.where(area[np.arange(len(x1)), largest] > 0, largest, (dx * dx + dy * dy).argmin(axis=1))
+    bx, by, bw, bh = x2[best], y2[best], w2[best], h2[best]
+    width = np.minimum(w1, bw)
+    height = np.minimum(h1, bh)
+    left = np.minimum(np.maximum(x1, bx), bx + bw - width)
+    top = np.minimum(np.maximum(y1, by), by + bh - height)
+    return np.stack((left, top, width, height), axis=1)
@@ -0,0 +1,364 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+import sys
+import threading
+import time
+
+import pywinbox
+from pywinbox import Box
+
+
+class _Area:
+    """Fake area which counts how many times the callbacks are invoked"""
+
+    def __init__(self, box: Box) -> None:
+        self.box = box
+        self.queries = 0
+        self.sets = 0
+
+    def onQuery(self) -> Box:
+        self.queries += 1
+        return self.box
+
+    def onSet(self, newBox: Box) -> None:
+        self.sets += 1
+        self.box = newBox
+
+
+def test_snapshot() -> None:
+    area = _Area(Box(10, 20, 300, 200))
+    myBox = pywinbox.ScreenBox(area.box, area.onQuery, area.onSet)
+
+    with myBox.snapshot() as box:
+        assert box == (10, 20, 300, 200)
+        assert (myBox.left, myBox.right, myBox.center, myBox.rect) == (10, 310, (160, 120), (10, 20, 310, 220))
+        assert area.queries == 1
+
+        myBox.left = 50
+        assert area.sets == 1
+        assert myBox.box == (50, 20, 300, 200)
+        assert area.queries == 1
+
+        area.box = Box(0, 0, 100, 100)
+        assert myBox.width == 300
+        myBox.invalidate()
+        assert myBox.width == 100
+        assert area.queries == 2
+
+    assert myBox.width == 100
+    assert area.queries == 3
+    assert myBox.refresh() == (0, 0, 100, 100)
+
+
+def test_maxAge() -> None:
+    area = _Area(Box(10, 20, 300, 200))
+    myBox = pywinbox.ScreenBox(area.box, area.onQuery, area.onSet)
+    myBox.maxAge = 0.5
+
+    assert (myBox.left, myBox.top, myBox.width, myBox.height) == (10, 20, 300, 200)
+    assert area.queries == 1
+
+    myBox.width = 500
+    assert myBox.box == (10, 20, 500, 200)
+    assert (area.queries, area.sets) == (1, 1)
+
+    myBox.maxAge = 0.01
+    time.sleep(0.02)
+    area.box = Box(0, 0, 100, 100)
+    assert myBox.box == (0, 0, 100, 100)
+    assert area.queries == 2
+
+
+def test_batch() -> None:
+    area = _Area(Box(10, 20, 300, 200))
+    myBox = pywinbox.ScreenBox(area.box, area.onQuery, area.onSet)
+
+    with myBox.batch():
+        myBox.left = 100
+        myBox.top = 50
+        myBox.width = 400
+        assert myBox.right == 500
+        assert area.sets == 0
+    assert (area.queries, area.sets) == (1, 1)
+    assert area.box == (100, 50, 400, 200)
+
+    try:
+        with myBox.batch():
+            myBox.left = 0
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert area.sets == 1
+    assert myBox.box == (100, 50, 400, 200)
+
+    assert myBox.update(size=(10, 10), center=(50, 50)) == (45, 45, 10, 10)
+    assert area.sets == 2
+
+
+def test_moveInflate() -> None:
+    area = _Area(Box(10, 20, 300, 200))
+    myBox = pywinbox.ScreenBox(area.box, area.onQuery, area.onSet)
+    assert not hasattr(myBox, "__dict__")
+
+    assert myBox.move(5, -5) == (15, 15, 300, 200)
+    assert myBox.inflate(0.5, 1.5) == (15, 15, 150, 300)
+    assert area.box == (15, 15, 150, 300)
+
+
+class _SlowArea(_Area):
+    """Fake area whose callbacks are not thread-safe: it records if they are ever invoked concurrently"""
+
+    def __init__(self, box: Box) -> None:
+        super().__init__(box)
+        self.active = 0
+        self.overlaps = 0
+
+    def onQuery(self) -> Box:
+        self.active += 1
+        self.overlaps += self.active > 1
+        time.sleep(0.001)
+        box = super().onQuery()
+        self.active -= 1
+        return box
+
+    def onSet(self, newBox: Box) -> None:
+        self.active += 1
+        self.overlaps += self.active > 1
+        time.sleep(0.001)
+        super().onSet(newBox)
+        self.active -= 1
+
+
+def test_threadSafe() -> None:
+    # Boxes without handle get their own I/O thread, without loading the platform backend (no display needed)
+    area = _SlowArea(Box(0, 0, 100, 100))
+    myBox = pywinbox.ScreenBox(area.box, area.onQuery, area.onSet, threadSafe=True)
+    errors: list[Exception] = []
+    reads = 0
+
+    def worker(index: int) -> None:
+        nonlocal reads
+        try:
+            for i in range(20):
+                if index % 4 == 0:
+                    myBox.box = Box(index, i, 100, 100)
+                else:
+                    assert myBox.width == 100
+                    reads += 1
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert area.overlaps == 0
+    assert area.sets == 8 * 20
+    # Concurrent queries of the same box share the same call
+    assert area.queries < reads
+
+
+def test_watcher() -> None:
+    areas = [_Area(Box(i * 100, 0, 50, 50)) for i in range(3)]
+    myBoxes = [pywinbox.ScreenBox(area.box, area.onQuery, area.onSet) for area in areas]
+    moves: list[tuple[Box, Box]] = []
+    resizes: list[tuple[Box, Box]] = []
+    watcher = pywinbox.BoxWatcher(myBoxes, onMove=lambda obj, old, new: moves.append((old, new)),
+                                  onResize=lambda obj, old, new: resizes.append((old, new)), minInterval=1.0)
+    watcher.poll(now=0.0)
+    assert not moves and not resizes
+
+    # A drag produces one callback per minInterval, with the latest box
+    for step in range(1, 8):
+        areas[0].box = Box(step, step, 50, 50)
+        watcher.poll(now=step * 0.25)
+    assert moves == [((0, 0, 50, 50), (1, 1, 50, 50)), ((1, 1, 50, 50), (5, 5, 50, 50))]
+    watcher.poll(now=3.0)
+    assert moves[-1] == ((5, 5, 50, 50), (7, 7, 50, 50)) and len(moves) == 3
+    assert not resizes
+
+    areas[1].box = Box(100, 0, 80, 80)
+    areas[2].box = Box(250, 0, 50, 50)
+    watcher.poll(now=4.0)
+    assert resizes == [((100, 0, 50, 50), (100, 0, 80, 80))]
+    assert moves[-1] == ((200, 0, 50, 50), (250, 0, 50, 50))
+
+    # Changes reverted before being reported are not reported
+    watcher.poll(now=4.5)
+    areas[2].box = Box(0, 0, 50, 50)
+    watcher.poll(now=4.6)
+    areas[2].box = Box(250, 0, 50, 50)
+    watcher.poll(now=6.0)
+    assert len(moves) == 4
+
+    # Debounce: report only once the box stops changing
+    watcher = pywinbox.BoxWatcher(myBoxes[:1], onMove=lambda obj, old, new: moves.append((old, new)),
+                                  minInterval=0.0, debounce=0.5)
+    watcher.poll(now=10.0)
+    for step in range(1, 5):
+        areas[0].box = Box(step, 0, 50, 50)
+        watcher.poll(now=10.0 + step * 0.1)
+    assert len(moves) == 4
+    watcher.poll(now=11.0)
+    assert moves[-1] == ((7, 7, 50, 50), (4, 0, 50, 50))
+
+    watcher.start()
+    assert watcher.isRunning()
+    watcher.stop()
+    assert not watcher.isRunning()
+
+
+def test_animateTo() -> None:
+    area = _Area(Box(0, 0, 100, 100))
+    setBox = area.onSet
+
+    def slowSet(newBox: Box) -> None:
+        time.sleep(0.02)
+        setBox(newBox)
+
+    area.onSet = slowSet
+    myBox = pywinbox.ScreenBox(area.box, area.onQuery, area.onSet)
+
+    # Backend is slower than requested frame rate: frames are dropped, but duration and target box are kept
+    start = time.perf_counter()
+    animation = myBox.animateTo((200, 100, 300, 300), duration=0.2, easing="easeInOut", fps=200)
+    elapsed = time.perf_counter() - start
+    assert area.box == myBox.box == (200, 100, 300, 300)
+    # Frames rounding to the box already set are not applied again
+    assert area.sets <= animation.frames <= 0.2 / 0.02 + 2
+    assert elapsed < 0.2 + 0.1
+    assert not animation.isRunning()
+
+    # Frame rate is capped
+    area.onSet = setBox
+    myBox = pywinbox.ScreenBox(area.box, area.onQuery, area.onSet)
+    animation = myBox.animateTo((0, 0, 100, 100), duration=0.1, fps=50)
+    assert animation.frames <= 0.1 * 50 + 2
+    assert area.box == (0, 0, 100, 100)
+
+    # Running in background, cancelled by a new animation
+    first = myBox.animateTo((500, 500, 100, 100), duration=1.0, wait=False)
+    assert first.isRunning()
+    second = myBox.animateTo((10, 10, 100, 100), duration=0.05, wait=False)
+    assert first.wait(1) and second.wait(1)
+    assert area.box == (10, 10, 100, 100)
+
+
+def test_coalescing() -> None:
+    area = _Area(Box(0, 0, 100, 100))
+    myBox = pywinbox.ScreenBox(area.box, area.onQuery, area.onSet)
+
+    # Setting the box already known does nothing
+    myBox.left = myBox.left
+    with myBox.snapshot():
+        myBox.box = Box(0, 0, 100, 100)
+    assert area.sets == 0
+    with myBox.batch():
+        myBox.left = 50
+        myBox.left = 0
+    assert area.sets == 0
+    # ...but it must be the actual box, not an outdated one
+    area.box = Box(5, 0, 100, 100)
+    myBox.box = Box(0, 0, 100, 100)
+    assert area.sets == 1
+
+    # Latest wins: while a change is being applied, only the most recent one is applied next
+    applied: list[Box] = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def slowSet(newBox: Box) -> None:
+        started.set()
+        release.wait(1)
+        applied.append(newBox)
+        area.onSet(newBox)
+
+    myBox = pywinbox.ScreenBox(area.box, area.onQuery, slowSet, latestWins=True)
+    myBox.box = Box(1, 0, 100, 100)
+    assert started.wait(1)
+    start = time.perf_counter()
+    for left in range(2, 50):
+        myBox.box = Box(left, 0, 100, 100)
+    assert time.perf_counter() - start < 0.5
+    release.set()
+    assert myBox.flush(1)
+    assert applied == [(1, 0, 100, 100), (49, 0, 100, 100)]
+    assert area.box == myBox.box == (49, 0, 100, 100)
+
+    # Errors applying changes are raised by flush()
+    def failingSet(newBox: Box) -> None:
+        raise RuntimeError
+
+    myBox = pywinbox.ScreenBox(area.box, area.onQuery, failingSet, latestWins=True)
+    myBox.left = 10
+    try:
+        myBox.flush(1)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError
+
+
+def test_instrumentation() -> None:
+    area = _Area(Box(0, 0, 100, 100))
+    myBox = pywinbox.ScreenBox(area.box, area.onQuery, area.onSet)
+    myBox.maxAge = 10
+    assert myBox.stats is None
+    stats = myBox.instrument()
+    assert stats is not None and myBox.stats is stats
+    assert isinstance(myBox, pywinbox.ScreenBox) and type(myBox).__name__ == "ScreenBox"
+
+    assert myBox.left == 0 and myBox.left == 0 and myBox.center == (50, 50)
+    myBox.width = 200
+    myBox.width = 300
+    # Reading the box to set width is not a read
+    assert stats.gets == {"left": 2, "center": 1}
+    assert stats.sets == {"width": 2}
+    assert (stats.cacheMisses, stats.cacheHits) == (1, 2)
+    assert stats.latency["query"].count == 1 and stats.latency["set"].count == 2
+    assert sum(stats.latency["set"].buckets) == 2
+    assert stats.asDict()["sets"] == {"width": 2}
+
+    # Not instrumented objects are left untouched
+    myBox.instrument(False)
+    assert myBox.stats is None and type(myBox) is pywinbox.ScreenBox
+    assert myBox.left == 0
+    assert stats.gets["left"] == 2
+
+    # Global stats and sink
+    events: list[pywinbox.InstrumentationEvent] = []
+    globalStats = pywinbox.enableInstrumentation(sink=events.append)
+    try:
+        globalStats.reset()
+        otherBox = pywinbox.ScreenBox(area.box, area.onQuery, area.onSet)
+        assert otherBox.stats is not None
+        otherBox.top = 10
+        assert otherBox.left == 0
+        assert [(event.kind, event.name, event.obj) for event in events] == [("set", "top", otherBox),
+                                                                              ("get", "left", otherBox)]
+        assert globalStats.sets == {"top": 1} and globalStats.gets == {"left": 1}
+        assert pywinbox.getStats() is globalStats
+        if sys.platform == "linux":
+            assert globalStats.asDict()["extentsCache"] == pywinbox.getFrameExtentsCacheInfo()
+    finally:
+        pywinbox.disableInstrumentation()
+    assert pywinbox.ScreenBox(area.box, area.onQuery, area.onSet).stats is None
+
+
+def main() -> None:
+    test_snapshot()
+    test_maxAge()
+    test_batch()
+    test_moveInflate()
+    test_threadSafe()
+    test_watcher()
+    test_animateTo()
+    test_coalescing()
+    test_instrumentation()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,329 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+import asyncio
+import gc
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import pywinbox
+from pywinbox import Box, _backends, _iothread
+
+
+@contextmanager
+def _restoredBackend() -> Iterator[None]:
+    # Select the previous backend again when done. It may have not been loaded yet, and loading the platform backend
+    # (e.g. setBackend(sys.platform)) would require a display on Linux
+    selected, current = _backends._selected, _backends.current
+    try:
+        yield
+    finally:
+        _backends._selected, _backends.current = selected, current
+
+
+def test_memoryBackend() -> None:
+    backend = pywinbox.MemoryBackend()
+    with _restoredBackend():
+        assert pywinbox.setBackend(backend) is pywinbox.getBackend() is backend
+        handle = backend.createWindow((10, 20, 300, 200))
+        myBox = pywinbox.WindowBox(handle)
+        assert myBox.box == (10, 20, 300, 200)
+        myBox.topleft = (50, 60)
+        assert backend.getWindowBox(handle) == (50, 60, 300, 200)
+
+        # Not valid handles
+        try:
+            pywinbox.WindowBox(12345)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError
+
+        # Queries saved by snapshot and maxAge, and moves saved by batch
+        backend.resetCounters()
+        with myBox.snapshot():
+            assert (myBox.left, myBox.right, myBox.center) == (50, 350, (200, 160))
+        assert backend.queries == 1
+        cachedBox = pywinbox.WindowBox(handle, maxAge=10)
+        for _ in range(10):
+            assert cachedBox.width == 300
+        assert backend.queries == 2
+        with myBox.batch():
+            myBox.left = 0
+            myBox.width = 500
+        assert backend.moves == 1 and backend.getWindowBox(handle) == (0, 60, 500, 200)
+
+        # Bulk functions take one single round trip
+        handles = [backend.createWindow((i * 10, 0, 100, 100)) for i in range(50)]
+        backend.resetCounters()
+        boxes = pywinbox.getWindowBoxes([*handles, None])
+        assert backend.roundTrips == 1 and backend.queries == 51
+        assert boxes[-1] is None and boxes[3] == (30, 0, 100, 100)
+        done = pywinbox.applyLayout({handle: Box(0, 0, 50, 50) for handle in handles})
+        assert all(done.values()) and backend.moves == 50
+        # Only windows actually moved are counted
+        backend.resetCounters()
+        assert backend.moveResizeWindows([handles[0], None, 12345], [Box(0, 0, 50, 50)] * 3) == [True, False, False]
+        assert backend.moves == 1
+
+        # Asyncio API
+        async def asyncTest() -> None:
+            await myBox.aset((1, 2, 3, 4))
+            assert await myBox.aquery() == (1, 2, 3, 4)
+            assert await pywinbox.agetWindowBoxes([handle, handles[0]]) == [(1, 2, 3, 4), (0, 0, 50, 50)]
+
+        asyncio.run(asyncTest())
+
+        # Events: external changes are received without querying
+        changes: list[Box] = []
+        myBox.startEvents(onChange=changes.append)
+        backend.resetCounters()
+        backend.setWindowBox(handle, (5, 5, 100, 100))
+        assert myBox.box == (5, 5, 100, 100) and changes == [(5, 5, 100, 100)]
+        assert backend.queries == 0
+        myBox.stopEvents()
+        assert not myBox.isListening()
+
+        backend.closeWindow(handle)
+        assert pywinbox.getWindowBoxes([handle]) == [None]
+
+
+def test_latency() -> None:
+    backend = pywinbox.MemoryBackend(latency=0.01, moveLatency=0.01)
+    with _restoredBackend():
+        pywinbox.setBackend(backend)
+        handles = [backend.createWindow((0, 0, 100, 100)) for _ in range(20)]
+
+        start = time.perf_counter()
+        for handle in handles:
+            backend.getWindowBox(handle)
+        oneByOne = time.perf_counter() - start
+        start = time.perf_counter()
+        pywinbox.getWindowBoxes(handles)
+        bulk = time.perf_counter() - start
+        assert oneByOne >= 20 * 0.01 > bulk
+
+        # Concurrent queries of the same window share one round trip in thread-safe mode, even from different objects
+        safeBoxes = [pywinbox.WindowBox(handles[0], threadSafe=True) for _ in range(10)]
+        backend.resetCounters()
+        threads = [threading.Thread(target=lambda safeBox=safeBox: safeBox.box) for safeBox in safeBoxes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert backend.queries < 10
+
+        # I/O thread is stopped when its last box is gone, and bulk functions do not use it anymore
+        ioThread = _iothread._ioThreads[backend]
+        assert _iothread._hasDisplayThreads()
+        del safeBoxes, threads, thread
+        gc.collect()
+        ioThread.join(1)
+        assert not ioThread.is_alive() and backend not in _iothread._ioThreads
+        assert not _iothread._hasDisplayThreads()
+        assert pywinbox.WindowBox(handles[0], threadSafe=True).box == (0, 0, 100, 100)
+
+
+def test_registry() -> None:
+    backend = pywinbox.MemoryBackend()
+    pywinbox.registerBackend("memory", lambda: backend)
+    with _restoredBackend():
+        assert pywinbox.setBackend("memory") is backend
+        assert pywinbox.setBackend("memory") is backend
+        try:
+            pywinbox.setBackend("notRegistered")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError
+        assert pywinbox.getBackend() is backend
+
+
+def test_instrumentation() -> None:
+    backend = pywinbox.MemoryBackend(latency=0.001)
+    with _restoredBackend():
+        pywinbox.setBackend(backend)
+        stats = pywinbox.enableInstrumentation(boxes=False)
+        try:
+            stats.reset()
+            assert pywinbox.getBackend() is backend
+            handles = [backend.createWindow((0, 0, 100, 100)) for _ in range(3)]
+            myBox = pywinbox.WindowBox(handles[0])
+            assert myBox.stats is None
+            myBox.left = 10
+            pywinbox.getWindowBoxes(handles)
+            assert stats.calls["getWindowBox"] == 1 and stats.calls["moveResizeWindow"] == 1
+            assert stats.calls["getWindowBoxes"] == 1
+            histogram = stats.latency["getWindowBox"]
+            assert histogram.count == 1 and histogram.max >= 0.001
+            assert sum(histogram.buckets) == 1 and histogram.buckets[histogram.bounds.index(1e-2)] == 1
+            assert not stats.gets
+        finally:
+            pywinbox.disableInstrumentation()
+        # Backend is no longer wrapped
+        assert _backends.current is backend
+
+
+def test_monitors() -> None:
+    backend = pywinbox.MemoryBackend()
+    with _restoredBackend():
+        pywinbox.setBackend(backend)
+        assert [monitor.box for monitor in pywinbox.getMonitors()] == [(0, 0, 1920, 1080)]
+        # Two monitors side by side, and a third one below the second one
+        left = pywinbox.Monitor("LEFT", Box(0, 0, 1920, 1080), Box(0, 30, 1920, 1050), True)
+        backend.setMonitors([left, (1920, 0, 2560, 1440), (1920, 1440, 1280, 1024)])
+        monitors = pywinbox.getMonitors()
+        assert [monitor.name for monitor in monitors] == ["LEFT", "MEMORY-1", "MEMORY-2"]
+        backend.resetCounters()
+
+        # Lookups use the cached topology (no queries at all)
+        assert pywinbox.monitorFor((100, 100, 300, 200)) == left
+        assert pywinbox.monitorFor((1800, 100, 400, 200)) == monitors[1]
+        assert pywinbox.monitorFor((1700, 100, 400, 200)) == left
+        assert pywinbox.monitorsOverlapping((1800, 1300, 400, 400)) == [monitors[2], monitors[1]]
+        assert pywinbox.monitorsOverlapping((5000, 5000, 10, 10)) == []
+        # Off-screen boxes are taken to the nearest monitor
+        assert pywinbox.monitorFor((-500, 500, 100, 100)) == left
+        assert pywinbox.monitorFor((2000, 3000, 100, 100)) == monitors[2]
+        assert pywinbox.workArea() == (0, 30, 1920, 1050)
+        assert pywinbox.workArea("MEMORY-2") == (1920, 1440, 1280, 1024)
+        try:
+            pywinbox.workArea("notConnected")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError
+        assert backend.queries == 0
+
+        # clamp() / fit() with no boundary target the work area of the monitor the window mostly lies on
+        myBox = pywinbox.WindowBox(backend.createWindow((1800, -20, 400, 200)))
+        myBox.fit()
+        assert myBox.box == (1920, 0, 400, 200)
+        myBox.box = (-50, 0, 300, 1200)
+        myBox.clamp()
+        assert myBox.box == (0, 30, 300, 1050)
+        myBox.unclamp()
+
+        # Topology is invalidated when monitors change
+        backend.setMonitors([(0, 0, 1280, 1024)])
+        assert pywinbox.workArea(pywinbox.monitorFor((1800, 100, 400, 200))) == (0, 0, 1280, 1024)
+
+
+def test_layout() -> None:
+    backend = pywinbox.MemoryBackend()
+    with _restoredBackend():
+        pywinbox.setBackend(backend)
+        boundary = Box(0, 0, 1000, 600)
+        for mode in ("grid", "masterStack", "columns", "bsp"):
+            layout = pywinbox.Layout(boundary, mode=mode, gap=10)
+            handles = [backend.createWindow((0, 0, 100, 100)) for _ in range(8)]
+            for handle in handles:
+                changed = layout.add(handle)
+                assert handle in changed and changed[handle] == layout.get(handle)
+            boxes = list(layout.boxes.values())
+            for i, box in enumerate(boxes):
+                assert pywinbox.contains(box, (10, 10, 980, 580))
+                assert not any(pywinbox.collidebox(box, other) for other in boxes[i + 1:])
+
+            # All pending changes are applied with one single bulk call
+            backend.resetCounters()
+            assert all(layout.apply().values()) and backend.moves == 8
+            assert pywinbox.getWindowBoxes(handles) == [layout.get(handle) for handle in handles]
+            assert layout.apply() == {}
+
+            # Removing a window only affects some of the others, and only these are applied
+            changed = layout.remove(handles[3])
+            assert handles[3] not in layout and len(layout) == 7
+            assert set(layout.pending) == set(changed)
+            if mode == "grid":
+                # Last window fills the hole
+                assert list(changed) == [handles[-1]]
+            elif mode == "masterStack":
+                # Master window is not affected
+                assert handles[0] not in changed and len(changed) == 6
+            elif mode == "bsp":
+                # Only the windows taking the area released
+                assert not set(changed) & set(handles[:3])
+            if mode != "bsp":
+                # Same result as laying out all windows from scratch
+                full = pywinbox.Layout(boundary, mode=mode, gap=10)
+                for handle in layout:
+                    full.add(handle)
+                assert full.boxes == layout.boxes
+            backend.resetCounters()
+            layout.apply()
+            assert backend.moves == len(changed)
+
+        # Changes are kept if applying them fails
+        layout = pywinbox.Layout(boundary, mode="columns")
+        handles = [backend.createWindow((0, 0, 100, 100)) for _ in range(3)]
+        for handle in handles:
+            layout.add(handle)
+
+        def failingMove(handles: list[int | None], newBoxes: list[Box]) -> list[bool]:
+            raise RuntimeError
+
+        backend.moveResizeWindows = failingMove
+        try:
+            layout.apply()
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError
+        del backend.moveResizeWindows
+        assert set(layout.pending) == set(handles)
+        assert all(layout.apply().values()) and not layout.pending
+
+        # Windows which could not be applied are kept as pending, but not the rest
+        layout.relayout((0, 0, 600, 300))
+        backend.closeWindow(handles[1])
+        assert layout.apply() == {handles[0]: True, handles[1]: False, handles[2]: True}
+        assert layout.pending == {handles[1]: Box(200, 0, 200, 300)}
+        layout.remove(handles[1])
+        assert all(layout.apply().values()) and not layout.pending
+
+        # Boxes never exceed the boundary, even if gaps do not fit
+        for mode in ("grid", "masterStack", "columns", "bsp"):
+            for gap in (7, 600):
+                layout = pywinbox.Layout((0, 0, 1000, 700), mode=mode, gap=gap)
+                for key in range(18):
+                    layout.add(key)
+                    for left, top, width, height in layout.boxes.values():
+                        assert 0 <= left <= left + width <= 1000 and 0 <= top <= top + height <= 700
+
+        layout = pywinbox.Layout(boundary, mode="bsp")
+        layout.add("a")
+        layout.add("b")
+        assert layout.add("c", at="a") == {"a": (0, 0, 500, 300), "c": (0, 300, 500, 300)}
+        # Split along the longest side
+        assert layout.remove("b") == {"a": (0, 0, 500, 600), "c": (500, 0, 500, 600)}
+        assert layout.relayout((0, 0, 600, 1000)) == {"a": (0, 0, 600, 500), "c": (0, 500, 600, 500)}
+        try:
+            layout.add("a")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError
+        try:
+            pywinbox.Layout(boundary, mode="notAMode")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError
+        # Work area of primary monitor by default
+        assert pywinbox.Layout(mode="columns", gap=5).add("a") == {"a": (5, 5, 1910, 1070)}
+
+
+def main() -> None:
+    test_memoryBackend()
+    test_latency()
+    test_registry()
+    test_instrumentation()
+    test_monitors()
+    test_layout()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+import random
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import cast
+
+import pywinbox
+from pywinbox import Box, _boxarray
+
+
+def _randomBoxes(n: int) -> list[Box]:
+    return [Box(random.randint(-100, 500), random.randint(-100, 500), random.randint(0, 200), random.randint(0, 200))
+            for _ in range(n)]
+
+
+@contextmanager
+def _withoutNumpy() -> Iterator[None]:
+    # Batch functions behave as if NumPy was not installed (pure Python versions)
+    np = _boxarray._numpy()
+    _boxarray._np = None
+    try:
+        yield
+    finally:
+        _boxarray._np = np
+
+
+def test_functions() -> None:
+    box = Box(10, 10, 100, 50)
+    assert pywinbox.pointInBox(110, 60, box)
+    assert not pywinbox.pointInBox(111, 60, box)
+    assert pywinbox.collidebox(box, (100, 50, 20, 20))
+    assert not pywinbox.collidebox(box, (110, 10, 20, 20))
+    assert pywinbox.contains((20, 20, 10, 10), box)
+    assert pywinbox.clip(box, (100, 50, 20, 20)) == (100, 50, 10, 10)
+    assert pywinbox.clip(box, (110, 10, 20, 20)) is None
+    assert pywinbox.union(box, (100, 50, 20, 20)) == (10, 10, 110, 60)
+    assert pywinbox.union(box, (200, 0, 10, 10)) == (10, 0, 200, 60)
+    assert pywinbox.unionAll([box, (100, 50, 20, 20), (200, 0, 10, 10)]) == (10, 0, 200, 70)
+    assert pywinbox.unionAll([]) is None
+
+    boxes = _randomBoxes(50)
+    expected: Box | None = boxes[0]
+    for other in boxes[1:]:
+        expected = pywinbox.union(expected, other) if expected else None
+    assert pywinbox.unionAll(iter(boxes)) == expected
+
+
+def test_many() -> None:
+    random.seed(0)
+    boxes = _randomBoxes(200)
+    points = [(random.randint(-100, 600), random.randint(-100, 600)) for _ in range(50)]
+    box = Box(50, 50, 200, 150)
+
+    assert [bool(v) for v in pywinbox.pointInBoxMany(points, box)] == [pywinbox.pointInBox(x, y, box) for x, y in points]
+    assert [bool(v) for v in pywinbox.collideboxMany(boxes, box)] == [pywinbox.collidebox(b, box) for b in boxes]
+    assert [bool(v) for v in pywinbox.containsMany(boxes, box)] == [pywinbox.contains(b, box) for b in boxes]
+    assert ([tuple(int(c) for c in v) for v in pywinbox.clipMany(boxes, box)] ==
+            [pywinbox.clip(b, box) or (0, 0, 0, 0) for b in boxes])
+    assert ([tuple(int(c) for c in v) for v in pywinbox.unionMany(boxes, box)] ==
+            [pywinbox.union(b, box) or (0, 0, 0, 0) for b in boxes])
+    assert ([[bool(v) for v in row] for row in pywinbox.pairwiseCollide(boxes[:20], boxes)] ==
+            [[pywinbox.collidebox(a, b) for b in boxes] for a in boxes[:20]])
+    assert ([[bool(v) for v in row] for row in pywinbox.pairwisePointInBox(points, boxes)] ==
+            [[pywinbox.pointInBox(x, y, b) for b in boxes] for x, y in points])
+
+
+def test_clampAll() -> None:
+    random.seed(0)
+    boxes = _randomBoxes(200)
+    monitors = [Box(0, 0, 300, 200), Box(300, 0, 250, 400), Box(0, 200, 150, 100)]
+    result = [tuple(int(c) for c in v) for v in pywinbox.clampAll(boxes, monitors)]
+    for box, newBox in zip(boxes, result):
+        # Clamped to the boundary it overlaps most, or to the nearest one, as fit() does
+        areas = [(b.width * b.height if b else 0) for b in (pywinbox.clip(box, m) for m in monitors)]
+        if max(areas):
+            target = monitors[areas.index(max(areas))]
+        else:
+            distances = [max(m.left - box.left - box.width, 0, box.left - m.left - m.width) ** 2 +
+                         max(m.top - box.top - box.height, 0, box.top - m.top - m.height) ** 2 for m in monitors]
+            target = monitors[distances.index(min(distances))]
+        width, height = min(box.width, target.width), min(box.height, target.height)
+        assert newBox == (min(max(box.left, target.left), target.left + target.width - width),
+                          min(max(box.top, target.top), target.top + target.height - height), width, height)
+        assert pywinbox.contains(newBox, target)
+    assert [tuple(int(c) for c in v) for v in pywinbox.clampAll([(250, 150, 100, 100)], monitors)] == \
+           [(300, 150, 100, 100)]
+    # Squared distances of far boxes do not overflow, even if stored as C integers
+    far = [(127000, 127000, 10, 10)]
+    farMonitors = [(0, 0, 100, 100), (254000, 254000, 100, 100)]
+    for farBoxes in (far, pywinbox.BoxArray(far)):
+        result = pywinbox.clampAll(farBoxes, pywinbox.BoxArray(farMonitors))
+        assert [tuple(int(c) for c in v) for v in result] == [(90, 90, 10, 10)]
+    try:
+        pywinbox.clampAll(boxes, [])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError
+
+
+def test_boxIndex() -> None:
+    random.seed(0)
+    boxes = dict(enumerate(_randomBoxes(300)))
+    index = pywinbox.BoxIndex(cellSize=64)
+    for key, box in boxes.items():
+        index.insert(key, box)
+    for key in range(0, 300, 5):
+        boxes[key] = Box(key, key, 50, 50)
+        index.update(key, boxes[key])
+    for key in range(0, 300, 7):
+        index.remove(key)
+        del boxes[key]
+    assert len(index) == len(boxes)
+
+    def distance(box: Box) -> int:
+        dx = max(box.left - x, 0, x - box.left - box.width)
+        dy = max(box.top - y, 0, y - box.top - box.height)
+        return dx * dx + dy * dy
+
+    for _ in range(100):
+        x, y = random.randint(-200, 800), random.randint(-200, 800)
+        assert sorted(cast("list[int]", index.queryPoint(x, y))) == \
+               [k for k, b in boxes.items() if pywinbox.pointInBox(x, y, b)]
+        area = Box(x, y, 60, 40)
+        assert sorted(cast("list[int]", index.queryBox(area))) == \
+               [k for k, b in boxes.items() if pywinbox.collidebox(b, area)]
+        assert distance(boxes[cast("int", index.nearest(x, y))]) == min(distance(b) for b in boxes.values())
+
+    # Occupied area shrinks when boxes on its edges are removed
+    index.insert("far", (10000, 10000, 10, 10))
+    index.remove("far")
+    assert index.nearest(0, 0) is not None
+    assert index._extent is not None and index._extent[2] < 10000 // 64
+
+
+def test_boxArray() -> None:
+    random.seed(0)
+    boxes = _randomBoxes(100)
+    boxArray = pywinbox.BoxArray(boxes)
+    assert len(boxArray) == 100
+    assert list(boxArray) == boxes
+    assert boxArray[3] == boxes[3]
+    assert pywinbox.BoxArray.fromRects(boxArray.toRects()) == boxArray
+
+    view = boxArray[10:20]
+    assert list(view) == boxes[10:20]
+    view[0] = (1, 2, 3, 4)
+    assert boxArray[10] == (1, 2, 3, 4)
+    boxes[10] = Box(1, 2, 3, 4)
+    del view
+
+    box = Box(50, 50, 200, 150)
+    assert [bool(v) for v in pywinbox.collideboxMany(boxArray, box)] == [pywinbox.collidebox(b, box) for b in boxes]
+    assert ([tuple(int(c) for c in v) for v in pywinbox.clipMany(boxArray[::2], box)] ==
+            [pywinbox.clip(b, box) or (0, 0, 0, 0) for b in boxes[::2]])
+
+    boxArray.append((0, 0, 10, 10))
+    assert boxArray[-1] == (0, 0, 10, 10)
+
+    if _boxarray._numpy() is not None:
+        # NumPy views share the values, and NumPy arrays can be converted back
+        lefts = boxArray.columns()[0]
+        lefts[0] = 123
+        assert boxArray[0].left == 123
+        assert [tuple(int(c) for c in v) for v in boxArray.toArray()] == list(boxArray)
+        assert pywinbox.BoxArray(boxArray.toArray()) == boxArray
+
+
+def test_withoutNumpy() -> None:
+    with _withoutNumpy():
+        assert isinstance(pywinbox.collideboxMany([(0, 0, 10, 10)], (5, 5, 1, 1)), list)
+        try:
+            pywinbox.BoxArray().columns()
+        except ImportError:
+            pass
+        else:
+            raise AssertionError
+        test_many()
+        test_clampAll()
+        test_boxArray()
+
+
+def test_region() -> None:
+
+    def pixels(boxes: list[Box]) -> set[tuple[int, int]]:
+        return {(x, y) for b in boxes for x in range(b.left, b.left + b.width) for y in range(b.top, b.top + b.height)}
+
+    random.seed(0)
+    for _ in range(50):
+        boxesA = [Box(random.randint(0, 40), random.randint(0, 40), random.randint(0, 15), random.randint(0, 15))
+                  for _ in range(random.randint(0, 6))]
+        boxesB = [Box(random.randint(0, 40), random.randint(0, 40), random.randint(0, 15), random.randint(0, 15))
+                  for _ in range(random.randint(0, 6))]
+        regionA, regionB = pywinbox.Region(boxesA), pywinbox.Region(boxesB)
+        pixelsA, pixelsB = pixels(boxesA), pixels(boxesB)
+        for region, expected in ((regionA | regionB, pixelsA | pixelsB), (regionA & regionB, pixelsA & pixelsB),
+                                 (regionA - regionB, pixelsA - pixelsB), (regionA ^ regionB, pixelsA ^ pixelsB)):
+            assert pixels(list(region)) == expected
+            assert region.area == len(expected)
+            assert all(((x, y) in region) == ((x, y) in expected) for x in range(60) for y in range(60))
+
+    region = pywinbox.Region([(0, 0, 10, 10), (10, 0, 10, 10)])
+    assert list(region) == [(0, 0, 20, 10)]
+    assert region.bounds == (0, 0, 20, 10)
+    assert (region - (0, 0, 20, 10)).isEmpty()
+
+
+def main() -> None:
+    test_functions()
+    test_many()
+    test_clampAll()
+    test_boxIndex()
+    test_boxArray()
+    test_withoutNumpy()
+    test_region()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/python
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+# Modules which must not be imported by "import pywinbox" (platform backends and NumPy are loaded when first used)
+_LAZY_MODULES = ("pywinbox._pywinbox_linux", "pywinbox._pywinbox_win", "pywinbox._pywinbox_macos",
+                 "Xlib", "ewmhlib", "win32gui", "AppKit", "Quartz", "importlib.metadata", "numpy")
+# Import time budget (in seconds) of pywinbox itself
+_BUDGET = 0.25
+
+
+def _importTimes(code: str) -> dict[str, tuple[float, float]]:
+    # Run code in a new interpreter (without display), returning self and cumulative import time of each module
+    env = dict(os.environ)
+    env.pop("DISPLAY", None)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env, capture_output=True,
+                            text=True, check=True)
+    times: dict[str, tuple[float, float]] = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            selfTime, cumulative, name = line[len("import time:"):].split("|")
+            if selfTime.strip().isdigit():
+                times[name.strip()] = (int(selfTime) / 1e6, int(cumulative) / 1e6)
+    return times
+
+
+def test_lazyImport() -> None:
+    times = _importTimes("import pywinbox\n"
+                         "box = pywinbox.Box(0, 0, 10, 10)\n"
+                         "myBox = pywinbox.ScreenBox(box, lambda: box, lambda newBox: None)\n"
+                         "assert pywinbox.clip(myBox.box, (5, 5, 10, 10)) == (5, 5, 5, 5)")
+    assert "pywinbox" in times
+    for module in _LAZY_MODULES:
+        assert module not in times, "%s imported" % module
+
+
+def test_headlessCoalescing() -> None:
+    # Boxes without handle do not need the platform backend in latestWins (or threadSafe) mode either
+    times = _importTimes("import pywinbox\n"
+                         "box = pywinbox.Box(0, 0, 10, 10)\n"
+                         "applied = []\n"
+                         "myBox = pywinbox.ScreenBox(box, lambda: box, applied.append, latestWins=True)\n"
+                         "for left in range(1, 50):\n"
+                         "    myBox.left = left\n"
+                         "assert myBox.flush(1) and applied[-1] == (49, 0, 10, 10) and len(applied) <= 49")
+    for module in _LAZY_MODULES:
+        assert module not in times, "%s imported" % module
+
+
+def test_importTime() -> None:
+    # Best of several runs, since the first ones may be slowed down by disk caches
+    best = float("inf")
+    for _ in range(5):
+        times = _importTimes("import pywinbox")
+        best = min(best, times["pywinbox"][1])
+    print("Import time: %.1f ms (budget: %.1f ms)" % (best * 1000, _BUDGET * 1000))
+    assert best < _BUDGET
+
+
+def test_version() -> None:
+    import pywinbox
+    try:
+        version = pywinbox.__version__
+    except ImportError:
+        # Not installed (e.g. run from sources), so there is no package metadata
+        return
+    assert version == pywinbox.version() == pywinbox.version(numberOnly=False)[len("PyWinBox-"):]
+
+
+def main() -> None:
+    test_lazyImport()
+    test_headlessCoalescing()
+    test_importTime()
+    test_version()
+
+
+if __name__ == '__main__':
+    main()
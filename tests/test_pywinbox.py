@@ -1,9 +1,11 @@
 #!/usr/bin/python
 from __future__ import annotations
 
+import asyncio
 import os
 import subprocess
 import sys
+import threading
 import time
 from typing import TypedDict
 
@@ -160,6 +162,83 @@ def test_basic() -> None:
     print(npw.box, npw.rect)
     assert npw.size == (551, 401)
 
+    # Test bulk query
+    boxes = pywinbox.getWindowBoxes([myPyBox, npw.getHandle(), None])
+    print("BULK", boxes, npw.box)
+    assert boxes[0] == boxes[1] == myPyBox.box
+    assert boxes[2] is None
+
+    # Test bulk move / resize
+    done = pywinbox.applyLayout({myPyBox: pywinbox.Box(150, 160, 560, 410), None: pywinbox.Box(0, 0, 10, 10)})
+    time.sleep(timelap)
+    print("LAYOUT", done, npw.box)
+    assert done == {myPyBox: True, None: False}
+    assert npw.box == myPyBox.box == (150, 160, 560, 410)
+
+    # Test asyncio API
+    async def asyncTest() -> None:
+        await myPyBox.aset(pywinbox.Box(160, 170, 550, 400))
+        await asyncio.sleep(timelap)
+        box, boxes = await asyncio.gather(myPyBox.aquery(), pywinbox.agetWindowBoxes([npw.getHandle(), None]))
+        print("ASYNC", box, boxes, npw.box)
+        assert box == boxes[0] == npw.box == (160, 170, 550, 400)
+        assert boxes[1] is None
+        done = await pywinbox.aapplyLayout({myPyBox: pywinbox.Box(150, 160, 560, 410)})
+        await asyncio.sleep(timelap)
+        assert done == {myPyBox: True}
+        assert await myPyBox.aquery() == (150, 160, 560, 410)
+
+    asyncio.run(asyncTest())
+
+    # Test thread-safe mode: many threads querying and moving the same window
+    if sys.platform == "darwin":
+        safeBox = pywinbox.WindowBox(handle=(npw.getAppName(), npw.title or ""), threadSafe=True)
+    else:
+        safeBox = pywinbox.WindowBox(handle=npw.getHandle(), threadSafe=True)
+    errors: list[Exception] = []
+
+    def worker(index: int) -> None:
+        try:
+            for i in range(10):
+                if index == 0:
+                    safeBox.topleft = (150 + i * 10, 160)
+                elif index % 4 == 0:
+                    assert pywinbox.getWindowBoxes([safeBox])[0] is not None
+                else:
+                    assert safeBox.size == (560, 410)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    time.sleep(timelap)
+    print("THREADS", errors, npw.box)
+    assert not errors
+    assert safeBox.box == npw.box == (240, 160, 560, 410)
+
+    if sys.platform == "linux":
+        # Test window box updated from X11 events
+        changes: list[pywinbox.Box] = []
+        myPyBox.startEvents(onChange=changes.append)
+        assert myPyBox.isListening()
+        npw.moveTo(200, 250)
+        time.sleep(timelap)
+        print("EVENTS", changes, npw.box)
+        assert changes and changes[-1] == myPyBox.box
+        assert myPyBox.topleft == npw.topleft == (200, 250)
+        myPyBox.stopEvents()
+        assert not myPyBox.isListening()
+
+        # Test frame extents are not requested again on every query
+        from pywinbox._pywinbox_linux import _isGnome
+        if _isGnome():
+            hits = pywinbox.getFrameExtentsCacheInfo()["hits"]
+            assert myPyBox.box == myPyBox.box
+            assert pywinbox.getFrameExtentsCacheInfo()["hits"] >= hits + 1
+
     # Test closing
     npw.close()
 
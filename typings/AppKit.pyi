@@ -54,3 +54,9 @@ class NSWindow(NSObject):
 
 class NSBackingStoreBuffered(NSObject):
     def __getattr__(self, name: str) -> Any: ...
+
+
+class NSThread(NSObject):
+    @staticmethod
+    def isMainThread() -> bool: ...
+    def __getattr__(self, name: str) -> Any: ...
@@ -0,0 +1,8 @@
+# https://github.com/ronaldoussoren/pyobjc/issues/198
+# https://github.com/ronaldoussoren/pyobjc/issues/417
+# https://github.com/ronaldoussoren/pyobjc/issues/419
+
+from collections.abc import Callable
+from typing import Any
+
+def callAfter(func: Callable[..., Any], *args: Any, **kwargs: Any) -> None: ...